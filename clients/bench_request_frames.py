@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Microbenchmark for the preframed request cache and VGMotorRtuFramer
+
+Compares building a read_sensor and status frame from scratch with the
+standard ModbusRtuFramer against sending the cached PreframedRequest
+through VGMotorRtuFramer, then compares decoding read_config
+responses of several lengths with each framer.  No serial port is needed.
+"""
+import timeit
+
+from pymodbus.factory import ClientDecoder
+from pymodbus.framer.rtu_framer import ModbusRtuFramer
+from pymodbus.utilities import computeCRC
+from vgmotor.base import ReadSensorRequest, StatusRequest, register_responses
+from vgmotor.framer import VGMotorRtuFramer, preframed
+
+unit = 0x15
+number = 100000
+
+
+def main():
+    rtu = ModbusRtuFramer(ClientDecoder())
+    vgm = VGMotorRtuFramer(ClientDecoder())
+
+    assert (rtu.buildPacket(ReadSensorRequest(unit, 0x00, 0x00))
+            == vgm.buildPacket(preframed(ReadSensorRequest, unit, 0x00, 0x00)))
+    assert (rtu.buildPacket(StatusRequest(unit))
+            == vgm.buildPacket(preframed(StatusRequest, unit)))
+
+    cases = {
+        "read_sensor rebuilt": lambda: rtu.buildPacket(ReadSensorRequest(unit, 0x00, 0x00)),
+        "read_sensor cached ": lambda: vgm.buildPacket(preframed(ReadSensorRequest, unit, 0x00, 0x00)),
+        "status rebuilt     ": lambda: rtu.buildPacket(StatusRequest(unit)),
+        "status cached      ": lambda: vgm.buildPacket(preframed(StatusRequest, unit)),
+    }
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=number, repeat=5))
+        print(f"{name}  {seconds / number * 1e6:6.2f} us/frame")
+
+    register_responses(rtu.decoder)
+    register_responses(vgm.decoder)
+    results = []
+    for length in (16, 128, 256):
+        #read_config page 0x0b address 0x00
+        frame = bytes([unit, 0x64, 0x10, 0x0b, 0x00, length - 1]) + bytes(length)
+        frame += computeCRC(frame).to_bytes(2, 'big')
+        for name, framer in (("rtu", rtu), ("vgm", vgm)):
+            case = lambda: framer.processIncomingPacket(frame, results.append, slave=unit)
+            seconds = min(timeit.repeat(case, number=number // 10, repeat=5))
+            print(f"read_config {length:3} B decode {name}  "
+                  f"{seconds / (number // 10) * 1e6:6.2f} us/frame")
+
+
+if __name__ == "__main__":
+    main()
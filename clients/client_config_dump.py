@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Pymodbus Synchronous Client for Regal Beloit Century VGreen EVO Motor
+
+This test client backs up the config pages of every motor on a bus.
+
+Each motor is written to config_0xNN.cfg (binary) and config_0xNN.txt
+(the evo_config_dump layout).
+"""
+import logging, time, sys
+
+from vgmotor import VGMotorBase, PortPool, ResponseTimeout
+
+from pymodbus import pymodbus_apply_logging_config
+pymodbus_apply_logging_config(logging.WARNING)  #Default level: DEBUG
+log = logging.getLogger()
+
+port = "/dev/ttyUSB0"
+units = [0x15]
+
+
+def main(motor:VGMotorBase):
+
+    for unit in units:
+        start = time.monotonic()
+        image = motor.dump_config(unit)
+        if image is None:
+            print(f"Motor 0x{unit:02x}: dump failed")
+            continue
+        image.save(f"config_0x{unit:02x}.cfg")
+        image.save(f"config_0x{unit:02x}.txt", text=True)
+        print(f"Motor 0x{unit:02x}: {len(image)} pages in "
+              f"{time.monotonic() - start:.1f}s, read length limit "
+              f"{motor.config_max_length(unit)}")
+        for page in image:
+            print(f"\tpage 0x{page:02x}: {image.extent(page)} bytes")
+
+
+if __name__ == "__main__":
+    print(f'Connecting to the Modbus Network at {port}')
+    with PortPool().client(port, baudrate=9600, bytesize=8,
+                parity='N', stopbits=1, timeout=1) as client:
+
+        vgmotor = VGMotorBase(client, timeouts=ResponseTimeout.from_client(client))
+
+        try:
+            main(vgmotor)
+        except KeyboardInterrupt:
+            sys.exit(2)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Pymodbus Asyncio Client for Regal Beloit Century VGreen EVO Motor
+
+This is a test client implementing some of the EVO functions with the
+asyncio classes.  One event loop drives every port listed in ports; each
+port is polled by its own task without a thread per motor.
+
+This test client specifically focuses on config and status read functions.
+"""
+import asyncio, logging, sys
+
+from pymodbus.client import AsyncModbusSerialClient as ModbusClient
+from vgmotor import VGMotorAsyncEVO
+
+from pymodbus import pymodbus_apply_logging_config
+pymodbus_apply_logging_config(logging.WARNING)  #Default level: DEBUG
+log = logging.getLogger()
+
+#port: [units]
+ports = {"/dev/ttyUSB0": [0x15]}
+
+
+async def poll(motor:VGMotorAsyncEVO, port, unit):
+
+    print(f"{port} 0x{unit:02x}\tSerial Timeout:", await motor.serial_timeout(unit))
+    print(f"{port} 0x{unit:02x}\tSchedule A:1", await motor.schedule_slot(unit, 'A', 1))
+
+    sensors = [VGMotorAsyncEVO.SPEED, VGMotorAsyncEVO.TEMP_AMBIENT, VGMotorAsyncEVO.CURRENT]
+    async for record in motor.stream(unit, sensors, period=0.50):
+        speed, temp, current = record.values
+        status = await motor.status(unit)
+        print(f"{port} 0x{unit:02x}\t{status}  {speed}  {temp}  {current}")
+
+
+async def main():
+    tasks = []
+    for port, units in ports.items():
+        print(f'Connecting to the Modbus Network at {port}')
+        client = ModbusClient(port=port, baudrate=9600, bytesize=8,
+                    parity='N', stopbits=1, timeout=1)
+        await client.connect()
+        motor = VGMotorAsyncEVO(client)
+        for unit in units:
+            tasks.append(poll(motor, port, unit))
+    await asyncio.gather(*tasks)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        sys.exit(2)
@@ -5,10 +5,9 @@ This is a test client implementing some of the EVO functions.
 
 This test client specifically focuses on config and status read functions.
 """
-import logging, time, sys
+import logging, sys
 
-from pymodbus.client import ModbusSerialClient as ModbusClient
-from vgmotor import VGMotorEVO
+from vgmotor import VGMotorEVO, PortPool
 
 from pymodbus import pymodbus_apply_logging_config
 pymodbus_apply_logging_config(logging.WARNING)  #Default level: DEBUG
@@ -45,27 +44,23 @@ def main(motor:VGMotorEVO):
     print(f"\tSchedule Set A")
     print(f"\tSelected Schedule:", motor.selected_schedule(unit, 'A'))
     print("\tSlot Hr  RPM  Hr  RPM  Hr  RPM  Hr  RPM  Hr  RPM ")
-    for index in range(1,8+1):
-        print("\t  ", index, motor.schedule_slot(unit, 'A', index))
+    for index, schedule in enumerate(motor.schedule_set(unit, 'A'), start=1):
+        print("\t  ", index, schedule)
 
     print(f"\tSchedule Set B")
     print(f"\tSelected Schedule:", motor.selected_schedule(unit, 'B'))
     print("\tSlot Hr  RPM  Hr  RPM  Hr  RPM  Hr  RPM  Hr  RPM ")
-    for index in range(1,8+1):
-        print("\t  ", index, motor.schedule_slot(unit, 'B', index))
+    for index, schedule in enumerate(motor.schedule_set(unit, 'B'), start=1):
+        print("\t  ", index, schedule)
     
     print('\nRead a few sensors (ctl-c to quit)')
+    sensors = [VGMotorEVO.DEMAND_RPM, VGMotorEVO.SPEED, VGMotorEVO.TEMP_AMBIENT,
+               VGMotorEVO.TORQUE, VGMotorEVO.POWER_INVERTER_INPUT,
+               VGMotorEVO.POWER_SHAFT_OUTPUT, VGMotorEVO.CURRENT,
+               VGMotorEVO.DIGITAL_INPUT_ACTIVE, VGMotorEVO.OPERATING_MODE]
     lines = 100
-    while (True):
-        demand = motor.read_sensor(unit, VGMotorEVO.DEMAND_RPM)
-        speed = motor.read_sensor(unit, VGMotorEVO.SPEED)
-        temp = motor.read_sensor(unit, VGMotorEVO.TEMP_AMBIENT)
-        torque = motor.read_sensor(unit, VGMotorEVO.TORQUE)
-        power_inverter = motor.read_sensor(unit, VGMotorEVO.POWER_INVERTER_INPUT)
-        power_shaft = motor.read_sensor(unit, VGMotorEVO.POWER_SHAFT_OUTPUT)
-        current = motor.read_sensor(unit, VGMotorEVO.CURRENT)
-        di_active = motor.read_sensor(unit, VGMotorEVO.DIGITAL_INPUT_ACTIVE)
-        mode = motor.read_sensor(unit, VGMotorEVO.OPERATING_MODE)
+    for record in motor.stream(unit, sensors, period=0.50):
+        demand, speed, temp, torque, power_inverter, power_shaft, current, di_active, mode = record.values
 
         if lines > 10:
             if lines != 100:
@@ -74,17 +69,14 @@ def main(motor:VGMotorEVO):
             print(f"\tDemand    Speed     Temp    Torque      Inverter Shaft Current  Input      Mode")
         print(f"\t{demand}  {speed}  {temp}  {torque}  {power_inverter}   {power_shaft} {current}   {di_active} {mode}")
         lines += 1
-        time.sleep(0.50)
-
 
 if __name__ == "__main__":
     print(f'Connecting to the Modbus Network at {port}')
-    with ModbusClient( method='rtu', port=port, baudrate=9600, bytesize=8,
-                parity='N', stopbits=1, timeout=1 ) as client:
+    with PortPool().client(port, baudrate=9600, bytesize=8,
+                parity='N', stopbits=1, timeout=1) as client:
 
         vgmotor = VGMotorEVO(client)
 
-        time.sleep(1)
         try:
             main(vgmotor)
         except KeyboardInterrupt:
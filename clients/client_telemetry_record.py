@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Pymodbus Synchronous Client for Regal Beloit EPC
+
+This test client records sensor telemetry to a columnar recording.
+
+Sensors are polled with SensorPoller and appended to the "telemetry"
+directory until Ctrl-C.  Run it again with "report" as the argument to
+summarize SPEED against POWER_INVERTER_INPUT from the recording (this
+needs numpy).  Each SPEED reading is paired with the POWER_INVERTER_INPUT
+reading nearest to it in time, so failed or skipped reads of either
+sensor do not shift the pairs.
+"""
+import logging, sys
+
+from vgmotor import (VGMotorGeneric, PortPool, SensorPoller,
+                     TelemetryRecorder, TelemetryReader)
+
+from pymodbus import pymodbus_apply_logging_config
+pymodbus_apply_logging_config(logging.WARNING)  #Default level: DEBUG
+log = logging.getLogger()
+
+port = "/dev/ttyUSB0"
+path = "telemetry"
+units = [0x15]
+period = 0.5
+tolerance = period / 2  #seconds between paired SPEED and POWER readings
+
+
+def record(motor:VGMotorGeneric):
+
+    poller = SensorPoller(motor, raw=True)
+    for unit in units:
+        poller.add(unit, VGMotorGeneric.SPEED, period)
+        poller.add(unit, VGMotorGeneric.POWER_INVERTER_INPUT, period)
+        poller.add(unit, VGMotorGeneric.TEMP_AMBIENT, 30)
+    print(f"Recording to {path}/ (bus utilization {poller.utilization():.0%})")
+    with TelemetryRecorder(path) as recorder:
+        try:
+            poller.run(recorder.record)
+        except KeyboardInterrupt:
+            pass
+
+
+def pair(timestamps, values, other_timestamps, other_values, tolerance):
+    """Pairs each sample with the other sensor's nearest sample in time
+
+    Samples with no other sample within tolerance seconds, or a failed
+    read on either side, are dropped.
+    """
+    import numpy
+    if len(other_timestamps) == 0:
+        return values[:0], other_values[:0]
+    after = numpy.searchsorted(other_timestamps, timestamps).clip(1, len(other_timestamps) - 1)
+    before = after - 1
+    nearest = numpy.where(
+            numpy.abs(other_timestamps[after] - timestamps)
+            < numpy.abs(timestamps - other_timestamps[before]), after, before)
+    selected = ((numpy.abs(other_timestamps[nearest] - timestamps) <= tolerance)
+                & ~numpy.isnan(values) & ~numpy.isnan(other_values[nearest]))
+    return values[selected], other_values[nearest][selected]
+
+
+def report():
+
+    reader = TelemetryReader(path)
+    print(f"{len(reader)} samples")
+    for unit in reader.units():
+        speed_times, speed = reader.select(unit, VGMotorGeneric.SPEED)
+        power_times, power = reader.select(unit, VGMotorGeneric.POWER_INVERTER_INPUT)
+        speed, power = pair(speed_times, speed, power_times, power, tolerance)
+        print(f"Motor 0x{unit:02x}: {len(speed)} SPEED / POWER_INVERTER_INPUT pairs")
+        for rpm in range(0, 3600, 600):
+            selected = (speed >= rpm) & (speed < rpm + 600)
+            if selected.any():
+                print(f"\t{rpm:4}-{rpm + 599:4} RPM: "
+                      f"{power[selected].mean():6.0f}W average")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["report"]:
+        report()
+        sys.exit(0)
+
+    print(f'Connecting to the Modbus Network at {port}')
+    with PortPool().client(port, baudrate=9600, bytesize=8,
+                parity='N', stopbits=1, timeout=1) as client:
+
+        vgmotor = VGMotorGeneric(client)
+        record(vgmotor)
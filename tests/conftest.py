@@ -0,0 +1,162 @@
+"""Fake VGreen EVO motors for the vgmotor tests
+
+FakeClient is a ModbusBaseClient whose execute() frames each request,
+answers it from FakeMotors and decodes the response with the client's
+framer, so the tests cover the real request, framing and response code
+without a serial port.  AsyncFakeClient does the same through the asyncio
+protocol path.  Config pages start as the evo_config_dump file.
+"""
+import asyncio
+import os
+import struct
+
+import pymodbus.exceptions as exceptions
+from pymodbus.client.base import ModbusBaseClient
+from pymodbus.framer.rtu_framer import ModbusRtuFramer
+from pymodbus.utilities import computeCRC
+
+from vgmotor import ConfigImage
+
+CONFIG_DUMP = os.path.join(os.path.dirname(__file__), os.pardir, "evo_config_dump")
+
+class FakeMotors:
+    """Responses of a bus of EVO motors
+
+    :param units: slave addresses that answer
+    :param max_read: longest read_config length accepted
+    :param max_write: longest write_config length accepted
+    :param bad_address: (optional) config address whose writes are refused
+    """
+
+    def __init__(self, units=(0x15,), max_read=256, max_write=256, bad_address=None):
+        image = ConfigImage.load(CONFIG_DUMP)
+        self.pages = {unit: {page: bytearray(image[page]) for page in image}
+                      for unit in units}
+        self.max_read = max_read
+        self.max_write = max_write
+        self.bad_address = bad_address
+        self.silent = set()  #units that stop answering
+        self.garbled = set()  #units whose responses fail the CRC check
+        self.sensors = {(0x00, 0x00): 4 * 1725, (0x00, 0x05): 300}
+        self.requests = []  #(unit, function code, request body)
+        self.stores = 0
+
+    def config_reads(self):
+        """Returns the (page, address, length) of every read_config"""
+        return [(body[1], body[2], body[3] + 1) for _, code, body in self.requests
+                if code == 0x64 and not body[1] & 0x80]
+
+    def config_writes(self):
+        """Returns the (page, address, length) of every write_config"""
+        return [(body[1] & 0x7f, body[2], body[3] + 1) for _, code, body in self.requests
+                if code == 0x64 and body[1] & 0x80]
+
+    def respond(self, packet):
+        """Returns the RTU response frame for a request; b'' if silent"""
+        unit, code, body = packet[0], packet[1], bytes(packet[2:-2])
+        self.requests.append((unit, code, body))
+        if unit in self.silent or unit not in self.pages:
+            return b''
+
+        def frame(data):
+            data = bytes([unit]) + data
+            return data + struct.pack('>H', computeCRC(data) ^ (unit in self.garbled))
+
+        if code in (0x41, 0x42, 0x65):
+            self.stores += code == 0x65
+            return frame(bytes([code, 0x10]))
+        if code == 0x45:
+            value = self.sensors.get((body[1], body[2]))
+            if value is None:
+                return frame(bytes([code | 0x80, 0x03]))
+            return frame(bytes([code, 0x10, body[1], body[2]]) + struct.pack('<H', value))
+        if code == 0x64:
+            page, address, length = body[1] & 0x7f, body[2], body[3] + 1
+            write = body[1] & 0x80
+            memory = self.pages[unit].get(page)
+            if memory is None or address + length > len(memory) or length > self.max_read:
+                return frame(bytes([code | 0x80, 0x02]))
+            if write:
+                if length > self.max_write or (self.bad_address is not None
+                        and address <= self.bad_address < address + length):
+                    return frame(bytes([code | 0x80, 0x03]))
+                memory[address:address+length] = body[4:4+length]
+            return frame(bytes([code, 0x10]) + body[1:4] + bytes(memory[address:address+length]))
+        return frame(bytes([code | 0x80, 0x01]))
+
+class FakeClient(ModbusBaseClient):
+    """ModbusBaseClient answered by FakeMotors"""
+
+    def __init__(self, motors, framer=ModbusRtuFramer, **kwargs):
+        super().__init__(framer=framer, **kwargs)
+        self.motors = motors
+        self.params.baudrate = 9600
+        self.params.port = "fake"
+
+    def connect(self):
+        return True
+
+    def close(self):
+        pass
+
+    def execute(self, request=None):
+        response = self.motors.respond(self.framer.buildPacket(request))
+        if not response:
+            return exceptions.ModbusIOException("No Response received from the remote slave",
+                                                request.function_code)
+        decoded = []
+        self.framer.processIncomingPacket(response, decoded.append, slave=request.slave_id)
+        if not decoded:
+            return exceptions.ModbusIOException(
+                    "No Response received from the remote slave/Unable to decode response",
+                    request.function_code)
+        return decoded[0]
+
+class _FakeTransport:
+    """asyncio transport delivering FakeMotors responses to the protocol"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def write(self, packet):
+        response = self.client.motors.respond(packet)
+        if response:
+            asyncio.get_running_loop().call_soon(self.client.data_received, response)
+
+    def close(self):
+        pass
+
+    def abort(self):
+        pass
+
+class AsyncFakeClient(ModbusBaseClient):
+    """Asyncio ModbusBaseClient answered by FakeMotors
+
+    A silent unit times out after timeout seconds.
+    """
+
+    def __init__(self, motors, framer=ModbusRtuFramer, timeout=0.05, **kwargs):
+        super().__init__(framer=framer, timeout=timeout, **kwargs)
+        self.motors = motors
+        self.use_protocol = True
+        self.params.baudrate = 9600
+        self.params.port = "fake"
+
+    async def connect(self):
+        self.connection_made(_FakeTransport(self))
+        return True
+
+class FakeClock:
+    """Stand-in for the time module whose monotonic() only moves when told"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
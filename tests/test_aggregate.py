@@ -0,0 +1,76 @@
+import math
+
+from vgmotor import VGMotorGeneric, Aggregator, Downsampler, RollingWindow
+
+
+def test_rolling_window_expires_old_samples():
+    window = RollingWindow(10)
+    for timestamp, value in [(0, 5.0), (4, 1.0), (8, 3.0)]:
+        window.add(timestamp, value)
+    stats = window.stats()
+    assert (stats.count, stats.minimum, stats.maximum, stats.mean) == (3, 1.0, 5.0, 3.0)
+
+    window.add(12, 2.0)  #drops the sample at 0
+    stats = window.stats()
+    assert (stats.count, stats.minimum, stats.maximum, stats.mean) == (3, 1.0, 3.0, 2.0)
+    assert math.isclose(stats.stddev, math.sqrt(2 / 3))
+
+    window.expire(30)
+    stats = window.stats()
+    assert stats.count == 0 and math.isnan(stats.mean)
+
+
+def test_rolling_window_time_weighted_mean():
+    window = RollingWindow(100)
+    window.add(0, 10.0)
+    assert math.isnan(window.stats().time_weighted)
+    window.add(1, 0.0)   #10 held for 1 second
+    window.add(10, 0.0)  #0 held for 9 seconds
+    assert math.isclose(window.stats().time_weighted, 1.0)
+
+    #The area of an expired sample leaves with it
+    window = RollingWindow(8.5)
+    window.add(0, 10.0)
+    window.add(1, 0.0)
+    window.add(10, 0.0)
+    assert len(window) == 1
+    window.add(12, 4.0)
+    assert math.isclose(window.stats().time_weighted, 0.0)
+    window.add(14, 4.0)
+    assert math.isclose(window.stats().time_weighted, 2.0)
+
+
+def test_rolling_window_failed_reads_only_expire():
+    window = RollingWindow(5)
+    window.add(0, 1.0)
+    window.add(10, float("NaN"))
+    assert window.stats().count == 0
+
+
+def test_downsampler_buckets():
+    downsampler = Downsampler(resolutions=(10, 60), keep=2)
+    for timestamp in range(0, 40, 5):
+        downsampler.add(timestamp, float(timestamp))
+    assert [bucket.start for bucket in downsampler.buckets(10)] == [10, 20]
+    assert downsampler.buckets(10, include_open=True)[-1] == (30, 2, 30.0, 35.0, 32.5)
+    assert downsampler.buckets(60) == []
+
+
+def test_aggregator_scales_raw_readings():
+    aggregator = Aggregator(windows=(60,), resolutions=(60,), raw=True)
+    aggregator.record(0x15, VGMotorGeneric.SPEED, 4 * 1000, timestamp=0.0)
+    aggregator.record(0x15, VGMotorGeneric.SPEED, 4 * 2000, timestamp=1.0)
+    aggregator.record(0x15, VGMotorGeneric.SPEED, None, timestamp=2.0)
+    stats = aggregator.stats(0x15, VGMotorGeneric.SPEED, 60)
+    assert (stats.count, stats.mean) == (2, 1500.0)
+    assert aggregator.stats(0x15, VGMotorGeneric.SPEED, 60, now=100.0).count == 0
+    assert aggregator.keys() == [(0x15, VGMotorGeneric.SPEED)]
+
+
+def test_aggregator_failed_reads_expire_samples():
+    for raw in (True, False):
+        aggregator = Aggregator(windows=(10,), resolutions=(60,), raw=raw)
+        aggregator.record(0x15, VGMotorGeneric.SPEED, 4 * 1725 if raw else 1725.0, timestamp=0.0)
+        aggregator.record(0x15, VGMotorGeneric.SPEED, None, timestamp=20.0)
+        assert aggregator.stats(0x15, VGMotorGeneric.SPEED, 10).count == 0
+        assert aggregator.buckets(0x15, VGMotorGeneric.SPEED, 60, include_open=True)[0].count == 1
@@ -0,0 +1,55 @@
+import asyncio
+
+from conftest import AsyncFakeClient, FakeMotors
+
+from vgmotor import VGMotorAsyncEVO, VGMotorAsyncGeneric, VGMotorGeneric
+
+
+def run(coroutine_function, motors, cls=VGMotorAsyncGeneric, **kwargs):
+    """Runs coroutine_function(motor) against a connected AsyncFakeClient"""
+    async def main():
+        client = AsyncFakeClient(motors)
+        await client.connect()
+        return await coroutine_function(cls(client, **kwargs))
+    return asyncio.run(main())
+
+
+def test_read_sensor_and_status():
+    async def reads(motor):
+        return (str(await motor.read_sensor(0x15, VGMotorGeneric.SPEED)),
+                await motor.go(0x15), motor.last_success(0x15) is not None)
+    assert run(reads, FakeMotors()) == ("1725 RPM", True, True)
+
+
+def test_silent_unit_times_out():
+    motors = FakeMotors()
+    motors.silent.add(0x15)
+
+    async def reads(motor):
+        return await motor.read_sensor_raw(0x15, VGMotorGeneric.SPEED), motor.last_success(0x15)
+    assert run(reads, motors) == (None, None)
+
+
+def test_concurrent_reads_share_one_transaction():
+    motors = FakeMotors()
+
+    async def reads(motor):
+        return await asyncio.gather(*(motor.read_sensor_raw(0x15, VGMotorGeneric.SPEED)
+                                      for _ in range(4)))
+    assert run(reads, motors) == [4 * 1725] * 4
+    assert len(motors.requests) == 1
+
+
+def test_evo_config_items():
+    motors = FakeMotors()
+
+    async def reads(motor):
+        return (str(await motor.serial_timeout(0x15)),
+                str(await motor.digital_in_rpm(0x15, 2, rpm=1800)),
+                int(await motor.selected_schedule(0x15, 'A')),
+                str(await motor.schedule_slot(0x15, 'A', 1)))
+    timeout, rpm, slot, schedule = run(reads, motors, VGMotorAsyncEVO)
+    assert (timeout, rpm) == ("60s", "1800 RPM")
+    assert slot == motors.pages[0x15][0x0b][0x00]
+    assert schedule.split()[:2] == ["2", "3450"]
+    assert motors.pages[0x15][0x0a][0x5b:0x5d] == (1800).to_bytes(2, "little")
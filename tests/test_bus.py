@@ -0,0 +1,62 @@
+import threading
+
+import pytest
+import pymodbus.exceptions as exceptions
+
+from conftest import AsyncFakeClient, FakeClient, FakeMotors
+
+from vgmotor import VGMotorBus, VGMotorEVO, VGMotorGeneric
+
+
+class GatedClient(FakeClient):
+    """FakeClient whose first execute() waits until the gate is opened"""
+
+    def __init__(self, motors):
+        super().__init__(motors)
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+
+    def execute(self, request=None):
+        if not self.entered.is_set():
+            self.entered.set()
+            self.gate.wait(5)
+        return super().execute(request)
+
+
+def test_priority_then_round_robin():
+    motors = FakeMotors(units=(0x15, 0x16))
+    client = GatedClient(motors)
+    bus = VGMotorBus(client)
+    motor = VGMotorEVO(bus)
+
+    calls = [lambda: motor.read_config(0x15, 0x01, 0, 1)]  #holds the bus
+    calls += [lambda: motor.read_config(0x15, 0x01, 1, 1),
+              lambda: motor.read_config(0x15, 0x01, 2, 1),
+              lambda: motor.read_config(0x16, 0x01, 3, 1),
+              lambda: motor.read_sensor(0x16, VGMotorGeneric.SPEED),
+              lambda: motor.stop(0x15)]
+    threads = [threading.Thread(target=call) for call in calls]
+    threads[0].start()
+    assert client.entered.wait(5)
+    for queued, thread in enumerate(threads[1:], 1):
+        thread.start()
+        while bus.pending() != queued:  #queue in a known order
+            pass
+    client.gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    order = [(unit, code, body[2] if code == 0x64 else None)
+             for unit, code, body in motors.requests]
+    assert order == [(0x15, 0x64, 0),
+                     (0x15, 0x42, None),  #stop() first
+                     (0x16, 0x45, None),  #then sensors
+                     (0x15, 0x64, 1),     #then config, alternating units
+                     (0x16, 0x64, 3),
+                     (0x15, 0x64, 2)]
+    assert bus.pending() == 0
+
+
+def test_rejects_async_client():
+    with pytest.raises(exceptions.ParameterException):
+        VGMotorBus(AsyncFakeClient(FakeMotors()))
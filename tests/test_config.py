@@ -0,0 +1,258 @@
+import struct
+
+import pytest
+from conftest import CONFIG_DUMP, FakeClient, FakeMotors
+from pymodbus.exceptions import ParameterException
+
+from vgmotor import VGMotorEVO, EVOSchedule, ConfigField, ConfigFieldRegistry, ConfigImage
+from vgmotor.configtransaction import changed_runs
+
+
+def test_dump_config_reads_whole_pages():
+    motors = FakeMotors()
+    motor = VGMotorEVO(FakeClient(motors))
+    image = motor.dump_config(0x15)
+    assert sorted(image) == sorted(motors.pages[0x15])
+    for page in image:
+        assert bytes(image[page]) == bytes(motors.pages[0x15][page])
+    assert motor.config_max_length(0x15) is None
+
+
+def test_dump_config_bisects_read_limit():
+    motors = FakeMotors(max_read=40)
+    motor = VGMotorEVO(FakeClient(motors))
+    image = motor.dump_config(0x15)
+    assert motor.config_max_length(0x15) == 40
+    for page in image:
+        assert bytes(image[page]) == bytes(motors.pages[0x15][page])
+
+    #Once known, the limit is used without probing again
+    del motors.requests[:]
+    motor.dump_config(0x15, pages=[0x0c])
+    reads = motors.config_reads()
+    assert all(length <= 40 for _, _, length in reads)
+    assert reads[:3] == [(0x0c, 0, 40), (0x0c, 40, 40), (0x0c, 80, 40)]
+
+
+def test_dump_config_silent_unit():
+    motors = FakeMotors()
+    motors.silent.add(0x15)
+    assert VGMotorEVO(FakeClient(motors)).dump_config(0x15) is None
+
+
+def test_schedule_set_reads_table_in_long_reads():
+    motors = FakeMotors(max_read=64)
+    motor = VGMotorEVO(FakeClient(motors))
+    page = motors.pages[0x15][0x0b]
+    motor.dump_config(0x15, pages=[0x0a])
+    del motors.requests[:]
+
+    schedules = motor.schedule_set(0x15, 'A')
+    assert [schedule.slot() for schedule in schedules] == list(range(1, 9))
+    for schedule in schedules:
+        address = schedule.address(0x08)
+        assert schedule.schedule_to_bytes() == bytes(page[address:address+schedule.length()])
+    assert motors.config_reads() == [(0x0b, 0, 64), (0x0b, 64, 46)]
+
+    #Served from the mirror
+    motor.schedule_set(0x15, 'A')
+    assert len(motors.config_reads()) == 2
+
+
+def test_schedule_set_read_error():
+    motors = FakeMotors()
+    motors.silent.add(0x15)
+    schedules = VGMotorEVO(FakeClient(motors)).schedule_set(0x15, 'B')
+    assert len(schedules) == 8
+    assert all(schedule.schedule_to_bytes() == EVOSchedule('B', schedule.slot()).schedule_to_bytes()
+               for schedule in schedules)
+
+
+def test_schedule_set_write_stores_once():
+    motors = FakeMotors()
+    motor = VGMotorEVO(FakeClient(motors))
+    schedules = motor.schedule_set(0x15, 'B')
+    schedules[1].step(1, 12, 1800)
+    schedules[1].step(2, 12, 2400)
+    schedules[6].step(1, 24, 1000)
+    del motors.requests[:]
+
+    written = motor.schedule_set_write(0x15, [schedules[1], schedules[6]])
+    assert motors.stores == 1
+    assert motors.config_reads() == []
+    page = motors.pages[0x15][0x0c]
+    for schedule in (schedules[1], schedules[6]):
+        address = schedule.address(0x08)
+        assert bytes(page[address:address+schedule.length()]) == schedule.schedule_to_bytes()
+        assert written[schedule.slot()-1].schedule_to_bytes() == schedule.schedule_to_bytes()
+    #Only the changed bytes of the two slots
+    assert all(length < 16 for _, _, length in motors.config_writes())
+
+    #Nothing changed: no write and no store
+    del motors.requests[:]
+    assert motor.schedule_set_write(0x15, [schedules[1]]) is not None
+    assert motors.config_writes() == []
+    assert motors.stores == 1
+
+
+def test_schedule_set_write_rejects_mixed_sets():
+    motor = VGMotorEVO(FakeClient(FakeMotors()))
+    with pytest.raises(ParameterException):
+        motor.schedule_set_write(0x15, [EVOSchedule('A', 1), EVOSchedule('B', 1)])
+
+
+def test_changed_runs():
+    old = bytes(10)
+    assert changed_runs(old, old) == []
+    new = bytes([1, 0, 0, 1, 1, 0, 0, 0, 0, 1])
+    assert changed_runs(old, new) == [(0, 1), (3, 5), (9, 10)]
+    #Gaps of fewer than gap equal bytes are bridged
+    assert changed_runs(old, new, gap=3) == [(0, 5), (9, 10)]
+    assert changed_runs(old, new, gap=4) == [(0, 5), (9, 10)]
+    assert changed_runs(old, new, gap=5) == [(0, 10)]
+
+
+def test_transaction_writes_in_write_length_chunks():
+    motors = FakeMotors(max_write=16)
+    motor = VGMotorEVO(FakeClient(motors))
+    with motor.config_transaction(0x15) as tx:
+        tx.write(0x0b, 0x08, bytes(40))
+    assert tx.success
+    assert motors.config_writes() == [(0x0b, 0x08, 16), (0x0b, 0x18, 16), (0x0b, 0x28, 8)]
+    assert motors.stores == 1
+    assert bytes(motors.pages[0x15][0x0b][0x08:0x30]) == bytes(40)
+
+
+def test_transaction_reports_partial_write():
+    motors = FakeMotors(max_write=16, bad_address=0x1a)
+    motor = VGMotorEVO(FakeClient(motors))
+    with motor.config_transaction(0x15) as tx:
+        tx.write(0x0b, 0x08, bytes(40))
+    assert not tx.success
+    assert tx.written == [(0x0b, 0x08, bytes(16))]
+    assert tx.failed == (0x0b, 0x18)
+    assert motors.stores == 0
+
+
+def test_transaction_coalesces_and_discards():
+    motors = FakeMotors()
+    motor = VGMotorEVO(FakeClient(motors))
+    with motor.config_transaction(0x15) as tx:
+        tx.write(0x0a, 0x58, bytes([1, 2]))
+        tx.write(0x0a, 0x5a, bytes([3]))
+        tx.write(0x0a, 0x58, bytes([4]))
+        assert tx.runs() == [(0x0a, 0x58, bytes([4, 2, 3]))]
+    assert tx.success
+    assert motors.config_writes() == [(0x0a, 0x58, 3)]
+
+    del motors.requests[:]
+    with pytest.raises(ValueError):
+        with motor.config_transaction(0x15) as tx:
+            tx.write(0x0a, 0x58, bytes(2))
+            raise ValueError
+    assert tx.success is False
+    assert motors.requests == []
+
+
+def test_apply_config_writes_only_differences():
+    motors = FakeMotors()
+    motor = VGMotorEVO(FakeClient(motors))
+    image = motor.dump_config(0x15, pages=[0x01, 0x0a])
+    desired = {page: bytearray(image[page]) for page in image}
+    desired[0x01][0x00] = 30
+    desired[0x0a][0x58:0x5a] = (1800).to_bytes(2, "little")
+    del motors.requests[:]
+
+    assert motor.apply_config(0x15, desired) == [
+            (0x01, 0x00, bytes([30])), (0x0a, 0x58, (1800).to_bytes(2, "little"))]
+    assert motors.stores == 1
+    for page in desired:
+        assert bytes(motors.pages[0x15][page]) == bytes(desired[page])
+    assert str(motor.serial_timeout(0x15)) == "30s"
+
+    #Already matching: nothing written or stored
+    assert motor.apply_config(0x15, desired) == []
+    assert motors.stores == 1
+
+
+def test_apply_config_read_error():
+    motors = FakeMotors()
+    motor = VGMotorEVO(FakeClient(motors))
+    desired = motor.dump_config(0x15, pages=[0x01])
+    motors.silent.add(0x15)
+    del motors.requests[:]
+    assert motor.apply_config(0x15, desired) is None
+    assert motors.config_writes() == []
+
+
+def test_evo_accessors_use_field_strides():
+    motors = FakeMotors()
+    motor = VGMotorEVO(FakeClient(motors))
+    page = motors.pages[0x15][0x0a]
+    for input in range(1, 5):
+        address = 0x58 + (input - 1) * 3
+        assert int(motor.digital_in_rpm(0x15, input)) == int.from_bytes(page[address:address+2], "little")
+    assert str(motor.digital_in_rpm(0x15, 3, rpm=1800)) == "1800 RPM"
+    assert page[0x5e:0x60] == (1800).to_bytes(2, "little")
+    assert str(motor.serial_timeout(0x15)) == "60s"
+
+
+def test_evo_accessor_read_error():
+    motors = FakeMotors()
+    motors.silent.add(0x15)
+    value = VGMotorEVO(FakeClient(motors)).digital_in_rpm(0x15, 1)
+    assert int(value) == 0
+    assert str(value) == "~~~~ RPM"
+
+
+def test_field_value_wrong_length():
+    for val_bytes in (None, b"\x08", b"\x08\x07\x00"):
+        value = VGMotorEVO._field_value(VGMotorEVO.FIELDS, "digital_input_rpm", val_bytes)
+        assert int(value) == 0
+        assert str(value) == "~~~~ RPM"
+
+
+def test_config_values():
+    motors = FakeMotors()
+    motor = VGMotorEVO(FakeClient(motors))
+    values = motor.config_values(0x15)
+    page = motors.pages[0x15][0x0a]
+    assert values["serial_timeout"] == 60
+    assert values["digital_input_rpm"] == [int.from_bytes(page[address:address+2], "little")
+                                           for address in range(0x58, 0x64, 3)]
+    assert len(values["schedule_b_rpm"]) == 38
+
+    motors.silent.add(0x15)
+    motor.invalidate_config(0x15, 0x01)
+    values = motor.config_values(0x15)
+    assert values["serial_timeout"] is None
+    assert values["digital_input_rpm"] is not None
+
+
+def test_registry_from_json():
+    fields = ConfigFieldRegistry.from_json("""[
+        {"name": "timeout", "page": 1, "address": 0, "type": "B", "str_fmt": "{}s"},
+        {"name": "rpm", "page": 10, "address": 88, "type": "H", "count": 4, "stride": 3},
+        {"name": "volts", "page": 10, "address": 4, "type": "h", "scale": 0.5}
+    ]""")
+    assert fields.pages() == [1, 10]
+    assert fields.extent(10) == 0x58 + 3 * 3 + 2
+    assert fields.location("rpm", 2) == (10, 0x5e, 2)
+    with pytest.raises(IndexError):
+        fields.location("rpm", 4)
+    assert fields.unpack("volts", struct.pack("<h", -20)) == -10
+    assert fields.encode("volts", -10) == (10, 4, struct.pack("<h", -20))
+    assert fields.format("timeout", 60) == "60s"
+    assert fields.format("timeout", None) == "~"
+
+    image = ConfigImage.load(CONFIG_DUMP)
+    values = fields.decode_image(image)
+    assert values["timeout"] == image[1][0]
+    assert values["rpm"][0] == int.from_bytes(image[10][0x58:0x5a], "little")
+
+
+def test_registry_rejects_overlaps():
+    with pytest.raises(ValueError):
+        ConfigFieldRegistry([ConfigField("a", 1, 0, "H"), ConfigField("b", 1, 1, "B")])
+    with pytest.raises(ValueError):
+        ConfigFieldRegistry([ConfigField("a", 1, 0, "q")])
@@ -0,0 +1,67 @@
+import math
+
+from vgmotor import VGMotorGeneric, DeadbandFilter
+from vgmotor.deadband import STATUS
+
+SPEED = VGMotorGeneric.SPEED
+
+
+class Status(int):
+    """Stand-in for MotorStatus: the mode as an int"""
+    error_txt = None
+
+
+def test_deadband_publishes_changes_and_drift():
+    changes = DeadbandFilter({SPEED: 25})
+    events = []
+    changes.subscribe(events.append)
+    for timestamp, value in enumerate((1725, 1740, 1755, 1700, 1700)):
+        changes.record(0x15, SPEED, value, timestamp=float(timestamp))
+    assert [(event.value, event.previous) for event in events] == [
+            (1725, None), (1755, 1725), (1700, 1755)]
+
+
+def test_failed_reads_are_changes():
+    changes = DeadbandFilter({SPEED: 25}, raw=True)
+    events = []
+    changes.subscribe(events.append)
+    changes.record(0x15, SPEED, 4 * 1725, timestamp=0.0)
+    changes.record(0x15, SPEED, None, timestamp=1.0)
+    changes.record(0x15, SPEED, None, timestamp=2.0)
+    changes.record(0x15, SPEED, 4 * 1725, timestamp=3.0)
+    assert [event.timestamp for event in events] == [0.0, 1.0, 3.0]
+    assert events[0].value == 1725.0
+    assert math.isnan(events[1].value)
+
+
+def test_max_interval_republishes():
+    changes = DeadbandFilter(max_interval=10)
+    for timestamp in (0.0, 5.0, 10.0, 15.0):
+        event = changes.record(0x15, VGMotorGeneric.DIGITAL_INPUT_ACTIVE, 1, timestamp=timestamp)
+        assert (event is not None) == (timestamp in (0.0, 10.0))
+    changes.forget(0x15)
+    assert changes.record(0x15, VGMotorGeneric.DIGITAL_INPUT_ACTIVE, 1, timestamp=16.0)
+
+
+def test_status_mode_changes():
+    changes = DeadbandFilter()
+    published = [changes.record_status(0x15, status, timestamp=float(index)) is not None
+                 for index, status in enumerate((Status(0), Status(0), Status(2), None, Status(2)))]
+    assert published == [True, False, True, True, True]
+    assert changes.record_status(0x15, Status(2), timestamp=5.0) is None
+    assert changes.record_status(0x16, Status(2), timestamp=5.0).sensor == STATUS
+
+
+def test_failing_sink_does_not_stop_others(caplog):
+    changes = DeadbandFilter()
+    events = []
+
+    def broken(event):
+        raise RuntimeError("sink down")
+
+    changes.subscribe(broken)
+    changes.subscribe(events.append)
+    changes.record(0x15, SPEED, 1725, timestamp=0.0)
+    assert len(events) == 1
+    assert "sink down" in caplog.text
+    changes.unsubscribe(broken)
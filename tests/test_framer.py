@@ -0,0 +1,115 @@
+import pytest
+from pymodbus.framer.rtu_framer import ModbusRtuFramer
+
+from conftest import FakeClient, FakeMotors
+
+from vgmotor import VGMotorGeneric, VGMotorRtuFramer
+from vgmotor.base import ReadConfigRequest, ReadSensorRequest, StatusRequest
+from vgmotor.framer import PreframedRequest, preframed, response_frame_size
+
+
+def test_preframed_requests_are_cached():
+    request = preframed(ReadSensorRequest, 0x15, 0x00, 0x00)
+    assert preframed(ReadSensorRequest, 0x15, 0x00, 0x00) is request
+    assert preframed(ReadSensorRequest, 0x16, 0x00, 0x00) is not request
+
+
+def test_preframed_frame_matches_rtu_framer():
+    plain = ReadSensorRequest(0x15, 0x00, 0x05)
+    request = PreframedRequest(plain)
+    assert request.frame == ModbusRtuFramer(None).buildPacket(plain)
+    assert VGMotorRtuFramer(None).buildPacket(request) == request.frame
+    assert request.get_response_pdu_size() == plain.get_response_pdu_size()
+
+
+def test_preframed_requests_are_immutable():
+    request = preframed(StatusRequest, 0x15)
+    request.transaction_id = 7
+    with pytest.raises(AttributeError):
+        request.slave_id = 0x16
+
+
+@pytest.mark.parametrize("framer", [ModbusRtuFramer, VGMotorRtuFramer])
+def test_preframed_polls(framer):
+    motor = VGMotorGeneric(FakeClient(FakeMotors(), framer=framer))
+    for _ in range(2):
+        assert str(motor.read_sensor(0x15, VGMotorGeneric.SPEED)) == "1725 RPM"
+
+
+@pytest.mark.parametrize("frame, size", [
+    (bytes([0x15, 0x41]), 5),
+    (bytes([0x15, 0x43]), 6),
+    (bytes([0x15, 0x45]), 9),
+    (bytes([0x15, 0x64, 0x10, 0x01, 0x00, 0x06]), 15),
+    (bytes([0x15, 0x46, 0x10, 0x00, 0x00, 0x00]), 9),
+    (bytes([0x15, 0xe4]), 5),
+])
+def test_response_frame_size(frame, size):
+    assert response_frame_size(frame) == size
+
+
+def test_response_frame_size_needs_length_byte():
+    with pytest.raises(IndexError):
+        response_frame_size(bytes([0x15, 0x64, 0x10]))
+
+
+def test_frame_sizes_match_responses():
+    motors = FakeMotors()
+    client = FakeClient(motors)
+    requests = [preframed(StatusRequest, 0x15),
+                preframed(ReadSensorRequest, 0x15, 0x00, 0x00),
+                ReadConfigRequest(0x15, 0x01, 0x00, 7),
+                ReadConfigRequest(0x15, 0x7f, 0x00, 1)]
+    for request in requests:
+        frame = motors.respond(client.framer.buildPacket(request))
+        assert response_frame_size(frame) == len(frame)
+
+
+def test_variable_length_responses_decode():
+    motors = FakeMotors()
+    motor = VGMotorGeneric(FakeClient(motors, framer=VGMotorRtuFramer))
+    for length in (1, 16, 122):
+        assert motor.read_config(0x15, 0x0c, 0x00, length) == bytes(motors.pages[0x15][0x0c][:length])
+    assert motor.read_config(0x15, 0x7f, 0x00, 1) is None
+
+
+class RecordingSerial:
+    """Serial client stand-in returning buffered bytes and recording reads"""
+
+    def __init__(self, data):
+        self.data = data
+        self.reads = []
+
+    def recv(self, size):
+        self.reads.append(size)
+        result, self.data = self.data[:size], self.data[size:]
+        return result
+
+
+def received(response, size):
+    """Returns the bytes and read sizes of one recvPacket(size) call"""
+    serial = RecordingSerial(response)
+    framer = VGMotorRtuFramer(None, client=serial)
+    framer.buildPacket(preframed(ReadConfigRequest, 0x15, 0x01, 0x00, 16))
+    return framer.recvPacket(size), serial.reads
+
+
+def test_exception_frame_stops_the_read():
+    motors = FakeMotors()
+    client = FakeClient(motors)
+    refused = motors.respond(client.framer.buildPacket(ReadConfigRequest(0x15, 0x7f, 0x00, 16)))
+    assert received(refused, 24) == (refused, [3, 2])
+
+
+def test_full_response_is_read_after_the_header():
+    motors = FakeMotors()
+    client = FakeClient(motors)
+    response = motors.respond(client.framer.buildPacket(ReadConfigRequest(0x15, 0x01, 0x00, 16)))
+    assert received(response, len(response)) == (response, [3, len(response) - 3])
+
+
+def test_short_reads_pass_through():
+    serial = RecordingSerial(bytes(8))
+    framer = VGMotorRtuFramer(None, client=serial)
+    framer.recvPacket(4)
+    assert serial.reads == [4]
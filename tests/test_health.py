@@ -0,0 +1,120 @@
+import asyncio
+import logging
+
+from conftest import AsyncFakeClient, FakeClient, FakeMotors, FakeClock
+from pymodbus.exceptions import ModbusIOException
+
+from vgmotor import VGMotorAsyncGeneric, VGMotorGeneric, UnitHealth
+import vgmotor.base
+import vgmotor.health
+
+
+def test_breaker_opens_probes_and_closes(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(vgmotor.health, "time", clock)
+    health = UnitHealth(failure_threshold=3, open_time=5.0, max_open_time=12.0)
+
+    for _ in range(2):
+        health.failure(0x15)
+    assert health.state(0x15) == UnitHealth.CLOSED
+    health.failure(0x15)
+    assert health.state(0x15) == UnitHealth.OPEN
+    assert not health.allow(0x15)
+
+    #One probe once the open period has passed
+    clock.now += 5.0
+    assert health.allow(0x15)
+    assert health.state(0x15) == UnitHealth.HALF_OPEN
+    assert not health.allow(0x15)
+
+    #A failed probe doubles the open period, up to max_open_time
+    health.failure(0x15)
+    assert health.state(0x15) == UnitHealth.OPEN
+    clock.now += 9.9
+    assert not health.allow(0x15)
+    clock.now += 0.1
+    assert health.allow(0x15)
+    health.failure(0x15)
+    clock.now += 12.0
+    assert health.allow(0x15)
+
+    health.success(0x15)
+    assert health.state(0x15) == UnitHealth.CLOSED
+    assert health.allow(0x15)
+
+
+def test_retry_delay_backs_off():
+    health = UnitHealth(retries=3, backoff=0.1, max_backoff=0.3)
+    assert [health.retry_delay(0x15, attempt) for attempt in range(4)] == [0.1, 0.2, 0.3, None]
+
+
+def test_retry_delay_skips_timeouts():
+    timeout = ModbusIOException("No response received, expected at least 4 bytes (0 received)")
+    garbled = ModbusIOException("No Response received from the remote slave/Unable to decode response")
+    health = UnitHealth()
+    assert health.retry_delay(0x15, 0, timeout) is None
+    assert health.retry_delay(0x15, 0, garbled) == health.backoff
+    assert UnitHealth(retry_timeouts=True).retry_delay(0x15, 0, timeout) == health.backoff
+
+
+def test_silent_unit_is_skipped(monkeypatch, caplog):
+    clock = FakeClock()
+    monkeypatch.setattr(vgmotor.health, "time", clock)
+    monkeypatch.setattr(vgmotor.base, "time", clock)
+    motors = FakeMotors()
+    motors.silent.add(0x15)
+    health = UnitHealth(failure_threshold=2)
+    motor = VGMotorGeneric(FakeClient(motors), health=health)
+
+    assert motor.read_sensor_raw(0x15, VGMotorGeneric.SPEED) is None
+    assert len(motors.requests) == 1  #a timeout is not retried
+    assert health.state(0x15) == UnitHealth.CLOSED
+    assert motor.read_sensor_raw(0x15, VGMotorGeneric.SPEED) is None
+    assert health.state(0x15) == UnitHealth.OPEN
+
+    caplog.clear()
+    for _ in range(3):
+        assert motor.read_sensor_raw(0x15, VGMotorGeneric.SPEED) is None
+    assert len(motors.requests) == 2
+    assert not [r for r in caplog.records if r.levelno >= logging.WARNING]
+
+    motors.silent.clear()
+    clock.now += health.open_time
+    assert motor.read_sensor_raw(0x15, VGMotorGeneric.SPEED) == 4 * 1725
+    assert health.state(0x15) == UnitHealth.CLOSED
+    assert "responding again" in caplog.text
+
+
+def test_garbled_response_is_retried(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(vgmotor.base, "time", clock)
+    motors = FakeMotors()
+    motors.garbled.add(0x15)
+    health = UnitHealth(retries=2, failure_threshold=5)
+    motor = VGMotorGeneric(FakeClient(motors), health=health)
+
+    assert motor.read_sensor_raw(0x15, VGMotorGeneric.SPEED) is None
+    assert len(motors.requests) == 3  #request and two retries
+    assert clock.now == 1000.0 + health.backoff * 3
+
+
+def test_async_retry_waits_for_reconnect():
+    async def run():
+        motors = FakeMotors()
+        motors.silent.add(0x15)
+        client = AsyncFakeClient(motors)
+        await client.connect()
+        health = UnitHealth(backoff=0.001, retry_timeouts=True)
+        motor = VGMotorAsyncGeneric(client, health=health)
+
+        #pymodbus drops the connection on the timeout, so nothing is retried
+        assert await motor.read_sensor_raw(0x15, VGMotorGeneric.SPEED) is None
+        assert len(motors.requests) == 1
+        assert not client.async_connected
+        assert health.state(0x15) == UnitHealth.CLOSED  #one failure, not three
+
+        motors.silent.clear()
+        await client.connect()
+        assert await motor.read_sensor_raw(0x15, VGMotorGeneric.SPEED) == 4 * 1725
+
+    asyncio.run(run())
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from conftest import AsyncFakeClient, FakeClient, FakeClock, FakeMotors
+
+from vgmotor import (AsyncKeepAlive, KeepAlive, VGMotorAsyncEVO, VGMotorBase,
+                     VGMotorEVO, VGMotorGeneric)
+import vgmotor.asyncbase
+import vgmotor.base
+import vgmotor.keepalive
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    for module in (vgmotor.base, vgmotor.asyncbase, vgmotor.keepalive):
+        monkeypatch.setattr(module, "time", clock)
+    return clock
+
+
+def status_requests(motors):
+    return sum(1 for _, code, _ in motors.requests if code == 0x43)
+
+
+def test_status_only_when_quiet(clock):
+    motors = FakeMotors()
+    motor = VGMotorEVO(FakeClient(motors))
+    keepalive = KeepAlive(motor, margin=0.25)
+    keepalive.add(0x15)  #reads the 60s serial timeout
+    assert keepalive.interval(0x15) == 45
+
+    assert keepalive.service() == clock.now + 45
+    assert status_requests(motors) == 0
+
+    #Other traffic resets the watchdog
+    clock.now += 30
+    motor.read_sensor(0x15, VGMotorGeneric.SPEED)
+    clock.now += 30
+    assert keepalive.service() == clock.now + 15
+    assert status_requests(motors) == 0
+
+    clock.now += 15
+    keepalive.service()
+    assert status_requests(motors) == 1
+
+
+def test_silent_unit_is_retried_soon(clock):
+    motors = FakeMotors()
+    motors.silent.add(0x15)
+    keepalive = KeepAlive(VGMotorBase(FakeClient(motors)), default_timeout=20)
+    keepalive.add(0x15)
+    assert keepalive.service() == clock.now + 1
+    assert status_requests(motors) == 1
+
+
+def test_async_keepalive(clock):
+    motors = FakeMotors()
+
+    async def main():
+        client = AsyncFakeClient(motors)
+        await client.connect()
+        keepalive = AsyncKeepAlive(VGMotorAsyncEVO(client))
+        await keepalive.add(0x15)
+        first = await keepalive.service()
+        clock.now += keepalive.interval(0x15)
+        await keepalive.service()
+        with pytest.raises(RuntimeError):
+            keepalive.start()
+        return first, keepalive.interval(0x15)
+
+    first, interval = asyncio.run(main())
+    assert (first, interval) == (FakeClock().now + 45, 45)
+    assert status_requests(motors) == 1
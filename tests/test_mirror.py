@@ -0,0 +1,144 @@
+import threading
+
+from conftest import FakeClient, FakeMotors, FakeClock
+
+from vgmotor import VGMotorEVO
+import vgmotor.evo
+
+
+def test_mirror_serves_neighbouring_items():
+    motors = FakeMotors()
+    motor = VGMotorEVO(FakeClient(motors))
+    page = motors.pages[0x15][0x0a]
+    for input in range(1, 5):
+        address = 0x58 + (input - 1) * 3
+        assert int(motor.digital_in_rpm(0x15, input)) == int.from_bytes(page[address:address+2], "little")
+    #0x58-0x62 spans chunk 5 and the 4 byte chunk 6
+    assert motors.config_reads() == [(0x0a, 0x50, 16), (0x0a, 0x60, 4)]
+
+
+def test_cold_fill_uses_chunk_reads_until_limit_known():
+    motors = FakeMotors(max_read=40)
+    motor = VGMotorEVO(FakeClient(motors))
+    assert motor.refresh_config(0x15, 0x0a)
+    assert motors.config_reads() == [(0x0a, start, 16) for start in range(0, 96, 16)] + [(0x0a, 96, 4)]
+
+    motor.dump_config(0x15, pages=[0x01])
+    assert motor.config_max_length(0x15) == 40
+    del motors.requests[:]
+    assert motor.refresh_config(0x15, 0x0a)
+    assert motors.config_reads() == [(0x0a, 0, 32), (0x0a, 32, 32), (0x0a, 64, 36)]
+
+
+def test_read_limit_below_chunk():
+    motors = FakeMotors(max_read=8)
+    motor = VGMotorEVO(FakeClient(motors))
+    page = motors.pages[0x15][0x0a]
+    rpm = int.from_bytes(page[0x58:0x5a], "little")
+
+    #The refused chunk falls back to the item itself
+    assert int(motor.digital_in_rpm(0x15, 1)) == rpm
+    assert motors.config_reads() == [(0x0a, 0x50, 16), (0x0a, 0x58, 2)]
+
+    #Once the limit is known chunks are read within it
+    motor.dump_config(0x15, pages=[0x01])
+    assert motor.config_max_length(0x15) == 8
+    del motors.requests[:]
+    assert int(motor.digital_in_rpm(0x15, 1)) == rpm
+    assert int(motor.digital_in_rpm(0x15, 2)) == int.from_bytes(page[0x5b:0x5d], "little")
+    assert motors.config_reads() == [(0x0a, 0x50, 8), (0x0a, 0x58, 8)]
+
+
+def test_mirror_ttl_refresh_and_invalidate(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(vgmotor.evo, "time", clock)
+    motors = FakeMotors()
+    motor = VGMotorEVO(FakeClient(motors), config_ttl=10.0)
+    assert str(motor.serial_timeout(0x15)) == "60s"
+    motors.pages[0x15][0x01][0x00] = 30
+
+    #Served from the mirror until the TTL expires
+    clock.now += 9.9
+    assert str(motor.serial_timeout(0x15)) == "60s"
+    clock.now += 0.1
+    assert str(motor.serial_timeout(0x15)) == "30s"
+    assert len(motors.config_reads()) == 2
+
+    motors.pages[0x15][0x01][0x00] = 45
+    motor.invalidate_config(0x15, 0x01)
+    assert str(motor.serial_timeout(0x15)) == "45s"
+
+    motors.pages[0x15][0x01][0x00] = 50
+    assert motor.refresh_config(0x15)
+    del motors.requests[:]
+    assert str(motor.serial_timeout(0x15)) == "50s"
+    assert motors.config_reads() == []
+
+
+def test_write_updates_mirror():
+    motors = FakeMotors()
+    motor = VGMotorEVO(FakeClient(motors))
+    motor.digital_in_rpm(0x15, 3)
+    assert str(motor.digital_in_rpm(0x15, 3, rpm=1800)) == "1800 RPM"
+    del motors.requests[:]
+    assert str(motor.digital_in_rpm(0x15, 3)) == "1800 RPM"
+    assert motors.config_reads() == []
+
+
+class HeldReadClient(FakeClient):
+    """FakeClient that holds the first config read of a unit until released
+
+    The response is taken from the motors before waiting, so the held read
+    returns the bytes from before anything sent meanwhile.
+    """
+
+    def __init__(self, motors, unit):
+        super().__init__(motors)
+        self.unit = unit
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def execute(self, request=None):
+        if (request.slave_id == self.unit and request.function_code == 0x64
+                and not self.started.is_set()):
+            response = super().execute(request)
+            self.started.set()
+            self.release.wait(5)
+            return response
+        return super().execute(request)
+
+
+def test_mirror_lock_not_held_across_reads():
+    motors = FakeMotors(units=(0x15, 0x16))
+    client = HeldReadClient(motors, 0x15)
+    motor = VGMotorEVO(client)
+    reader = threading.Thread(target=motor.serial_timeout, args=(0x15,))
+    reader.start()
+    assert client.started.wait(5)
+    try:
+        #Another unit's reads are not blocked by the held one
+        results = []
+        other = threading.Thread(target=lambda: results.append(str(motor.serial_timeout(0x16))))
+        other.start()
+        other.join(2)
+        assert results == ["60s"]
+    finally:
+        client.release.set()
+        reader.join(5)
+
+
+def test_read_racing_a_write_keeps_the_echo():
+    motors = FakeMotors()
+    client = HeldReadClient(motors, 0x15)
+    motor = VGMotorEVO(client)
+    results = []
+    reader = threading.Thread(target=lambda: results.append(int(motor.digital_in_rpm(0x15, 1))))
+    reader.start()
+    assert client.started.wait(5)
+    assert str(motor.digital_in_rpm(0x15, 1, rpm=1800)) == "1800 RPM"
+    client.release.set()
+    reader.join(5)
+
+    assert results and results[0] != 1800
+    del motors.requests[:]
+    assert str(motor.digital_in_rpm(0x15, 1)) == "1800 RPM"
@@ -0,0 +1,74 @@
+from conftest import FakeClient, FakeMotors, FakeClock
+
+from vgmotor import VGMotorGeneric, SensorPoller
+import vgmotor.poller
+
+SPEED = VGMotorGeneric.SPEED
+CURRENT = VGMotorGeneric.CURRENT
+
+
+class RecordingMotor:
+    """Motor stand-in recording the reads made by the poller"""
+
+    def __init__(self):
+        self.reads = []
+
+    def read_sensor(self, unit, sensor):
+        self.reads.append((unit, sensor))
+        return 1.0
+
+
+def test_reads_earliest_deadline_first(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(vgmotor.poller, "time", clock)
+    motor = RecordingMotor()
+    poller = SensorPoller(motor)
+    poller.add(0x15, CURRENT, 10, start=clock.now + 3)
+    poller.add(0x15, SPEED, 1, start=clock.now + 1)
+    poller.add(0x16, SPEED, 1, start=clock.now + 2)
+
+    assert poller.poll(lambda *args: None) == 0
+    clock.now += 3
+    assert poller.poll(lambda *args: None) == 3
+    assert motor.reads == [(0x15, SPEED), (0x16, SPEED), (0x15, CURRENT)]
+
+
+def test_missed_periods_are_skipped(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(vgmotor.poller, "time", clock)
+    poller = SensorPoller(RecordingMotor())
+    poller.add(0x15, SPEED, 1, start=clock.now)
+    clock.now += 10
+    assert poller.poll(lambda *args: None) == 1
+    assert poller.next_deadline() == clock.now + 1
+
+
+def test_budget_defers_reads(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(vgmotor.poller, "time", clock)
+    motor = RecordingMotor()
+    poller = SensorPoller(motor)
+    for unit in range(0x10, 0x15):
+        poller.add(unit, SPEED, 1, start=clock.now - (0x15 - unit))
+    transaction_time = poller.transaction_time()
+
+    assert poller.poll(lambda *args: None, budget=2.5 * transaction_time) == 2
+    assert motor.reads == [(0x10, SPEED), (0x11, SPEED)]
+    #Deferred reads keep their deadlines and go first next time
+    assert poller.poll(lambda *args: None) == 3
+    assert motor.reads[2:] == [(0x12, SPEED), (0x13, SPEED), (0x14, SPEED)]
+
+
+def test_poll_real_motor():
+    values = []
+    poller = SensorPoller(VGMotorGeneric(FakeClient(FakeMotors())))
+    poller.add(0x15, SPEED, 1)
+    poller.poll(lambda unit, sensor, value: values.append((unit, sensor, str(value))))
+    assert values == [(0x15, SPEED, "1725 RPM")]
+
+
+def test_utilization():
+    poller = SensorPoller(RecordingMotor())
+    poller.add(0x15, SPEED, 1)
+    poller.add(0x15, CURRENT, 2)
+    assert poller.utilization() == poller.transaction_time() * 1.5
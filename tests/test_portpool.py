@@ -0,0 +1,60 @@
+import pytest
+import serial
+from conftest import FakeClock
+from pymodbus.exceptions import ParameterException
+
+from vgmotor import PortPool
+import vgmotor.portpool
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(vgmotor.portpool, "time", clock)
+    return clock
+
+
+def test_clients_are_shared_per_port(clock):
+    pool = PortPool(settle=0.5)
+    with pool.client("loop://", baudrate=9600) as client:
+        with pool.client("loop://", baudrate=9600) as other:
+            assert other is client
+            assert pool.references("loop://") == 2
+            with pytest.raises(ParameterException):
+                pool.acquire("loop://", baudrate=19200)
+        assert client.connect()
+        assert client.socket.exclusive
+        assert clock.now == 1000.5  #settled once
+        assert client.connect()
+        assert clock.now == 1000.5
+    assert pool.references("loop://") == 0
+    assert client.socket is None
+    with pool.client("loop://") as new:
+        assert new is not client
+
+
+def test_exclusive_setting(clock):
+    pool = PortPool(settle=0, exclusive=False)
+    with pool.client("loop://") as client:
+        assert client.connect()
+        assert not client.socket.exclusive
+
+
+def test_reopen_attempts_are_rate_limited(clock, monkeypatch):
+    opens = []
+    serial_for_url = serial.serial_for_url
+
+    def missing_adapter(url, *args, **kwargs):
+        opens.append(url)
+        raise serial.SerialException("could not open port")
+
+    pool = PortPool(settle=0, reconnect_interval=2.0)
+    client = pool.acquire("loop://")
+    monkeypatch.setattr(serial, "serial_for_url", missing_adapter)
+    assert not client.connect()
+    assert not client.connect()
+    assert len(opens) == 1
+    clock.now += 2.0
+    monkeypatch.setattr(serial, "serial_for_url", serial_for_url)
+    assert client.connect()
+    pool.release(client)
@@ -0,0 +1,100 @@
+import os
+
+import pytest
+
+from vgmotor import VGMotorGeneric, TelemetryRecorder
+from vgmotor.recorder import COLUMNS
+
+SPEED = VGMotorGeneric.SPEED
+
+
+def column_sizes(path):
+    return {column: os.path.getsize(os.path.join(path, f"{column}.{dtype}"))
+            for column, _, dtype in COLUMNS}
+
+
+def test_uneven_columns_are_truncated(tmp_path):
+    path = str(tmp_path / "telemetry")
+    with TelemetryRecorder(path) as recorder:
+        for index in range(3):
+            recorder.record(0x15, SPEED, 4 * 1000 + index, timestamp=100.0 + index)
+    #A crash in the middle of a batch leaves part of a row in some columns
+    with open(os.path.join(path, "timestamp.f8"), "ab") as file:
+        file.write(bytes(8 + 3))
+    with open(os.path.join(path, "raw.u2"), "ab") as file:
+        file.write(bytes(2))
+
+    with TelemetryRecorder(path) as recorder:
+        assert column_sizes(path) == {"timestamp": 24, "unit": 3, "sensor": 6,
+                                      "raw": 6, "error": 3}
+        recorder.record(0x15, SPEED, None, timestamp=103.0)
+    assert column_sizes(path) == {"timestamp": 32, "unit": 4, "sensor": 8,
+                                  "raw": 8, "error": 4}
+
+
+def test_batches_are_written_when_full(tmp_path):
+    path = str(tmp_path / "telemetry")
+    recorder = TelemetryRecorder(path, batch=2, flush_interval=3600)
+    recorder.record(0x15, SPEED, 1, timestamp=1.0)
+    assert column_sizes(path)["unit"] == 0
+    recorder.record(0x15, SPEED, 2, timestamp=2.0)
+    assert column_sizes(path)["unit"] == 2
+    recorder.close()
+
+
+def test_reader_scales_and_marks_errors(tmp_path):
+    numpy = pytest.importorskip("numpy")
+    from vgmotor import TelemetryReader
+
+    path = str(tmp_path / "telemetry")
+    with TelemetryRecorder(path) as recorder:
+        recorder.record(0x15, SPEED, 4 * 1725, timestamp=1.0)
+        recorder.record(0x16, SPEED, 4 * 600, timestamp=2.0)
+        recorder.record(0x15, VGMotorGeneric.CURRENT, 250, timestamp=3.0)
+        recorder.record(0x15, SPEED, None, timestamp=4.0)
+
+    reader = TelemetryReader(path)
+    assert len(reader) == 4
+    assert reader.units() == [0x15, 0x16]
+    timestamps, speed = reader.select(0x15, SPEED)
+    assert list(timestamps) == [1.0, 4.0]
+    assert speed[0] == 1725 and numpy.isnan(speed[1])
+    timestamps, speed = reader.select(0x15, SPEED, start=2.0)
+    assert list(timestamps) == [4.0]
+    assert len(reader.select(0x15, VGMotorGeneric.TEMP_AMBIENT)[0]) == 0
+
+
+def test_reader_index_follows_refresh(tmp_path):
+    numpy = pytest.importorskip("numpy")
+    from vgmotor import TelemetryReader
+
+    path = str(tmp_path / "telemetry")
+    recorder = TelemetryRecorder(path, batch=1)
+    for index in range(4):
+        recorder.record(0x15, SPEED, 4 * (1000 + index), timestamp=float(index))
+    reader = TelemetryReader(path)
+
+    #Rows of one sensor are contiguous: slices of the memory map
+    timestamps, raw, error = reader.raw(0x15, SPEED, start=1.0, end=3.0)
+    assert list(timestamps) == [1.0, 2.0]
+    assert isinstance(raw, numpy.memmap)
+
+    for index in range(4, 8):
+        recorder.record(0x15 + index % 2, SPEED, 4 * (1000 + index), timestamp=float(index))
+    recorder.close()
+    assert len(reader.select(0x15, SPEED)[0]) == 4
+    reader.refresh()
+    assert len(reader) == 8
+    assert reader.units() == [0x15, 0x16]
+    timestamps, speed = reader.select(0x15, SPEED, start=2.0)
+    assert list(timestamps) == [2.0, 3.0, 4.0, 6.0]
+    assert list(speed) == [1002.0, 1003.0, 1004.0, 1006.0]
+    assert list(reader.select(0x16, SPEED, end=7.0)[0]) == [5.0]
+
+
+def test_default_clock_never_goes_back(tmp_path, monkeypatch):
+    from vgmotor import recorder as module
+
+    start = module.wall_clock()
+    monkeypatch.setattr(module.time, "time", lambda: 0.0)
+    assert module.wall_clock() >= start
@@ -0,0 +1,71 @@
+import math
+import threading
+import time
+
+from conftest import FakeClient, FakeMotors, FakeClock
+
+from vgmotor import VGMotorGeneric, SensorCache
+
+
+def test_fresh_values_are_served_from_cache():
+    clock = FakeClock()
+    motors = FakeMotors()
+    cache = SensorCache(VGMotorGeneric(FakeClient(motors)), clock=clock.monotonic)
+
+    speed, when = cache.read_sensor(0x15, VGMotorGeneric.SPEED, max_age=0.5)
+    assert speed == 1725
+    assert when == clock.now
+    clock.now += 0.4
+    motors.sensors[(0x00, 0x00)] = 4 * 1800
+    assert cache.read_sensor(0x15, VGMotorGeneric.SPEED, max_age=0.5) == (1725, clock.now - 0.4)
+    assert len(motors.requests) == 1
+
+    #Too old for this caller, or forced
+    assert cache.read_sensor(0x15, VGMotorGeneric.SPEED, max_age=0.2)[0] == 1800
+    motors.sensors[(0x00, 0x00)] = 4 * 1900
+    assert cache.read_sensor(0x15, VGMotorGeneric.SPEED, max_age=0)[0] == 1900
+    cache.invalidate(0x15)
+    assert cache.read_sensor(0x15, VGMotorGeneric.SPEED, max_age=10)[0] == 1900
+    assert len(motors.requests) == 3 + 1
+
+
+def test_errors_are_not_cached():
+    clock = FakeClock()
+    motors = FakeMotors()
+    motors.silent.add(0x15)
+    cache = SensorCache(VGMotorGeneric(FakeClient(motors)), clock=clock.monotonic)
+
+    assert math.isnan(cache.read_sensor(0x15, VGMotorGeneric.SPEED, max_age=10)[0])
+    assert cache.status(0x15, max_age=10)[0] is None
+    motors.silent.clear()
+    assert cache.read_sensor(0x15, VGMotorGeneric.SPEED, max_age=10)[0] == 1725
+    assert len(motors.requests) == 3
+
+
+def test_concurrent_stale_reads_share_one_request():
+    motors = FakeMotors()
+    motor = VGMotorGeneric(FakeClient(motors))
+    cache = SensorCache(motor)
+    release = threading.Event()
+    started = threading.Event()
+    read_sensor = motor.read_sensor
+
+    def slow_read(unit, sensor):
+        started.set()
+        release.wait(5)
+        return read_sensor(unit, sensor)
+
+    motor.read_sensor = slow_read
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(
+            cache.read_sensor(0x15, VGMotorGeneric.SPEED, max_age=1.0))) for _ in range(3)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.1)  #let the others reach the running read
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(results) == 3 and len(set(results)) == 1
+    assert len(motors.requests) == 1
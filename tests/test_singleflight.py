@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+
+from conftest import FakeClient, FakeMotors
+
+from vgmotor import VGMotorGeneric
+from vgmotor.singleflight import AsyncSingleflight, Singleflight
+
+
+def test_concurrent_calls_share_one_result():
+    flight = Singleflight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def function():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("key", function)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("key", function)))
+                 for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    time.sleep(0.1)  #let the followers reach the running call
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == ["value"] * 4
+    assert flight.pending() == 0
+    #Later calls run again
+    assert flight.do("key", lambda: "again") == "again"
+
+
+def test_error_reaches_every_caller():
+    flight = Singleflight()
+    started = threading.Event()
+    release = threading.Event()
+
+    calls = []
+
+    def function():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        raise ValueError("no response")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("key", function)
+        except ValueError as exc:
+            errors.append(str(exc))
+
+    threads = [threading.Thread(target=call)]
+    threads[0].start()
+    started.wait(5)
+    threads.append(threading.Thread(target=call))
+    threads[1].start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [1]
+    assert errors == ["no response"] * 2
+    assert flight.pending() == 0
+
+
+def test_different_keys_do_not_share():
+    flight = Singleflight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+
+
+def test_async_calls_share_one_result():
+    calls = []
+
+    async def function():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def main():
+        flight = AsyncSingleflight()
+        return await asyncio.gather(*(flight.do("key", function) for _ in range(4)))
+
+    assert asyncio.run(main()) == ["value"] * 4
+    assert calls == [1]
+
+
+def test_async_error_reaches_every_caller():
+    async def function():
+        await asyncio.sleep(0.01)
+        raise ValueError("no response")
+
+    async def main():
+        flight = AsyncSingleflight()
+        return await asyncio.gather(*(flight.do("key", function) for _ in range(2)),
+                                    return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert [type(result) for result in results] == [ValueError, ValueError]
+
+
+def test_motor_coalesces_identical_reads():
+    motors = FakeMotors()
+    motor = VGMotorGeneric(FakeClient(motors))
+    release = threading.Event()
+    started = threading.Event()
+    execute = motor.client.execute
+
+    def slow_execute(request=None):
+        started.set()
+        release.wait(5)
+        return execute(request)
+
+    motor.client.execute = slow_execute
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(
+            motor.read_sensor_raw(0x15, VGMotorGeneric.SPEED))) for _ in range(3)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == [4 * 1725] * 3
+    assert len(motors.requests) == 1
@@ -0,0 +1,49 @@
+import asyncio
+import math
+
+from conftest import AsyncFakeClient, FakeClient, FakeMotors, FakeClock
+
+from vgmotor import VGMotorAsyncGeneric, VGMotorGeneric
+import vgmotor.generic
+
+SENSORS = (VGMotorGeneric.SPEED, VGMotorGeneric.TEMP_AMBIENT)
+
+
+def test_stream_keeps_period_and_skips_missed_passes(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(vgmotor.generic, "time", clock)
+    motor = VGMotorGeneric(FakeClient(FakeMotors()))
+
+    records = []
+    for record in motor.stream(0x15, SENSORS, period=0.5, count=4):
+        records.append(record)
+        if len(records) == 2:
+            clock.now += 1.2  #a slow consumer misses two periods
+    assert [record.timestamp for record in records] == [1000.0, 1000.5, 1001.7, 1002.2]
+    assert all(record.unit == 0x15 for record in records)
+    assert records[0].values[0] == 1725
+    assert records[0].errors == 1  #TEMP_AMBIENT is not served by FakeMotors
+    assert math.isnan(records[0].values[1])
+
+
+def test_stream_counts_errors(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(vgmotor.generic, "time", clock)
+    motors = FakeMotors()
+    motors.silent.add(0x15)
+    record, = VGMotorGeneric(FakeClient(motors)).stream(0x15, SENSORS, period=1.0, count=1)
+    assert record.errors == 2
+    assert all(math.isnan(value) for value in record.values)
+
+
+def test_async_stream():
+    async def run():
+        client = AsyncFakeClient(FakeMotors())
+        await client.connect()
+        motor = VGMotorAsyncGeneric(client)
+        return [record async for record in motor.stream(0x15, SENSORS[:1], period=0.01, count=3)]
+
+    records = asyncio.run(run())
+    assert len(records) == 3
+    assert all(record.values == (1725,) and record.errors == 0 for record in records)
+    assert records[-1].timestamp - records[0].timestamp >= 0.015
@@ -0,0 +1,56 @@
+import math
+
+import pytest
+from conftest import FakeClient, FakeMotors, FakeClock
+
+from vgmotor import VGMotorGeneric, SensorRing, Telemetry
+
+
+def test_ring_keeps_newest_samples():
+    ring = SensorRing(VGMotorGeneric.SPEED, 3)
+    assert len(ring) == 0 and ring.latest() is None
+    for index in range(5):
+        ring.append(4 * (1000 + index), float(index))
+    ring.append(None, 5.0)
+
+    timestamps, raw = ring.raw()
+    assert list(timestamps) == [3.0, 4.0, 5.0]
+    assert list(raw) == [4 * 1003, 4 * 1004, -1]
+    timestamps, values = ring.values()
+    assert values[:2] == [1003.0, 1004.0] and math.isnan(values[2])
+
+    value, timestamp = ring.latest()
+    assert timestamp == 5.0
+    assert math.isnan(value)
+    ring.clear()
+    assert len(ring) == 0
+
+
+def test_ring_to_numpy():
+    numpy = pytest.importorskip("numpy")
+    ring = SensorRing(VGMotorGeneric.SPEED, 4)
+    for index, raw in enumerate((4 * 1725, None, 4 * 1800)):
+        ring.append(raw, float(index))
+    timestamps, values = ring.to_numpy()
+    assert list(timestamps) == [0.0, 1.0, 2.0]
+    assert values[0] == 1725.0 and numpy.isnan(values[1]) and values[2] == 1800.0
+
+
+def test_telemetry_reads_and_records():
+    clock = FakeClock()
+    motors = FakeMotors()
+    motor = VGMotorGeneric(FakeClient(motors))
+    telemetry = Telemetry(capacity=10, clock=clock.time)
+
+    assert telemetry.read(motor, 0x15, VGMotorGeneric.SPEED) == 4 * 1725
+    clock.now += 0.5
+    motors.silent.add(0x15)
+    assert telemetry.read(motor, 0x15, VGMotorGeneric.SPEED) is None
+    telemetry.record(0x15, VGMotorGeneric.SPEED, 4 * 1800, timestamp=2000.0)
+
+    ring = telemetry.ring(0x15, VGMotorGeneric.SPEED)
+    assert telemetry.keys() == [(0x15, VGMotorGeneric.SPEED)]
+    timestamps, values = ring.values()
+    assert timestamps == [1000.0, 1000.5, 2000.0]
+    assert values[0] == 1725.0 and math.isnan(values[1]) and values[2] == 1800.0
+    assert str(ring.latest()[0]) == str(VGMotorGeneric._sensor_value(VGMotorGeneric.SPEED, 4 * 1800))
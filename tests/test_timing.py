@@ -0,0 +1,79 @@
+import math
+
+import pytest
+
+from conftest import FakeClient, FakeMotors
+
+from vgmotor import ResponseTimeout, VGMotorGeneric
+from vgmotor.base import ReadConfigRequest, ReadSensorRequest, StatusRequest
+from vgmotor.framer import preframed
+from vgmotor.timing import set_timeout
+
+
+def test_transaction_time_from_frame_sizes():
+    timeouts = ResponseTimeout(baudrate=9600)
+    assert timeouts.char_time == 10 / 9600
+    request = preframed(ReadSensorRequest, 0x15, 0x00, 0x00)
+    assert (timeouts.request_size(request), timeouts.response_size(request)) == (7, 9)
+    assert math.isclose(timeouts.transaction_time(request), (7 + 9 + 7) * 10 / 9600)
+    #Variable length responses grow with the read
+    assert timeouts.response_size(ReadConfigRequest(0x15, 0x01, 0x00, 16)) == 24
+
+
+def test_timeout_rounds_up_and_clamps():
+    timeouts = ResponseTimeout(baudrate=9600, turnaround=0.010, margin=0.050)
+    request = preframed(StatusRequest, 0x15)
+    expected = timeouts.transaction_time(request) + 0.010 + 0.050
+    assert timeouts.timeout(request) == math.ceil(expected * 100) / 100
+    assert ResponseTimeout(minimum=0.5).timeout(request) == 0.5
+    assert ResponseTimeout(turnaround=5.0).timeout(request) == 1.0
+
+
+def test_turnaround_is_learned_per_unit():
+    timeouts = ResponseTimeout(baudrate=9600, resolution=0)
+    request = preframed(StatusRequest, 0x15)
+    wire = timeouts.transaction_time(request)
+    timeouts.measure(request, wire + 0.004)
+    assert timeouts.turnaround(0x15) == pytest.approx(0.004 + 4 * 0.002)
+    for _ in range(50):
+        timeouts.measure(request, wire + 0.004)
+    assert timeouts.turnaround(0x15) == pytest.approx(0.004, abs=1e-4)
+    assert timeouts.turnaround(0x16) == 0.010
+
+
+class TimeoutClient(FakeClient):
+    """FakeClient with a serial port stand-in counting timeout changes"""
+
+    class Socket:
+        def __init__(self):
+            self._timeout = None
+            self.changes = 0
+
+        @property
+        def timeout(self):
+            return self._timeout
+
+        @timeout.setter
+        def timeout(self, value):
+            self._timeout = value
+            self.changes += 1
+
+    def __init__(self, motors):
+        super().__init__(motors)
+        self.socket = TimeoutClient.Socket()
+
+
+def test_port_is_only_reconfigured_on_change():
+    client = TimeoutClient(FakeMotors())
+    set_timeout(client, 0.1)
+    set_timeout(client, 0.1)
+    assert (client.params.timeout, client.socket.changes) == (0.1, 1)
+
+    #Once the turnaround has settled repeated polls leave the port alone
+    motor = VGMotorGeneric(client, timeouts=ResponseTimeout.from_client(client))
+    for _ in range(5):
+        motor.read_sensor(0x15, VGMotorGeneric.SPEED)
+    changes = client.socket.changes
+    for _ in range(5):
+        motor.read_sensor(0x15, VGMotorGeneric.SPEED)
+    assert client.socket.changes == changes
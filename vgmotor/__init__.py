@@ -31,9 +31,88 @@ inherits from the class above:
                   and this class exposes methods specific to the
                   configuration of an EVO motor.
 
+Each class has an asyncio twin which takes an asyncio pymodbus client
+(e.g. AsyncModbusSerialClient) and exposes the same methods as coroutines:
+    VGMotorAsyncBase, VGMotorAsyncGeneric, VGMotorAsyncEVO
+The EVO config mirror and the bulk config methods (schedule_set(),
+config_transaction(), apply_config()...) are only in the sync classes.
+
+Several callers sharing one RS-485 port should share a VGMotorBus, which
+owns the client and orders transactions by priority (stop() first) and
+round-robin across unit addresses.  Pass it to any class as the client.
+
+SensorPoller reads VGMotorGeneric sensors earliest-deadline-first, each at
+its own refresh period, instead of reading every sensor on every pass.
+
+KeepAlive holds set_demand() active by sending status() only to units
+that no other traffic has reached within their serial timeout.
+AsyncKeepAlive does the same for the asyncio classes.
+
+VGMotorRtuFramer sends cached, pre-encoded request frames straight to the
+transport.  Pass it to the client as framer=VGMotorRtuFramer.
+
+ResponseTimeout sets the client timeout of each request from the baud
+rate, the expected response size and the measured motor turnaround.
+
+VGMotorBase.dump_config() reads whole config pages into a ConfigImage,
+discovering the read length limit of the motor and the end of each page.
+
+config_transaction() batches config writes into the fewest write_config
+frames and a single store_config().
+
+ConfigFieldRegistry describes config fields as data (or JSON) compiled
+into one struct layout per page.
+
+SensorCache serves read_sensor() and status() to several consumers with
+a max_age, sharing one bus read between concurrent callers.
+
+Motor objects sharing one client share its response registration and
+per-unit state, so a motor object per unit is cheap.  thread_safe=True
+serializes transactions on the client with one lock per client.
+
+UnitHealth retries requests that get a garbled response and stops sending
+to a unit that keeps timing out, letting one probe through now and then.
+
+PortPool shares one reference counted serial client per adapter, opening
+it on first use and reopening it, rate limited, after the adapter fails.
+
+Telemetry records raw readings (read_sensor_raw()) into fixed capacity
+array backed rings per unit and sensor, scaling them only when read.
+
+TelemetryRecorder appends samples to an on-disk columnar recording in
+batches; TelemetryReader memory maps it into numpy arrays.
+
+stream() yields a SensorRecord of several sensors every period, as a
+generator (VGMotorGeneric) or an async generator (VGMotorAsyncGeneric).
+
+Aggregator keeps rolling min/max/mean/stddev and time weighted averages
+per unit and sensor, plus downsampled buckets at several resolutions,
+updated in constant time per sample.
+
+DeadbandFilter passes polled sensor values and status() mode changes on
+to its sinks only when they leave a per-sensor deadband.
+
 """
 __VERSION__ = '0.1.0'
 from vgmotor.evoschedule import EVOSchedule
 from vgmotor.base import VGMotorBase, MotorStatus
-from vgmotor.generic import VGMotorGeneric
+from vgmotor.configimage import ConfigImage
+from vgmotor.configtransaction import ConfigTransaction
+from vgmotor.configfields import ConfigField, ConfigFieldRegistry
+from vgmotor.bus import VGMotorBus
+from vgmotor.portpool import PortPool
+from vgmotor.framer import VGMotorRtuFramer
+from vgmotor.timing import ResponseTimeout
+from vgmotor.health import UnitHealth
+from vgmotor.generic import VGMotorGeneric, SensorRecord
 from vgmotor.evo import VGMotorEVO
+from vgmotor.poller import SensorPoller
+from vgmotor.keepalive import KeepAlive, AsyncKeepAlive
+from vgmotor.sensorcache import SensorCache
+from vgmotor.telemetry import SensorRing, Telemetry
+from vgmotor.recorder import TelemetryRecorder, TelemetryReader
+from vgmotor.aggregate import RollingWindow, Downsampler, Aggregator
+from vgmotor.deadband import DeadbandFilter, ChangeEvent
+from vgmotor.asyncbase import VGMotorAsyncBase
+from vgmotor.asyncgeneric import VGMotorAsyncGeneric
+from vgmotor.asyncevo import VGMotorAsyncEVO
@@ -0,0 +1,262 @@
+"""Modbus Package for Regal Beloit EPC VGreen Motor family
+
+Rolling aggregates of sensor readings, updated in O(1) per sample.
+
+RollingWindow keeps the min, max, mean, standard deviation and time
+weighted average of the samples in the last window seconds.  The sums
+are updated as samples enter and leave the window and the extremes come
+from monotonic deques, so no statistic rescans the samples.
+
+Downsampler folds samples into fixed width buckets (count, min, max,
+mean) at several resolutions, keeping a bounded number of buckets per
+resolution, so dashboards and long term storage work from the buckets
+rather than from raw samples.
+
+Aggregator holds both for each (unit, sensor) and takes the SensorPoller
+callback, scaling raw readings with the VGMotorGeneric sensor tuple:
+
+    aggregator = Aggregator(windows=(60, 900, 3600))
+    poller.add(0x15, VGMotorGeneric.CURRENT, 1)
+    poller.run(aggregator.record)
+    stats = aggregator.stats(0x15, VGMotorGeneric.CURRENT, 900)
+    print(stats.mean, stats.stddev, stats.time_weighted)
+"""
+from collections import deque, namedtuple
+import math
+import threading
+import time
+
+from . generic import VGMotorGeneric
+
+WindowStats = namedtuple(
+        "WindowStats",
+        ["count", "minimum", "maximum", "mean", "stddev", "time_weighted"])
+WindowStats.__doc__ = """Statistics of the samples in a RollingWindow
+
+Every statistic is NaN while the window is empty; time_weighted is NaN
+until two samples span some time.
+"""
+
+Bucket = namedtuple("Bucket", ["start", "count", "minimum", "maximum", "mean"])
+Bucket.__doc__ = """Samples of one Downsampler interval starting at start"""
+
+class RollingWindow:
+    """Statistics of the samples in the last window seconds
+
+    Failed readings (NaN) are not added.  Timestamps must not decrease.
+    The time weighted average holds each sample until the next one.
+    """
+
+    def __init__(self, window):
+        """Creates an empty window
+
+        :param window: seconds of samples kept
+        """
+        self.window = window
+        self._samples = deque()  #(timestamp, value)
+        self._minimum = deque()  #(timestamp, value) increasing values
+        self._maximum = deque()  #(timestamp, value) decreasing values
+        self._sum = 0.0
+        self._sum_squares = 0.0
+        self._area = 0.0  #sum of value * time until the next sample
+
+    def __len__(self):
+        return len(self._samples)
+
+    def add(self, timestamp, value):
+        """Adds a sample and drops the samples that left the window
+
+        :param timestamp: time of the sample
+        :param value: sample value; NaN only expires old samples
+        """
+        if value != value:
+            self.expire(timestamp)
+            return
+        if self._samples:
+            last_timestamp, last_value = self._samples[-1]
+            self._area += last_value * (timestamp - last_timestamp)
+        self._samples.append((timestamp, value))
+        self._sum += value
+        self._sum_squares += value * value
+        while self._minimum and self._minimum[-1][1] >= value:
+            self._minimum.pop()
+        self._minimum.append((timestamp, value))
+        while self._maximum and self._maximum[-1][1] <= value:
+            self._maximum.pop()
+        self._maximum.append((timestamp, value))
+        self.expire(timestamp)
+
+    def expire(self, now):
+        """Drops the samples older than window seconds before now
+
+        :param now: current time on the timestamps' clock
+        """
+        cutoff = now - self.window
+        samples = self._samples
+        while samples and samples[0][0] <= cutoff:
+            timestamp, value = samples.popleft()
+            if samples:
+                self._area -= value * (samples[0][0] - timestamp)
+            self._sum -= value
+            self._sum_squares -= value * value
+        while self._minimum and self._minimum[0][0] <= cutoff:
+            self._minimum.popleft()
+        while self._maximum and self._maximum[0][0] <= cutoff:
+            self._maximum.popleft()
+        if not samples:
+            #Start over from exact zeros rather than accumulated rounding
+            self._sum = self._sum_squares = self._area = 0.0
+
+    def stats(self):
+        """Returns the WindowStats of the samples in the window"""
+        count = len(self._samples)
+        if count == 0:
+            nan = float("NaN")
+            return WindowStats(0, nan, nan, nan, nan, nan)
+        mean = self._sum / count
+        variance = max(self._sum_squares / count - mean * mean, 0.0)
+        span = self._samples[-1][0] - self._samples[0][0]
+        time_weighted = self._area / span if span > 0 else float("NaN")
+        return WindowStats(count, self._minimum[0][1], self._maximum[0][1],
+                           mean, math.sqrt(variance), time_weighted)
+
+class Downsampler:
+    """Fixed interval buckets of samples at several resolutions"""
+
+    def __init__(self, resolutions=(60, 900, 3600), keep=1440):
+        """Creates a downsampler with no buckets
+
+        :param resolutions: (optional) bucket widths in seconds
+        :param keep: (optional) completed buckets kept per resolution
+        """
+        self.resolutions = tuple(resolutions)
+        self._buckets = {resolution: deque(maxlen=keep) for resolution in self.resolutions}
+        self._open = {}  #resolution: [start, count, minimum, maximum, sum]
+
+    def add(self, timestamp, value):
+        """Adds a sample to the open bucket of every resolution
+
+        :param timestamp: time of the sample
+        :param value: sample value; NaN is ignored
+        """
+        if value != value:
+            return
+        for resolution in self.resolutions:
+            start = timestamp - timestamp % resolution
+            bucket = self._open.get(resolution)
+            if bucket is None or bucket[0] != start:
+                if bucket is not None:
+                    self._buckets[resolution].append(Downsampler._close(bucket))
+                self._open[resolution] = [start, 1, value, value, value]
+                continue
+            bucket[1] += 1
+            if value < bucket[2]:
+                bucket[2] = value
+            if value > bucket[3]:
+                bucket[3] = value
+            bucket[4] += value
+
+    def buckets(self, resolution, include_open=False):
+        """Returns the completed buckets of a resolution, oldest first
+
+        :param resolution: one of resolutions
+        :param include_open: (optional) append the bucket still filling
+        :returns: list of Bucket
+        """
+        buckets = list(self._buckets[resolution])
+        bucket = self._open.get(resolution)
+        if include_open and bucket is not None:
+            buckets.append(Downsampler._close(bucket))
+        return buckets
+
+    @staticmethod
+    def _close(bucket):
+        start, count, minimum, maximum, total = bucket
+        return Bucket(start, count, minimum, maximum, total / count)
+
+class Aggregator:
+    """RollingWindows and a Downsampler per (unit, sensor)"""
+
+    def __init__(self, windows=(60, 900, 3600), resolutions=(60, 900, 3600),
+                 keep=1440, raw=False, clock=time.time):
+        """Creates an aggregator with no sensors
+
+        :param windows: (optional) rolling window lengths in seconds
+        :param resolutions: (optional) downsampling bucket widths in seconds
+        :param keep: (optional) completed buckets kept per resolution
+        :param raw: (optional) record() takes read_sensor_raw() values
+        :param clock: (optional) function returning the sample timestamp
+        """
+        self.windows = tuple(windows)
+        self.resolutions = tuple(resolutions)
+        self.keep = keep
+        self.raw = raw
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._sensors = {}  #(unit, sensor): ({window: RollingWindow}, Downsampler)
+
+    def record(self, unit, sensor, value, timestamp=None):
+        """Adds a reading to every window and resolution of a sensor
+
+        Matches the SensorPoller callback; pass raw=True to the
+        Aggregator when the poller is created with raw=True.
+
+        :param unit:  Target Modbus slave address
+        :param sensor: VGMotorGeneric tuple for the sensor
+        :param value: read_sensor() value, or raw reading if raw; None or NaN on error
+        :param timestamp: (optional) time of the reading; default clock()
+        """
+        if value is None:
+            value = float("NaN")  #a failed read still expires old samples
+        elif self.raw:
+            scale = sensor[VGMotorGeneric._SCALE]
+            value = value / scale if scale is not None else value
+        value = float(value)
+        with self._lock:
+            if timestamp is None:
+                timestamp = self.clock()
+            windows, downsampler = self._entry(unit, sensor)
+            for window in windows.values():
+                window.add(timestamp, value)
+            downsampler.add(timestamp, value)
+
+    def stats(self, unit, sensor, window, now=None):
+        """Returns the rolling statistics of a sensor
+
+        :param unit:  Target Modbus slave address
+        :param sensor: VGMotorGeneric tuple for the sensor
+        :param window: one of windows
+        :param now: (optional) expire samples older than window before now
+        :returns: WindowStats
+        """
+        with self._lock:
+            rolling = self._entry(unit, sensor)[0][window]
+            if now is not None:
+                rolling.expire(now)
+            return rolling.stats()
+
+    def buckets(self, unit, sensor, resolution, include_open=False):
+        """Returns the downsampled series of a sensor
+
+        :param unit:  Target Modbus slave address
+        :param sensor: VGMotorGeneric tuple for the sensor
+        :param resolution: one of resolutions
+        :param include_open: (optional) append the bucket still filling
+        :returns: list of Bucket, oldest first
+        """
+        with self._lock:
+            return self._entry(unit, sensor)[1].buckets(resolution, include_open)
+
+    def keys(self):
+        """Returns the aggregated (unit, sensor) pairs"""
+        with self._lock:
+            return list(self._sensors)
+
+    def _entry(self, unit, sensor):
+        """Returns the windows and downsampler of a sensor; caller holds the lock"""
+        entry = self._sensors.get((unit, sensor))
+        if entry is None:
+            windows = {window: RollingWindow(window) for window in self.windows}
+            entry = (windows, Downsampler(self.resolutions, self.keep))
+            self._sensors[(unit, sensor)] = entry
+        return entry
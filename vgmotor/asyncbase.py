@@ -0,0 +1,275 @@
+"""Modbus Package for Regal Beloit EPC VGreen Motor family
+
+VGMotorAsyncBase implements all of the supported custom Modbus commands
+as asyncio coroutines.
+
+This is the asyncio twin of VGMotorBase.  It uses the same Request and
+Response PDU classes and the same error handling; only the transport is
+different.  The client must be an asyncio pymodbus client (e.g.
+AsyncModbusSerialClient) so that a single event loop can drive several
+RS-485 ports without a thread per motor.
+"""
+import asyncio
+import time
+from pymodbus.pdu import ModbusResponse
+import pymodbus.client.base
+import pymodbus.exceptions as exceptions
+import logging
+
+from . base import (client_state, response_values, singleflight_key,
+        GoRequest, StopRequest, StatusRequest, SetDemandRequest,
+        ReadSensorRequest, ReadIDRequest, ReadConfigRequest,
+        WriteConfigRequest, StoreConfigRequest, MotorStatus)
+from . framer import preframed
+from . health import RequestSkipped
+from . singleflight import AsyncSingleflight
+from . timing import set_timeout
+
+log = logging.getLogger()
+
+class VGMotorAsyncBase:
+    """Asyncio base class for the VGreen motor family
+
+    This class is intended to be subclassed by a spcific motor
+    implementation, however it can be used directly for raw access
+    to sensors and configuration addresses.
+    """
+    def __init__(self, client, timeouts=None, health=None):
+        """Registers each response message with the decoder
+
+        :param client: an asyncio ModbusBaseClient object
+        :param timeouts: (optional) ResponseTimeout policy setting the
+                         client timeout per request
+        :param health: (optional) UnitHealth retrying garbled responses and
+                       skipping units that stay silent
+        """
+        if not isinstance(client, pymodbus.client.base.ModbusBaseClient):
+            raise exceptions.ParameterException("client must be a ModbusBaseClient class")
+        if not client.use_protocol:
+            raise exceptions.ParameterException("client must be an asyncio client (e.g. AsyncModbusSerialClient)")
+        self.client = client
+        self.timeouts = timeouts
+        self.health = health
+        state = client_state(client)
+        if state.async_lock is None:
+            #RS-485 is half duplex; one transaction at a time per client
+            state.async_lock = asyncio.Lock()
+            state.async_singleflight = AsyncSingleflight()
+        self._bus_lock = state.async_lock
+        self._singleflight = state.async_singleflight
+        self._last_success = state.last_success  #unit: time.monotonic()
+
+    async def go(self, unit):
+        """Performs Modbus Go Function (0x41)
+
+        Errors are logged. Returns true if no errors.
+
+        :param unit:  Target Modbus slave address
+        :returns: True - no errors
+        """
+        request = preframed(GoRequest, unit)
+        values = await self._execute_modbus_function(request)
+        return values
+
+    async def stop(self, unit):
+        """Performs Modbus Stop Function (0x42)
+
+        Errors are logged. Returns true if no errors.
+
+        :param unit:  Target Modbus slave address
+        :returns: True - no errors
+        """
+        request = preframed(StopRequest, unit)
+        values = await self._execute_modbus_function(request)
+        return values
+
+    async def status(self, unit):
+        """Performs Modbus Status Function (0x43)
+
+        Errors are logged. Returns MotorStatus() if no errors, None on
+        error.
+
+        :param unit:  Target Modbus slave address
+        :returns: status value or None on error
+        """
+        request = preframed(StatusRequest, unit)
+        values = await self._execute_modbus_function(request)
+        if values is not None:
+            return MotorStatus(values[0])
+
+        return values
+
+    async def set_demand(self, unit, mode, demand):
+        """Performs Modbus Set Demand Function (0x44)
+
+        Errors are logged. See VGMotorBase.set_demand() for the serial
+        watchdog behavior.
+
+        :param unit:  Target Modbus slave address
+        :param mode:  0-Speed, 1-Torque
+        :param demand:  Requested speed(RPM) or torque(lb-ft)
+        :returns: demand as echoed by the motor; None on error
+        """
+        request = SetDemandRequest(unit=unit, mode=mode, demand=demand)
+        values = await self._execute_modbus_function(request)
+        if values is not None:
+            if mode == 0:
+                return int(values[0] / 4)  #RPM
+            else:
+                return int(values[0] / 1200)  #Torque
+
+        return values
+
+    async def read_sensor(self, unit, page, address):
+        """Performs Modbus Read Sensor Function (0x45)
+
+        Errors are logged and None is returned, otherwise a single
+        value is retured.
+
+        :param unit:  Target Modbus slave address
+        :param page:  Sensor page
+        :param address:  Sensor address on page
+        :returns: Sensor value or None on error
+        """
+        request = preframed(ReadSensorRequest, unit, page, address)
+        values = await self._execute_modbus_function(request)
+        if values is not None:
+            return values[0]
+
+        return values
+
+    async def read_id(self, unit, address, length):
+        """Performs Modbus Read Identification Function (0x46)
+
+        Errors are logged. Returns bytes as read
+
+        :param unit:  Target Modbus slave address
+        :param address:  Identity address to read
+        :param length:  Number of bytes to read
+        :returns: bytearray of read bytes; None on error
+        """
+        request = preframed(ReadIDRequest, unit, address, length)
+        values = await self._execute_modbus_function(request)
+        return values
+
+    async def read_config(self, unit, page, address, length):
+        """Performs Modbus Read Configuration Function (0x64)
+
+        Errors are logged. Returns bytes as read
+
+        :param unit:  Target Modbus slave address
+        :param page:  Config page to read
+        :param address:  Config address to read
+        :param length:  Number of bytes to read
+        :returns: bytearray of read bytes; None on error
+        """
+        request = preframed(ReadConfigRequest, unit, page, address, length)
+        values = await self._execute_modbus_function(request)
+        return values
+
+    async def write_config(self, unit, page, address, length, data):
+        """Performs Modbus Write Configuration Function (0x64)
+
+        Errors are logged. Returns bytes as read
+
+        :param unit:  Target Modbus slave address
+        :param page:  Config page to read
+        :param address:  Config address to read
+        :param length:  Number of bytes to read
+        :param data: bytearray of data to write
+        :returns: bytearray of read bytes; None on error
+        """
+        request = WriteConfigRequest(unit=unit, page=page, address=address, length=length, data=data)
+        values = await self._execute_modbus_function(request)
+        return values
+
+    async def store_config(self, unit):
+        """Performs Modbus Store Config Function (0x65)
+
+        Errors are logged. Returns true if no errors.
+
+        :param unit:  Target Modbus slave address
+        :returns: True - no errors
+        """
+        request = preframed(StoreConfigRequest, unit)
+        values = await self._execute_modbus_function(request)
+        return values
+
+    async def _execute_modbus_function(self, request):
+        """Awaits Modbus library execute() and logs errors
+
+        The asyncio clients raise on timeout and lost connections rather
+        than returning an exception object, so those are converted here
+        and reported exactly like VGMotorBase does.  Transactions are
+        serialized per client since tasks for several units may share
+        one RS-485 port.  Identical read requests made by several tasks at
+        once share one transaction and its result.
+
+        :param request: ModbusRequest class to execute
+        :returns: None - Errors; True - success; or values[] for data
+        """
+        key = singleflight_key(request)
+        if key is None:
+            return await self._execute_modbus_values(request)
+        return await self._singleflight.do(key, lambda: self._execute_modbus_values(request))
+
+    async def _execute_modbus_values(self, request):
+        """Executes request with retries and returns the decoded values
+
+        :param request: ModbusRequest class to execute
+        :returns: None - Errors; True - success; or values[] for data
+        """
+        unit = request.slave_id
+        if self.health is not None and not self.health.allow(unit):
+            return response_values(RequestSkipped(
+                    f"Modbus slave 0x{unit:02x} is not responding, request skipped",
+                    request.function_code))
+        attempt = 0
+        while True:
+            result = await self._execute_once(request)
+            if self.health is None or not self.health.record(unit, result):
+                break
+            delay = self.health.retry_delay(unit, attempt, result)
+            #pymodbus drops the connection on a timeout; a retry before
+            #it has reconnected would fail at once
+            if delay is None or not getattr(self.client, 'async_connected', True):
+                break
+            #Sleep outside the bus lock so other units keep the bus busy
+            await asyncio.sleep(delay)
+            attempt += 1
+        if isinstance(result, ModbusResponse) and not result.isError():
+            self._last_success[unit] = time.monotonic()
+        return response_values(result)
+
+    def last_success(self, unit):
+        """Returns the time of the last successful transaction with unit
+
+        See VGMotorBase.last_success(); both share the per-client record.
+
+        :param unit:  Target Modbus slave address
+        :returns: time.monotonic() value or None if never successful
+        """
+        return self._last_success.get(unit)
+
+    async def _execute_once(self, request):
+        """Sends request once while holding the bus
+
+        :param request: ModbusRequest class to execute
+        :returns: ModbusResponse or ModbusException
+        """
+        try:
+            async with self._bus_lock:
+                if self.timeouts is not None:
+                    set_timeout(self.client, self.timeouts.timeout(request))
+                    start = time.monotonic()
+                    result = await self.client.execute(request)
+                    if isinstance(result, ModbusResponse) and not result.isError():
+                        self.timeouts.measure(request, time.monotonic() - start)
+                else:
+                    result = await self.client.execute(request)
+        except asyncio.TimeoutError:
+            result = exceptions.ModbusIOException(
+                    "No Response received from the remote slave", request.function_code)
+        except exceptions.ModbusException as exc:
+            result = exc
+        return result
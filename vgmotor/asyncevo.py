@@ -0,0 +1,172 @@
+"""Modbus Package for Regal Beloit EPC VGreen Motor family
+
+VGMotorAsyncEVO is the asyncio version of VGMotorEVO and provides access
+to the EVO specific configuration storage
+
+WARNING:  Config addresses are all unique to VGreen EVO motor.
+          Similar config exists for other motors but at different
+          flash address locations.
+"""
+
+from . asyncgeneric import VGMotorAsyncGeneric
+from . evo import VGMotorEVO
+from . evoschedule import EVOSchedule
+
+class VGMotorAsyncEVO(VGMotorAsyncGeneric):
+    """Provides asyncio access to the EVO specific configuration storage
+
+    The config fields are shared with VGMotorEVO.  See VGMotorEVO for the
+    description of each setting.
+
+    Only the per-item accessors and single schedule slots are available
+    here.  The config page mirror, config_values(), schedule_set(),
+    schedule_set_write(), config_transaction(), apply_config() and
+    dump_config() are sync-only (VGMotorEVO), so each item read here is
+    one read_config transaction.
+    """
+
+    FIELDS = VGMotorEVO.FIELDS
+
+    async def serial_timeout(self, unit, **kwargs):
+        """Read or Write serial control timeout
+
+        :param unit:  Target Modbus slave address
+        :param timeout: (optional) new timeout seconds
+        :returns: timeout seconds as int or formatted string
+        """
+        if kwargs.get('timeout'):
+            ret_val = kwargs['timeout']
+            #TODO: write the timeout to flash
+        else:
+            ret_val = await self._read_field(unit, "serial_timeout")
+        return ret_val
+
+    async def motor_address(self, unit, **kwargs):
+        """Read or Write motor slave address
+
+        :param unit:  Target Modbus slave address
+        :param address: (optional) new motor slave address
+        :returns: motor slave address as int or formatted string
+        """
+        if kwargs.get('address'):
+            ret_val = kwargs['address']
+            #TODO: write the address to flash
+        else:
+            ret_val = await self._read_field(unit, "motor_address")
+        return ret_val
+
+    async def digital_in_enable(self, unit, input, **kwargs):
+        """Read or Write enable for digital input
+
+        :param unit:  Target Modbus slave address
+        :param input:  Input number (1-4)
+        :param enable: (optional) True|False - Enable value
+        :returns: enable value (0|1) as int or formatted string
+        """
+        if kwargs.get('enable'):
+            ret_val = kwargs['enable']
+            #TODO: write the enable to flash
+        else:
+            ret_val = await self._read_field(unit, "digital_input_enable", input-1)
+        return ret_val
+
+    async def digital_in_rpm(self, unit, input, **kwargs):
+        """Read or Write rpm for digital input
+
+        :param unit:  Target Modbus slave address
+        :param input:  Input number (1-4)
+        :param rpm: (optional) new RPM value (600-3450)
+        :returns: RPM value as int or formatted string
+        """
+        if kwargs.get('rpm'):
+            data = kwargs['rpm']
+            ret_val = await self._write_field(unit, "digital_input_rpm", data, input-1)
+        else:
+            ret_val = await self._read_field(unit, "digital_input_rpm", input-1)
+        return ret_val
+
+    async def selected_schedule(self, unit, set, **kwargs):
+        """Read or Write the selected schedule slot for set
+
+        :param unit:  Target Modbus slave address
+        :param set:  Schedule Set 'A' or 'B'
+        :param slot: (named/optional) new schedule slot value (1-8)
+        :returns: scheule value as int
+        """
+        if kwargs.get('slot'):
+            ret_val = kwargs['slot']
+            #TODO: write the schedule slot to flash
+        else:
+            ret_val = await self._read_field(
+                    unit, VGMotorEVO._schedule_field("selected_schedule", set))
+        return ret_val
+
+    async def _write_field(self, unit, name, value, index=0):
+        """Writes a named config field element
+
+        :param unit:  Target Modbus slave address
+        :param name: field name in FIELDS
+        :param value: decoded (scaled) value to write
+        :param index: (optional) array element
+        :returns: _ConfigInt object (int or formatted string) as echoed
+        """
+        page, address, data = self.FIELDS.encode(name, value, index)
+        val_bytes = await self.write_config(
+                unit = unit,
+                page = page,
+                address = address,
+                length = len(data),
+                data = data
+                )
+        return VGMotorEVO._field_value(self.FIELDS, name, val_bytes)
+
+    async def _read_field(self, unit, name, index=0):
+        """Reads a named config field element
+
+        :param unit:  Target Modbus slave address
+        :param name: field name in FIELDS
+        :param index: (optional) array element
+        :returns: _ConfigInt object (int or formatted string)
+        """
+        page, address, length = self.FIELDS.location(name, index)
+        val_bytes = await self.read_config(unit, page, address, length)
+        return VGMotorEVO._field_value(self.FIELDS, name, val_bytes)
+
+    async def schedule_slot(self, unit:int, set:str, slot:int) -> EVOSchedule:
+        """Read a schedule slot
+
+        :param unit:  Target Modbus slave address
+        :param set:  Schedule set 'A' or 'B'
+        :param slot:  Schedule slot 1-8
+        :returns: EVOSchedule object holding all steps
+        """
+        schedule = EVOSchedule( set, slot)
+        page, address, length = VGMotorEVO._schedule_location(schedule)
+
+        val_bytes = await self.read_config( unit, page, address, length)
+
+        schedule.bytes_to_schedule( val_bytes)
+
+        return schedule
+
+    async def schedule_slot_write(self, unit:int, schedule:EVOSchedule) -> EVOSchedule:
+        """Write a schedule slot
+
+        :param unit:  Target Modbus slave address
+        :param schedule:  EVOSchedule object holding all steps
+        :returns:  EVOSchedule object holding all steps
+        """
+        page, address, length = VGMotorEVO._schedule_location(schedule)
+
+        data = schedule.schedule_to_bytes()
+        val_bytes = await self.write_config(
+                unit = unit,
+                page = page,
+                address = address,
+                length = length,
+                data = data
+                )
+
+        schedule.bytes_to_schedule( val_bytes)
+
+        return schedule
@@ -0,0 +1,95 @@
+"""Modbus Package for Regal Beloit EPC VGreen Motor family
+
+VGMotorAsyncGeneric is the asyncio version of VGMotorGeneric.  It provides
+formatted responses for each supported sensor and item of identification.
+
+stream() is an async generator:
+
+    async for record in motor.stream(0x15, [VGMotorGeneric.SPEED], period=0.5):
+
+"""
+import asyncio
+import time
+
+from . asyncbase import VGMotorAsyncBase
+from . generic import VGMotorGeneric
+
+class VGMotorAsyncGeneric(VGMotorAsyncBase):
+    """Provides formatted responses for all supported sensor and
+    identification common to all motors
+
+    The sensor tuples are shared with VGMotorGeneric so either constant
+    (e.g. VGMotorGeneric.SPEED or VGMotorAsyncGeneric.SPEED) may be used.
+    """
+
+    SPEED = VGMotorGeneric.SPEED
+    CURRENT = VGMotorGeneric.CURRENT
+    OPERATING_MODE = VGMotorGeneric.OPERATING_MODE
+    DEMAND_RPM = VGMotorGeneric.DEMAND_RPM
+    DEMAND_TORQUE = VGMotorGeneric.DEMAND_TORQUE
+    TORQUE = VGMotorGeneric.TORQUE
+    POWER_INVERTER_INPUT = VGMotorGeneric.POWER_INVERTER_INPUT
+    TEMP_AMBIENT = VGMotorGeneric.TEMP_AMBIENT
+    POWER_SHAFT_OUTPUT = VGMotorGeneric.POWER_SHAFT_OUTPUT
+    DIGITAL_INPUT_ACTIVE = VGMotorGeneric.DIGITAL_INPUT_ACTIVE
+
+    MotorIdentification = VGMotorGeneric.MotorIdentification
+
+    async def read_sensor(self, unit, sensor):
+        """Return a formatted representation of a sensor
+
+        :param unit:  Target Modbus slave address
+        :param sensor: VGMotorGeneric tuple for requested sensor
+        :returns: float which evaluates to a formatted string
+        """
+        page = sensor[VGMotorGeneric._PAGE]
+        address = sensor[VGMotorGeneric._ADDRESS]
+
+        value = await super().read_sensor(unit, page, address)
+        return(VGMotorGeneric._sensor_value(sensor, value))
+
+    async def stream(self, unit, sensors, period, count=None):
+        """Yields the sensors of a unit every period seconds
+
+        See VGMotorGeneric.stream().
+
+        :param unit:  Target Modbus slave address
+        :param sensors: VGMotorGeneric tuples to read on each pass
+        :param period: seconds between the starts of consecutive passes
+        :param count: (optional) number of records; default unlimited
+        :returns: async generator of SensorRecord
+        """
+        sensors = tuple(sensors)
+        deadline = time.monotonic()
+        produced = 0
+        while count is None or produced < count:
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            values = []
+            for sensor in sensors:
+                values.append(await self.read_sensor(unit, sensor))
+            yield VGMotorGeneric._sensor_record(unit, tuple(values))
+            produced += 1
+            #Skip periods missed while the consumer was busy rather than bursting
+            deadline = max(deadline + period, time.monotonic())
+
+    async def read_sensor_raw(self, unit, sensor):
+        """Return the unscaled reading of a sensor
+
+        :param unit:  Target Modbus slave address
+        :param sensor: VGMotorGeneric tuple for requested sensor
+        :returns: raw integer reading or None on error
+        """
+        page = sensor[VGMotorGeneric._PAGE]
+        address = sensor[VGMotorGeneric._ADDRESS]
+        return await super().read_sensor(unit, page, address)
+
+    async def read_identification(self, unit):
+        """Reads and parses the motor identification data
+
+        :param unit:  Target Modbus slave address
+        :returns: MotorIdentification class
+        """
+        data = await self.read_id(unit, address=0x00, length=27)
+        return(self.MotorIdentification(data))
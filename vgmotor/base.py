@@ -16,15 +16,33 @@ classes.  See
 https://github.com/riptideio/pymodbus/tree/dev/examples/v2.5.3/custom_message.py
 for examples of the server methods if this is ever extended to provide a
 server implemenation.
+
+Requests without variable data (everything except set_demand() and
+write_config()) are taken from the preframed() cache so repeated polls
+reuse one encoded frame.  See vgmotor.framer.
 """
 from pymodbus.pdu import ModbusRequest, ModbusResponse, ExceptionResponse
 import pymodbus.client.base
 import pymodbus.exceptions as exceptions
+import contextlib
 import struct
 import logging
+import threading
+import time
+import weakref
+
+from . bus import VGMotorBus
+from . configimage import ConfigImage
+from . configtransaction import ConfigTransaction, changed_runs, WRITE_OVERHEAD
+from . framer import preframed
+from . health import RequestSkipped
+from . singleflight import Singleflight
 
 log = logging.getLogger()
 
+# Config page and address fields are one byte
+_CONFIG_ADDRESSES = 256
+
 class VGMotorBase:
     """Base class for the VGreen motor family
 
@@ -32,24 +50,42 @@ class VGMotorBase:
     implementation, however it can be used directly for raw access
     to sensors and configuration addresses.
     """
-    def __init__(self, client):
+    #Bytes per config read until config_max_length() is known, and per
+    #config write unless set_config_write_length() is called
+    config_chunk = 16
+
+    def __init__(self, client, timeouts=None, health=None, thread_safe=False):
         """Registers each response message with the decoder
 
-        :param client: a ModbusBaseClient object
+        The registration, last_success(), config_max_length(),
+        config_write_length() and the coalescing of identical reads are
+        shared by every motor object using the same client, so per-unit
+        motor objects are cheap.
+
+        :param client: a ModbusBaseClient object or a VGMotorBus sharing one
+        :param timeouts: (optional) ResponseTimeout policy setting the
+                         client timeout per request.  Give the policy to
+                         the VGMotorBus instead when sharing a bus.
+        :param health: (optional) UnitHealth retrying garbled responses and
+                       skipping units that stay silent
+        :param thread_safe: (optional) True to hold the per-client bus lock
+                            around each transaction so threads can share
+                            the client.  Not needed with a VGMotorBus.
         """
-        if not isinstance(client, pymodbus.client.base.ModbusBaseClient):
-            raise exceptions.ParameterException("client must be a ModbusBaseClient class")
+        if not isinstance(client, (pymodbus.client.base.ModbusBaseClient, VGMotorBus)):
+            raise exceptions.ParameterException("client must be a ModbusBaseClient or VGMotorBus class")
         self.client = client
-
-        self.client.register(GoResponse)
-        self.client.register(StopResponse)
-        self.client.register(StatusResponse)
-        self.client.register(SetDemandResponse)
-        self.client.register(ReadSensorResponse)
-        self.client.register(ReadIDResponse)
-        self.client.register(ReadConfigResponse)
-        self.client.register(WriteConfigResponse)
-        self.client.register(StoreConfigResponse)
+        self.timeouts = timeouts
+        self.health = health
+        state = client_state(client)
+        self._last_success = state.last_success  #unit: time.monotonic()
+        self._config_max_length = state.config_max_length  #unit: largest accepted read_config length
+        self._config_write_length = state.config_write_length  #unit: write_config length to use
+        self._singleflight = state.singleflight
+        if thread_safe and not isinstance(client, VGMotorBus):
+            self._bus_lock = state.lock
+        else:
+            self._bus_lock = contextlib.nullcontext()
 
     def go(self, unit):
         """Performs Modbus Go Function (0x41)
@@ -59,7 +95,7 @@ class VGMotorBase:
         :param unit:  Target Modbus slave address
         :returns: True - no errors
         """
-        request = GoRequest(unit=unit)
+        request = preframed(GoRequest, unit)
         values = self._execute_modbus_function(request)
         return values
 
@@ -71,7 +107,7 @@ class VGMotorBase:
         :param unit:  Target Modbus slave address
         :returns: True - no errors
         """
-        request = StopRequest(unit=unit)
+        request = preframed(StopRequest, unit)
         values = self._execute_modbus_function(request)
         return values
 
@@ -86,7 +122,7 @@ class VGMotorBase:
         :param unit:  Target Modbus slave address
         :returns: status value or None on error
         """
-        request = StatusRequest(unit=unit)
+        request = preframed(StatusRequest, unit)
         values = self._execute_modbus_function(request)
         if values is not None:
             return MotorStatus(values[0])
@@ -129,7 +165,7 @@ class VGMotorBase:
         :param address:  Sensor address on page
         :returns: Sensor value or None on error
         """
-        request = ReadSensorRequest(unit=unit, page=page, address=address)
+        request = preframed(ReadSensorRequest, unit, page, address)
         values = self._execute_modbus_function(request)
         if values is not None:
             return values[0]
@@ -146,7 +182,7 @@ class VGMotorBase:
         :param length:  Number of bytes to read
         :returns: bytearray of read bytes; None on error
         """
-        request = ReadIDRequest(unit=unit, address=address, length=length)
+        request = preframed(ReadIDRequest, unit, address, length)
         values = self._execute_modbus_function(request)
         return values
 
@@ -161,7 +197,7 @@ class VGMotorBase:
         :param length:  Number of bytes to read
         :returns: bytearray of read bytes; None on error
         """
-        request = ReadConfigRequest(unit=unit, page=page, address=address, length=length)
+        request = preframed(ReadConfigRequest, unit, page, address, length)
         values = self._execute_modbus_function(request)
         return values
 
@@ -189,10 +225,253 @@ class VGMotorBase:
         :param unit:  Target Modbus slave address
         :returns: True - no errors
         """
-        request = StoreConfigRequest(unit=unit)
+        request = preframed(StoreConfigRequest, unit)
         values = self._execute_modbus_function(request)
         return values
 
+    def config_transaction(self, unit):
+        """Returns a ConfigTransaction batching config writes to unit
+
+        :param unit:  Target Modbus slave address
+        :returns: ConfigTransaction
+        """
+        return ConfigTransaction(self, unit)
+
+    def _write_config_span(self, unit, page, address, data):
+        """Writes config bytes in writes of config_write_length()
+
+        Writes stop at the first failure.  The failing address is logged
+        together with the bytes already written before it.
+
+        :param unit:  Target Modbus slave address
+        :param page:  Config page to write
+        :param address:  Config address to write
+        :param data: bytes to write
+        :returns: number of bytes written and echoed unchanged; len(data)
+                  on success
+        """
+        max_write = self.config_write_length(unit)
+        for offset in range(0, len(data), max_write):
+            piece = bytes(data[offset:offset+max_write])
+            val_bytes = self.write_config(unit, page, address + offset, len(piece), piece)
+            if val_bytes is not None and bytes(val_bytes) != piece:
+                log.error(f"Modbus slave 0x{unit:02x} config write 0x{page:02x}:"
+                          f"0x{address + offset:02x} echoed {bytes(val_bytes).hex()}, "
+                          f"expected {piece.hex()}")
+                val_bytes = None
+            if val_bytes is None:
+                if offset:
+                    log.error(f"Modbus slave 0x{unit:02x} config write 0x{page:02x}:"
+                              f"0x{address + offset:02x} failed after 0x{page:02x}:"
+                              f"0x{address:02x}-0x{address + offset - 1:02x} were written")
+                return offset
+        return len(data)
+
+    def apply_config(self, unit, desired_image):
+        """Writes the bytes of desired_image that differ from the motor
+
+        Each page of desired_image is read from address 0 to its extent
+        (in reads up to config_max_length() once it is known) and compared
+        byte by byte.
+        Only the differing runs are written, in one config_transaction(),
+        so store_config() is sent once, and not at all when the motor
+        already matches.
+
+        :param unit:  Target Modbus slave address
+        :param desired_image: ConfigImage (or dict of page: bytes), e.g.
+                              ConfigImage.load("evo_config_dump")
+        :returns: list of (page, address, bytes) written; None on error
+        """
+        tx = self.config_transaction(unit)
+        for page in desired_image:
+            desired = bytes(desired_image[page])
+            current = self._read_config_bytes(unit, page, 0, len(desired))
+            if current is None:
+                tx.discard()
+                return None
+            for start, end in changed_runs(current, desired, WRITE_OVERHEAD):
+                tx.write(page, start, desired[start:end])
+        runs = tx.runs()
+        if not tx.commit():
+            return None
+        return runs
+
+    def _read_config_bytes(self, unit, page, address, length, max_read=None):
+        """Reads config bytes in as few read_config transactions as allowed
+
+        :param unit:  Target Modbus slave address
+        :param page:  Config page to read
+        :param address:  Config address to read
+        :param length:  Number of bytes to read
+        :param max_read: (optional) longest read to try; default
+                         config_max_length() or config_chunk
+        :returns: bytes read; None on error
+        """
+        if max_read is None:
+            max_read = self.config_max_length(unit) or self.config_chunk
+        data = bytearray()
+        for start in range(address, address + length, max_read):
+            read_len = min(max_read, address + length - start)
+            val_bytes = self._read_config_run(unit, page, start, read_len)
+            if val_bytes is None:
+                return None
+            data += val_bytes
+        return bytes(data)
+
+    def _read_config_run(self, unit, page, address, length):
+        """Reads config bytes, falling back to config_chunk reads if refused
+
+        A read longer than config_chunk is only tried once
+        config_max_length() is known, and chunks are never longer than it.
+
+        :param unit:  Target Modbus slave address
+        :param page:  Config page to read
+        :param address:  Config address to read
+        :param length:  Number of bytes to read
+        :returns: bytes read; None on error
+        """
+        limit = self.config_max_length(unit)
+        chunk = self.config_chunk if limit is None else min(self.config_chunk, limit)
+        if length <= chunk or (limit is not None and length <= limit):
+            result = self._execute_modbus_result(
+                    ReadConfigRequest(unit, page, address, length))
+            if length <= chunk or not isinstance(result, ExceptionResponse):
+                val_bytes = response_values(result)
+                if val_bytes is not None and len(val_bytes) != length:
+                    val_bytes = None
+                return val_bytes
+        data = bytearray()
+        for start in range(address, address + length, chunk):
+            chunk_len = min(chunk, address + length - start)
+            val_bytes = self.read_config(unit, page, start, chunk_len)
+            if val_bytes is None or len(val_bytes) != chunk_len:
+                return None
+            data += val_bytes
+        return data
+
+    def config_max_length(self, unit):
+        """Returns the largest read_config length unit is known to accept
+
+        :param unit:  Target Modbus slave address
+        :returns: bytes, or None until dump_config() has discovered it
+        """
+        return self._config_max_length.get(unit)
+
+    def config_write_length(self, unit):
+        """Returns the write_config length used for bulk writes to unit
+
+        This is config_chunk unless set_config_write_length() was called;
+        the read limit found by dump_config() says nothing about writes.
+
+        :param unit:  Target Modbus slave address
+        :returns: bytes
+        """
+        return self._config_write_length.get(unit, self.config_chunk)
+
+    def set_config_write_length(self, unit, length):
+        """Sets the write_config length unit is known to accept
+
+        :param unit:  Target Modbus slave address
+        :param length: bytes per write_config (1-256)
+        """
+        if not 1 <= length <= _CONFIG_ADDRESSES:
+            raise exceptions.ParameterException(f"write length must be 1-{_CONFIG_ADDRESSES}")
+        self._config_write_length[unit] = length
+
+    def dump_config(self, unit, pages=range(0x10)):
+        """Reads whole config pages into a ConfigImage
+
+        Each page is read from address 0 in the largest reads the motor
+        accepts.  When a read is refused the largest accepted length at
+        that address is found by bisection, and a 1 byte read just past it
+        tells the end of the page from the read length limit of the motor.
+        The limit found is kept per unit (see config_max_length()) so later
+        pages are read without probing.  Pages the motor refuses entirely
+        are left out of the image.
+
+        :param unit:  Target Modbus slave address
+        :param pages: (optional) config pages to read
+        :returns: ConfigImage; None on a communication error
+        """
+        image = ConfigImage()
+        for page in pages:
+            data = self._dump_config_page(unit, page)
+            if data is None:
+                return None
+            if data:
+                image[page] = data
+        return image
+
+    def _dump_config_page(self, unit, page):
+        """Reads one config page up to its first refused address
+
+        :param unit:  Target Modbus slave address
+        :param page:  Config page to read
+        :returns: bytearray (empty for a missing page); None on error
+        """
+        data = bytearray()
+        address = 0
+        while address < _CONFIG_ADDRESSES:
+            limit = self._config_max_length.get(unit, _CONFIG_ADDRESSES)
+            length = min(limit, _CONFIG_ADDRESSES - address)
+            val_bytes = self._probe_config(unit, page, address, length)
+            if val_bytes is False:
+                #Refused: a 1 byte read finds a missing page or an end
+                #on a read boundary without bisecting
+                first = self._probe_config(unit, page, address, 1) if length > 1 else False
+                if first is None:
+                    return None
+                if first is False:
+                    break
+                #Bisect for the largest accepted length
+                good, bad, val_bytes = 1, length, first
+                while bad - good > 1:
+                    mid = (good + bad) // 2
+                    probe = self._probe_config(unit, page, address, mid)
+                    if probe is None:
+                        return None
+                    if probe is False:
+                        bad = mid
+                    else:
+                        good, val_bytes = mid, probe
+                end = self._probe_config(unit, page, address + good, 1)
+                if end is None:
+                    return None
+                data += val_bytes
+                if end is False:
+                    break
+                #Page continues, so good is the read length limit
+                self._config_max_length[unit] = good
+                address += good
+                continue
+            if val_bytes is None:
+                return None
+            data += val_bytes
+            address += length
+        return data
+
+    def _probe_config(self, unit, page, address, length):
+        """Reads config bytes telling a refused read from an error
+
+        :param unit:  Target Modbus slave address
+        :param page:  Config page to read
+        :param address:  Config address to read
+        :param length:  Number of bytes to read
+        :returns: bytes read; False if refused; None on error (logged)
+        """
+        if address + length > _CONFIG_ADDRESSES:
+            return False
+        request = ReadConfigRequest(unit, page, address, length)
+        result = self._execute_modbus_result(request)
+        if isinstance(result, ExceptionResponse):
+            return False
+        values = response_values(result)
+        if values is not None and len(values) != length:
+            log.error(f"Modbus slave 0x{unit:02x} returned {len(values)} config "
+                      f"bytes, expected {length}")
+            values = None
+        return values
+
     def _execute_modbus_function(self, request):
         """Calls Modbus library execute() and logs errors
 
@@ -224,20 +503,158 @@ class VGMotorBase:
             None or [] w/ one value
             None or [] w/ variable length
 
+        With a UnitHealth policy a request that gets no response is
+        retried with backoff, and requests to a unit whose breaker is open
+        return None without being sent.
+
+        Identical read requests (status, read_sensor, read_id, read_config)
+        made by several threads at once share one transaction and its
+        result.  Writes and control functions are always sent.
         """
-        result = self.client.execute(request)
-        values = None
-        if isinstance(result, exceptions.ModbusException):
-            log.error(result)
-        elif isinstance(result, ExceptionResponse):
-            #result.values with be None
-            log.error(f"Modbus slave 0x{result.unit_id:02x} responded with an error: "
-                      f"function: 0x{result.original_code:02x}, "
-                      f"Modbus exception: 0x{result.exception_code:02x}")
-        else:
-            values = result.values
-        
-        return values
+        key = singleflight_key(request)
+        if key is None:
+            return response_values(self._execute_modbus_result(request))
+        return self._singleflight.do(
+                key, lambda: response_values(self._execute_modbus_result(request)))
+
+    def _execute_modbus_result(self, request):
+        """Calls Modbus library execute() without interpreting the result
+
+        Used where an exception response is an answer rather than an
+        error (e.g. finding the end of a config page).
+
+        :param request: ModbusRequest class to execute
+        :returns: ModbusResponse, ExceptionResponse or ModbusException
+        """
+        unit = request.slave_id
+        if self.health is not None and not self.health.allow(unit):
+            return RequestSkipped(
+                    f"Modbus slave 0x{unit:02x} is not responding, request skipped",
+                    request.function_code)
+        attempt = 0
+        while True:
+            result = self._execute_once(request)
+            if self.health is None or not self.health.record(unit, result):
+                break
+            delay = self.health.retry_delay(unit, attempt, result)
+            if delay is None:
+                break
+            time.sleep(delay)
+            attempt += 1
+        if isinstance(result, ModbusResponse) and not result.isError():
+            self._last_success[unit] = time.monotonic()
+        return result
+
+    def _execute_once(self, request):
+        """Sends request once
+
+        :param request: ModbusRequest class to execute
+        :returns: ModbusResponse or ModbusException
+        """
+        try:
+            with self._bus_lock:
+                if self.timeouts is not None and not isinstance(self.client, VGMotorBus):
+                    return self.timeouts.execute(self.client, request)
+                return self.client.execute(request)
+        except exceptions.ModbusException as exc:
+            #e.g. ConnectionException when the port can not be opened
+            return exc
+
+    def last_success(self, unit):
+        """Returns the time of the last successful transaction with unit
+
+        Any successful command resets the motor serial watchdog so this is
+        used to decide when a keepalive is needed.
+
+        :param unit:  Target Modbus slave address
+        :returns: time.monotonic() value or None if never successful
+        """
+        return self._last_success.get(unit)
+
+
+def singleflight_key(request):
+    """Returns the key identifying equivalent read requests
+
+    :param request: ModbusRequest class to execute
+    :returns: hashable key; None for writes and control functions
+    """
+    request_class = getattr(request, 'request_class', type(request))
+    if request_class not in _SINGLEFLIGHT_REQUESTS:
+        return None
+    return (request.slave_id, request.function_code,
+            getattr(request, 'page', None),
+            getattr(request, 'address', None),
+            getattr(request, 'length', None))
+
+class _ClientState:
+    """State shared by every motor object using one client"""
+
+    def __init__(self, client):
+        register_responses(client)
+        self.lock = threading.Lock()  #RS-485 is half duplex
+        self.last_success = {}
+        self.config_max_length = {}
+        self.config_write_length = {}
+        self.singleflight = Singleflight()
+        self.async_lock = None  #created by the first asyncio motor
+        self.async_singleflight = None
+
+_client_states = weakref.WeakKeyDictionary()
+_client_states_lock = threading.Lock()
+
+def client_state(client):
+    """Returns the state shared by every motor object using client
+
+    Response classes are registered with the client when its state is
+    first created.
+
+    :param client: a ModbusBaseClient object or a VGMotorBus
+    :returns: _ClientState
+    """
+    with _client_states_lock:
+        state = _client_states.get(client)
+        if state is None:
+            state = _client_states[client] = _ClientState(client)
+        return state
+
+def register_responses(client):
+    """Registers each VGreen response message with the client decoder
+
+    :param client: a ModbusBaseClient object
+    """
+    client.register(GoResponse)
+    client.register(StopResponse)
+    client.register(StatusResponse)
+    client.register(SetDemandResponse)
+    client.register(ReadSensorResponse)
+    client.register(ReadIDResponse)
+    client.register(ReadConfigResponse)
+    client.register(WriteConfigResponse)
+    client.register(StoreConfigResponse)
+
+def response_values(result):
+    """Logs errors in an execute() result and returns the decoded values
+
+    Shared by the synchronous and asyncio motor classes so both report
+    errors identically.
+
+    :param result: ModbusResponse or ModbusException returned by execute()
+    :returns: None - Errors; True - success; or values[] for data
+    """
+    values = None
+    if isinstance(result, RequestSkipped):
+        log.debug(result)  #UnitHealth logged the breaker opening
+    elif isinstance(result, exceptions.ModbusException):
+        log.error(result)
+    elif isinstance(result, ExceptionResponse):
+        #result.values with be None
+        log.error(f"Modbus slave 0x{result.slave_id:02x} responded with an error: "
+                  f"function: 0x{result.original_code:02x}, "
+                  f"Modbus exception: 0x{result.exception_code:02x}")
+    else:
+        values = result.values
+
+    return values
 
 
 class GoRequest(ModbusRequest):
@@ -554,6 +971,50 @@ class ReadSensorResponse(ModbusResponse):
         self.values.append(value)
 
 
+class _VariableLengthResponse(ModbusResponse):
+    """Common decoder for the variable length responses (0x46, 0x64)
+
+    Unit:1 + Function:1 + ACK:1 + page:1 + address:1 + length:1 +
+    data:length+1 + CRC:2
+    """
+
+    _rtu_byte_count_pos = 5  #Used to index the length parameter in response
+
+    def __init__(self, **kwargs):
+        super().__init__( **kwargs)
+        self.ack = None
+        self.page = None
+        self.address = None
+        self.length = None
+        self.values = None
+
+    def decode(self, data):
+        """Decode variable length response function envelope
+
+        This device message has an extra, mandatory ACK byte (0x10).
+
+        :param data: The byte stream to decode
+        """
+        self.ack, self.page, self.address, length = struct.unpack_from("<BBBB", data)
+        self.length = length + 1
+        self.values = bytes(data[4:])
+
+    @classmethod
+    def calculateRtuFrameSize(cls, buffer):  # pylint: disable=invalid-name
+        """Calculate the size of a PDU.
+
+        On the wire, length is one less than the requested length. 
+        e.g. 0 will request one byte.  This requires a custom implemenation 
+        for calculateRtuFrameSize() as no standard Modbus functions operate 
+        this way.
+
+        :param buffer: A buffer containing the data that have been received.
+        :returns: The number of bytes in the PDU.
+        :raises NotImplementedException:
+        """
+        return int(buffer[cls._rtu_byte_count_pos])+1 + cls._rtu_byte_count_pos + 3
+
+
 class ReadIDRequest(ModbusRequest):
     """(0x46) Read Identification Modbus request class
 
@@ -593,45 +1054,10 @@ class ReadIDRequest(ModbusRequest):
         #framework adds 3 (unit and CRC)
         return self._rtu_frame_size - 3 + self.length
 
-class ReadIDResponse(ModbusResponse):
+class ReadIDResponse(_VariableLengthResponse):
     """(0x46) Read Identification Modbus response"""
 
     function_code = 0x46
-    _rtu_byte_count_pos = 5  #Used to index the length parameter in response
-
-    def __init__(self, **kwargs):
-        super().__init__( **kwargs)
-        self.ack = None
-        self.page = None
-        self.address = None
-        self.length = None
-        self.values = None
-
-    def decode(self, data):
-        """Decode Read Sensor response function envelope
-
-        This device message has an extra, mandatory ACK byte (0x10).
-        
-        :param data: The byte stream to decode
-        """
-        self.ack, self.page, self.address, length = struct.unpack("<BBBB", data[:4])
-        self.length = length + 1
-        self.values = data[4:]
-
-    @classmethod
-    def calculateRtuFrameSize(cls, buffer):  # pylint: disable=invalid-name
-        """Calculate the size of a PDU.
-
-        On the wire, length is one less than the requested length. 
-        e.g. 0 will request one byte.  This requires a custom implemenation 
-        for calculateRtuFrameSize() as no standard Modbus functions operate 
-        this way.
-
-        :param buffer: A buffer containing the data that have been received.
-        :returns: The number of bytes in the PDU.
-        :raises NotImplementedException:
-        """
-        return int(buffer[cls._rtu_byte_count_pos])+1 + cls._rtu_byte_count_pos + 3
 
 
 class ReadConfigRequest(ModbusRequest):
@@ -674,45 +1100,10 @@ class ReadConfigRequest(ModbusRequest):
         #framework adds 3 (unit and CRC)
         return self._rtu_frame_size - 3 + self.length
 
-class ReadConfigResponse(ModbusResponse):
+class ReadConfigResponse(_VariableLengthResponse):
     """(0x64) Read Config Modbus response"""
 
     function_code = 0x64
-    _rtu_byte_count_pos = 5  #Used to index the length parameter in response
-
-    def __init__(self, **kwargs):
-        super().__init__( **kwargs)
-        self.ack = None
-        self.page = None
-        self.address = None
-        self.length = None
-        self.values = None
-
-    def decode(self, data):
-        """Decode Read Sensor response function envelope
-
-        This device message has an extra, mandatory ACK byte (0x10).
-
-        :param data: The byte stream to decode
-        """
-        self.ack, self.page, self.address, length = struct.unpack("<BBBB", data[:4])
-        self.length = length + 1
-        self.values = data[4:]
-
-    @classmethod
-    def calculateRtuFrameSize(cls, buffer):  # pylint: disable=invalid-name
-        """Calculate the size of a PDU.
-
-        On the wire, length is one less than the requested length. 
-        e.g. 0 will request one byte.  This requires a custom implemenation 
-        for calculateRtuFrameSize() as no standard Modbus functions operate 
-        this way.
-
-        :param buffer: A buffer containing the data that have been received.
-        :returns: The number of bytes in the PDU.
-        :raises NotImplementedException:
-        """
-        return int(buffer[cls._rtu_byte_count_pos])+1 + cls._rtu_byte_count_pos + 3
 
 class WriteConfigRequest(ModbusRequest):
     """(0x64) Write Config Modbus request class
@@ -764,45 +1155,10 @@ class WriteConfigRequest(ModbusRequest):
         #framework adds 3 (unit and CRC)
         return self._rtu_frame_size - 3 + self.length
 
-class WriteConfigResponse(ModbusResponse):
+class WriteConfigResponse(_VariableLengthResponse):
     """(0x64) Write Config Modbus response"""
 
     function_code = 0x64
-    _rtu_byte_count_pos = 5  #Used to index the length parameter in response
-
-    def __init__(self, **kwargs):
-        super().__init__( **kwargs)
-        self.ack = None
-        self.page = None
-        self.address = None
-        self.length = None
-        self.values = None
-
-    def decode(self, data):
-        """Decode Read Sensor response function envelope
-
-        This device message has an extra, mandatory ACK byte (0x10).
-        
-        :param data: The byte stream to decode
-        """
-        self.ack, self.page, self.address, length = struct.unpack("<BBBB", data[:4])
-        self.length = length + 1
-        self.values = data[4:]
-
-    @classmethod
-    def calculateRtuFrameSize(cls, buffer):  # pylint: disable=invalid-name
-        """Calculate the size of a PDU.
-
-        On the wire, length is one less than the requested length. 
-        e.g. 0 will request one byte.  This requires a custom implemenation 
-        for calculateRtuFrameSize() as no standard Modbus functions operate 
-        this way.
-
-        :param buffer: A buffer containing the data that have been received.
-        :returns: The number of bytes in the PDU.
-        :raises NotImplementedException:
-        """
-        return int(buffer[cls._rtu_byte_count_pos])+1 + cls._rtu_byte_count_pos + 3
 
 class StoreConfigRequest(ModbusRequest):
     """(0x65) Go Modbus request class"""
@@ -852,3 +1208,5 @@ class StoreConfigResponse(ModbusResponse):
         self.ack = struct.unpack("<B", data)
         self.values = True
 
+#Side effect free requests that may share one transaction (0x43, 0x45, 0x46, 0x64 reads)
+_SINGLEFLIGHT_REQUESTS = frozenset((StatusRequest, ReadSensorRequest, ReadIDRequest, ReadConfigRequest))
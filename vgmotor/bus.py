@@ -0,0 +1,131 @@
+"""Modbus Package for Regal Beloit EPC VGreen Motor family
+
+VGMotorBus arbitrates a shared RS-485 bus between many callers.
+
+At 9600 baud a single config read can occupy the bus for tens of
+milliseconds, so when several threads share one port the order in which
+transactions go out matters.  The bus owns the Modbus client and queues
+each transaction by priority.  Within a priority level the units are
+served round-robin so one busy unit can not starve the others.  A long
+read_config sweep is only ever one transaction ahead of an emergency
+stop().
+
+The bus can be handed to any VGMotor class in place of the client:
+
+    bus = VGMotorBus(client)
+    motor = VGMotorEVO(bus)
+"""
+from collections import OrderedDict, deque
+import pymodbus.client.base
+import pymodbus.exceptions as exceptions
+import threading
+
+class VGMotorBus:
+    """Priority and round-robin transaction scheduler for one client
+
+    No worker thread is used; the calling thread waits its turn and then
+    executes its own transaction on the client.
+    """
+
+    PRIORITY_STOP = 0
+    PRIORITY_CONTROL = 1
+    PRIORITY_KEEPALIVE = 2
+    PRIORITY_SENSOR = 3
+    PRIORITY_CONFIG = 4
+
+    #function code: default priority
+    FUNCTION_PRIORITY = {
+        0x42 : PRIORITY_STOP,       #stop()
+        0x41 : PRIORITY_CONTROL,    #go()
+        0x44 : PRIORITY_CONTROL,    #set_demand()
+        0x43 : PRIORITY_KEEPALIVE,  #status()
+        0x45 : PRIORITY_SENSOR,     #read_sensor()
+        0x46 : PRIORITY_CONFIG,     #read_id()
+        0x64 : PRIORITY_CONFIG,     #read_config() / write_config()
+        0x65 : PRIORITY_CONFIG,     #store_config()
+    }
+
+    def __init__(self, client, timeouts=None):
+        """Takes ownership of a synchronous Modbus client
+
+        :param client: a ModbusBaseClient object
+        :param timeouts: (optional) ResponseTimeout policy setting the
+                         client timeout per request
+        """
+        if not isinstance(client, pymodbus.client.base.ModbusBaseClient):
+            raise exceptions.ParameterException("client must be a ModbusBaseClient class")
+        if client.use_protocol:
+            raise exceptions.ParameterException("client must be a synchronous client")
+        self.client = client
+        self.timeouts = timeouts
+        self._cond = threading.Condition()
+        self._busy = False
+        #One OrderedDict per priority of unit: deque of waiting tickets
+        self._queues = [OrderedDict() for _ in range(self.PRIORITY_CONFIG+1)]
+
+    def register(self, custom_response_class):
+        """Registers a response class with the client decoder
+
+        :param custom_response_class: ModbusResponse class
+        """
+        self.client.register(custom_response_class)
+
+    def priority(self, request):
+        """Returns the default priority for a request
+
+        :param request: ModbusRequest class to execute
+        :returns: priority (PRIORITY_STOP .. PRIORITY_CONFIG)
+        """
+        return self.FUNCTION_PRIORITY.get(request.function_code, self.PRIORITY_CONFIG)
+
+    def execute(self, request, priority=None):
+        """Waits for the bus and executes the request on the client
+
+        :param request: ModbusRequest class to execute
+        :param priority: (optional) overrides the function code priority
+        :returns: result of client.execute()
+        """
+        if priority is None:
+            priority = self.priority(request)
+        unit = request.slave_id
+        ticket = [request]  #unique object identifying this caller
+        with self._cond:
+            self._queues[priority].setdefault(unit, deque()).append(ticket)
+            while self._busy or self._next() is not ticket:
+                self._cond.wait()
+            self._pop(priority, unit)
+            self._busy = True
+        try:
+            if self.timeouts is not None:
+                return self.timeouts.execute(self.client, request)
+            return self.client.execute(request)
+        finally:
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    def pending(self):
+        """Returns the number of transactions waiting for the bus
+
+        :returns: count of queued transactions
+        """
+        with self._cond:
+            return sum(len(tickets) for queue in self._queues
+                       for tickets in queue.values())
+
+    def _next(self):
+        """Returns the ticket that should use the bus next"""
+        for queue in self._queues:
+            if queue:
+                return next(iter(queue.values()))[0]
+        return None
+
+    def _pop(self, priority, unit):
+        """Removes the head ticket for unit and rotates the unit to the back"""
+        queue = self._queues[priority]
+        tickets = queue[unit]
+        tickets.popleft()
+        if tickets:
+            queue.move_to_end(unit)
+        else:
+            del queue[unit]
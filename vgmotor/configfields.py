@@ -0,0 +1,200 @@
+"""Modbus Package for Regal Beloit EPC VGreen Motor family
+
+ConfigFieldRegistry describes the config fields of one motor type as data.
+
+Each ConfigField names a little endian integer on a config page, with an
+optional array count and stride (e.g. the four EVO digital inputs every
+3 bytes) and a scale.  The registry is compiled once into one
+struct.Struct per page covering every field on it, so a page image is
+decoded into all of its named values with a single unpack_from().
+
+A registry can be written in Python or loaded from JSON, so supporting a
+new motor type needs a data file rather than a new class:
+
+    [
+      {"name": "serial_timeout", "page": 1, "address": 0, "type": "B",
+       "str_fmt": "{}s"},
+      {"name": "digital_input_rpm", "page": 10, "address": 88, "type": "H",
+       "count": 4, "stride": 3, "str_fmt": "{:>4} RPM"}
+    ]
+"""
+from collections import namedtuple
+import json
+import struct
+
+# struct type codes usable for fields
+_TYPES = frozenset("bBhHiI")
+
+ConfigField = namedtuple(
+        "ConfigField",
+        ["name", "page", "address", "type", "count", "stride", "scale", "str_fmt", "err_txt"],
+        defaults=["B", 1, 0, 1, "{}", "~"])
+ConfigField.__doc__ = """One named config field
+
+:param name: field name used as the key of decoded values
+:param page: config page
+:param address: address of the field (of the first element of an array)
+:param type: struct code of one element: b, B, h, H, i or I
+:param count: (optional) number of array elements
+:param stride: (optional) bytes between array elements; default packed
+:param scale: (optional) decoded value = raw value * scale
+:param str_fmt: (optional) format used by ConfigFieldRegistry.format()
+:param err_txt: (optional) text formatted in place of an unknown value
+"""
+
+class ConfigFieldRegistry:
+    """Compiled set of config fields for one motor type"""
+
+    def __init__(self, fields):
+        """Compiles the per-page layouts
+
+        :param fields: iterable of ConfigField
+        :raises ValueError: on an unknown type or overlapping fields
+        """
+        self._fields = {}
+        elements = {}  #page: [(address, size, type, name, index)]
+        for field in fields:
+            if field.type not in _TYPES:
+                raise ValueError(f"config field {field.name}: unknown type {field.type!r}")
+            if field.name in self._fields:
+                raise ValueError(f"config field {field.name} defined twice")
+            self._fields[field.name] = field
+            size = struct.calcsize("<" + field.type)
+            stride = field.stride or size
+            for index in range(field.count):
+                elements.setdefault(field.page, []).append(
+                        (field.address + index * stride, size, field.type, field.name, index))
+
+        self._layouts = {}  #page: (struct.Struct, [(name, index)])
+        for page, page_elements in elements.items():
+            fmt = "<"
+            end = 0
+            order = []
+            for address, size, code, name, index in sorted(page_elements):
+                if address < end:
+                    raise ValueError(f"config field {name} overlaps another field "
+                                     f"on page 0x{page:02x}")
+                if address > end:
+                    fmt += f"{address - end}x"
+                fmt += code
+                end = address + size
+                order.append((name, index))
+            self._layouts[page] = (struct.Struct(fmt), order)
+
+    def __getitem__(self, name):
+        return self._fields[name]
+
+    def __contains__(self, name):
+        return name in self._fields
+
+    def __iter__(self):
+        return iter(self._fields.values())
+
+    def pages(self):
+        """Returns the config pages holding fields, in ascending order"""
+        return sorted(self._layouts)
+
+    def extent(self, page):
+        """Returns the bytes of page needed to decode all of its fields
+
+        :param page: config page
+        """
+        return self._layouts[page][0].size
+
+    def decode(self, page, data):
+        """Decodes every field on a page with one unpack
+
+        :param page: config page
+        :param data: page bytes from address 0; at least extent(page)
+        :returns: dict of name: value (list of values for arrays)
+        """
+        layout, order = self._layouts[page]
+        values = {}
+        for (name, index), raw in zip(order, layout.unpack_from(data)):
+            field = self._fields[name]
+            value = raw * field.scale if field.scale != 1 else raw
+            if field.count == 1:
+                values[name] = value
+            else:
+                values.setdefault(name, [None] * field.count)[index] = value
+        return values
+
+    def decode_image(self, image):
+        """Decodes the fields of every page present in an image
+
+        :param image: ConfigImage (or dict of page: bytes)
+        :returns: dict of name: value for the fields found
+        """
+        values = {}
+        for page in self.pages():
+            if page in image and len(image[page]) >= self.extent(page):
+                values.update(self.decode(page, image[page]))
+        return values
+
+    def encode(self, name, value, index=0):
+        """Returns the write for one field element
+
+        :param name: field name
+        :param value: decoded (scaled) value
+        :param index: (optional) array element
+        :returns: (page, address, bytes) tuple
+        """
+        field = self._fields[name]
+        page, address, _ = self.location(name, index)
+        raw = value if field.scale == 1 else round(value / field.scale)
+        return page, address, struct.pack("<" + field.type, raw)
+
+    def location(self, name, index=0):
+        """Returns where one field element is stored
+
+        :param name: field name
+        :param index: (optional) array element
+        :returns: (page, address, length) tuple
+        """
+        field = self._fields[name]
+        if not 0 <= index < field.count:
+            raise IndexError(f"config field {name} has {field.count} elements")
+        size = struct.calcsize("<" + field.type)
+        return field.page, field.address + index * (field.stride or size), size
+
+    def unpack(self, name, data):
+        """Returns the decoded value of one field element
+
+        :param name: field name
+        :param data: the element's bytes, as located by location()
+        """
+        field = self._fields[name]
+        raw = struct.unpack("<" + field.type, data)[0]
+        return raw * field.scale if field.scale != 1 else raw
+
+    def format(self, name, value):
+        """Returns the display string of a decoded value
+
+        :param name: field name
+        :param value: decoded value (or list for arrays); None if unknown
+        """
+        field = self._fields[name]
+        if isinstance(value, list):
+            return [self.format(name, element) for element in value]
+        if value is None:
+            return field.err_txt
+        return field.str_fmt.format(value)
+
+    @classmethod
+    def from_json(cls, text):
+        """Creates a registry from a JSON list of field objects
+
+        :param text: JSON text
+        :returns: ConfigFieldRegistry
+        """
+        return cls(ConfigField(**field) for field in json.loads(text))
+
+    @classmethod
+    def load(cls, path):
+        """Creates a registry from a JSON file
+
+        :param path: file name
+        :returns: ConfigFieldRegistry
+        """
+        with open(path) as file:
+            return cls.from_json(file.read())
@@ -0,0 +1,168 @@
+"""Modbus Package for Regal Beloit EPC VGreen Motor family
+
+ConfigImage holds a copy of the config pages of one motor.
+
+VGMotorBase.dump_config() returns a ConfigImage.  Each page keeps its own
+extent (the address of the first byte the motor refused to read), so an
+image can be compared against, or written back to, a motor of the same
+type.  Images are saved either as a compact binary file or in the text
+layout of the evo_config_dump file; load() reads both, so the hand made
+dump in this repository loads as an image too.
+
+    image = motor.dump_config(0x15)
+    image.save("motor_15.cfg")
+    image = ConfigImage.load("evo_config_dump")
+"""
+import re
+import struct
+
+class ConfigImage:
+    """Config page bytes of one motor keyed by page number"""
+
+    MAGIC = b"VGCF"
+    _VERSION = 1
+    # page:1 + length:2
+    _PAGE_HEADER = struct.Struct("<BH")
+    _TEXT_PAGE = re.compile(r"^Dump of entire config / page 0x([0-9a-fA-F]{2})")
+    _TEXT_LINE = re.compile(r"^([0-9a-fA-F]{2}): ([0-9a-fA-F]+)\s*$")
+
+    def __init__(self, pages=None):
+        """Creates an image
+
+        :param pages: (optional) dict of page: bytes
+        """
+        self._pages = {}
+        for page, data in (pages or {}).items():
+            self[page] = data
+
+    def __getitem__(self, page):
+        return self._pages[page]
+
+    def __setitem__(self, page, data):
+        self._pages[page] = bytes(data)
+
+    def __contains__(self, page):
+        return page in self._pages
+
+    def __iter__(self):
+        return iter(sorted(self._pages))
+
+    def __len__(self):
+        return len(self._pages)
+
+    def __eq__(self, other):
+        if not isinstance(other, ConfigImage):
+            return NotImplemented
+        return self._pages == other._pages
+
+    def pages(self):
+        """Returns the page numbers in the image in ascending order"""
+        return list(self)
+
+    def extent(self, page):
+        """Returns the number of readable bytes of a page
+
+        :param page: config page
+        :returns: page size in bytes; 0 if the page is not in the image
+        """
+        return len(self._pages.get(page, b""))
+
+    def to_bytes(self):
+        """Returns the binary form of the image
+
+        MAGIC, version byte, then page:1 length:2 data per page.
+        """
+        out = bytearray(self.MAGIC)
+        out.append(self._VERSION)
+        for page in self:
+            data = self._pages[page]
+            out += self._PAGE_HEADER.pack(page, len(data))
+            out += data
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Creates an image from its binary form
+
+        :param data: bytes produced by to_bytes()
+        :returns: ConfigImage
+        :raises ValueError: if data is not a ConfigImage
+        """
+        if data[:len(cls.MAGIC)] != cls.MAGIC or data[len(cls.MAGIC)] != cls._VERSION:
+            raise ValueError("not a VGMotor config image")
+        image = cls()
+        offset = len(cls.MAGIC) + 1
+        while offset < len(data):
+            page, length = cls._PAGE_HEADER.unpack_from(data, offset)
+            offset += cls._PAGE_HEADER.size
+            if offset + length > len(data):
+                raise ValueError(f"config image page 0x{page:02x} is truncated")
+            image[page] = data[offset:offset+length]
+            offset += length
+        return image
+
+    def to_text(self):
+        """Returns the image in the evo_config_dump text layout"""
+        lines = []
+        for page in self:
+            data = self._pages[page]
+            lines.append(f"Dump of entire config / page 0x{page:02x}")
+            for address in range(0, len(data), 8):
+                lines.append(f"{address:02x}: {data[address:address+8].hex()}")
+            lines.append("")
+        return "\n".join(lines)
+
+    @classmethod
+    def from_text(cls, text):
+        """Creates an image from the evo_config_dump text layout
+
+        Only the "Dump of entire config" sections are read; notes and
+        parsed guesses between them are ignored.
+
+        :param text: dump text
+        :returns: ConfigImage
+        """
+        image = cls()
+        page = None
+        data = None
+        for line in text.splitlines():
+            match = cls._TEXT_PAGE.match(line)
+            if match:
+                page = int(match.group(1), 16)
+                data = bytearray()
+                image[page] = data
+                continue
+            match = cls._TEXT_LINE.match(line) if page is not None else None
+            if match and int(match.group(1), 16) == len(data):
+                data += bytes.fromhex(match.group(2))
+                image[page] = data
+            elif page is not None and line.strip():
+                #First line that is not dump data ends the section
+                page = None
+        return image
+
+    def save(self, path, text=False):
+        """Writes the image to a file
+
+        :param path: file name
+        :param text: (optional) True to write the evo_config_dump layout
+        """
+        if text:
+            with open(path, "w") as file:
+                file.write(self.to_text())
+        else:
+            with open(path, "wb") as file:
+                file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """Reads an image saved in either format
+
+        :param path: file name
+        :returns: ConfigImage
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        if data.startswith(cls.MAGIC):
+            return cls.from_bytes(data)
+        return cls.from_text(data.decode())
@@ -0,0 +1,137 @@
+"""Modbus Package for Regal Beloit EPC VGreen Motor family
+
+ConfigTransaction batches config writes to one motor.
+
+Each write_config() is a frame of its own, and every change needs a
+store_config() before it survives a power cycle.  A ConfigTransaction
+records writes instead of sending them.  On commit the bytes written to
+each page are merged into contiguous runs (later writes to the same
+address win), each run is sent in writes of config_write_length() bytes
+and one store_config() finishes the transaction.
+
+    with motor.config_transaction(0x15) as tx:
+        tx.write(0x0a, 0x58, b'\x7a\x0d')
+        tx.write(0x0a, 0x5b, b'\x5f\x05')
+
+Leaving the with block commits the transaction, unless an exception was
+raised, in which case nothing is sent.
+"""
+
+# Unit:1 + Function:1 + ACK:1 + page:1 + address:1 + length:1 + CRC:2 each way
+WRITE_OVERHEAD = 2 * (1+1+1+1+1+1+2)
+
+def changed_runs(old, new, gap=1):
+    """Returns the (start, end) ranges where new differs from old
+
+    Runs separated by fewer than gap equal bytes are merged, since sending
+    those bytes again can cost less than another frame.
+
+    :param old: current bytes
+    :param new: desired bytes of the same length
+    :param gap: (optional) unchanged bytes worth bridging
+    :returns: list of (start, end) tuples
+    """
+    runs = []
+    for index, (a, b) in enumerate(zip(old, new)):
+        if a == b:
+            continue
+        if runs and index - runs[-1][1] < gap:
+            runs[-1][1] = index + 1
+        else:
+            runs.append([index, index + 1])
+    return [tuple(run) for run in runs]
+
+class ConfigTransaction:
+    """Pending config writes for one unit
+
+    success is None until commit(), then True if every write was echoed
+    unchanged and the store succeeded.  After a failed commit, written
+    lists the (page, address, bytes) that did reach the motor (without a
+    store_config()) and failed the (page, address) of the failing write.
+    """
+
+    def __init__(self, motor, unit):
+        """Creates an empty transaction
+
+        :param motor: VGMotorBase (or subclass) object used for the writes
+        :param unit:  Target Modbus slave address
+        """
+        self.motor = motor
+        self.unit = unit
+        self.success = None
+        self.written = []
+        self.failed = None
+        self._pages = {}  #page: {address: byte}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+        return False
+
+    def write(self, page, address, data):
+        """Records bytes to write
+
+        :param page:  Config page to write
+        :param address:  Config address to write
+        :param data: bytes to write
+        """
+        if self.success is not None:
+            raise RuntimeError("config transaction already finished")
+        dirty = self._pages.setdefault(page, {})
+        for offset, value in enumerate(data):
+            dirty[address + offset] = value
+
+    def runs(self):
+        """Returns the coalesced writes recorded so far
+
+        :returns: list of (page, address, bytes) tuples
+        """
+        runs = []
+        for page in sorted(self._pages):
+            dirty = self._pages[page]
+            start = None
+            for address in sorted(dirty):
+                if start is None or address != end:
+                    if start is not None:
+                        runs.append((page, start, bytes(data)))
+                    start, data = address, bytearray()
+                data.append(dirty[address])
+                end = address + 1
+            if start is not None:
+                runs.append((page, start, bytes(data)))
+        return runs
+
+    def commit(self):
+        """Sends the recorded writes followed by one store_config()
+
+        Nothing is sent, and no store is made, when no writes were
+        recorded.  The store is skipped if any write fails.
+
+        :returns: True if every write and the store succeeded
+        """
+        if self.success is not None:
+            return self.success
+        runs = self.runs()
+        self._pages = {}
+        self.success = True
+        for page, address, data in runs:
+            count = self.motor._write_config_span(self.unit, page, address, data)
+            if count:
+                self.written.append((page, address, data[:count]))
+            if count != len(data):
+                self.failed = (page, address + count)
+                self.success = False
+                return self.success
+        if runs and not self.motor.store_config(self.unit):
+            self.success = False
+        return self.success
+
+    def discard(self):
+        """Drops the recorded writes without sending anything"""
+        self._pages = {}
+        self.success = False
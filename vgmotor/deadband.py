@@ -0,0 +1,152 @@
+"""Modbus Package for Regal Beloit EPC VGreen Motor family
+
+DeadbandFilter forwards polled values to its sinks only when they change.
+
+Each sensor can have a deadband in its scaled units (e.g. 25 RPM for
+SPEED); a reading is published when it differs from the last published
+reading by more than the deadband, so slow drift is still reported once
+it adds up.  Sensors without a deadband (e.g. DIGITAL_INPUT_ACTIVE) are
+published on any change.  Motor status is published when MotorStatus.MODE
+changes (STOP, RUN BOOT, RUN, FAULT).  A read that fails after a good
+one, and the first good read after failures, are changes too.
+
+    changes = DeadbandFilter({VGMotorGeneric.SPEED: 25})
+    changes.subscribe(lambda event: print(event))
+    poller.run(changes.record)
+    changes.record_status(0x15, motor.status(0x15))
+"""
+from collections import namedtuple
+import logging
+import threading
+import time
+
+from . generic import VGMotorGeneric
+
+log = logging.getLogger()
+
+# ChangeEvent.sensor of motor status changes
+STATUS = "status"
+
+ChangeEvent = namedtuple("ChangeEvent", ["timestamp", "unit", "sensor", "value", "previous"])
+ChangeEvent.__doc__ = """One published change
+
+:param timestamp: time of the reading
+:param unit: Modbus slave address
+:param sensor: VGMotorGeneric tuple, or STATUS for status()
+:param value: new value; NaN (sensor) or None (status) if the read failed
+:param previous: last published value; None for the first event
+"""
+
+class DeadbandFilter:
+    """Report-by-exception stage for polled sensor and status values
+
+    Readings are compared with the last value published for the same
+    (unit, sensor), not with the last reading.  With max_interval set an
+    unchanged value is published again after max_interval seconds, so
+    sinks can tell a steady motor from a lost one.
+    """
+
+    def __init__(self, deadbands=None, max_interval=None, raw=False, clock=time.time):
+        """Creates a filter with no sinks
+
+        :param deadbands: (optional) dict of VGMotorGeneric tuple: deadband
+        :param max_interval: (optional) seconds after which a value is republished
+        :param raw: (optional) record() takes read_sensor_raw() values
+        :param clock: (optional) function returning the event timestamp
+        """
+        self.deadbands = dict(deadbands or {})
+        self.max_interval = max_interval
+        self.raw = raw
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._sinks = []
+        self._published = {}  #(unit, sensor): (value, timestamp)
+
+    def subscribe(self, sink):
+        """Adds a sink called as sink(ChangeEvent) for every change
+
+        :param sink: callable taking one ChangeEvent
+        """
+        self._sinks.append(sink)
+
+    def unsubscribe(self, sink):
+        """Removes a sink added with subscribe()"""
+        self._sinks.remove(sink)
+
+    def record(self, unit, sensor, value, timestamp=None):
+        """Publishes a sensor reading if it left the deadband
+
+        Matches the SensorPoller callback; pass raw=True to the filter
+        when the poller is created with raw=True.
+
+        :param unit:  Target Modbus slave address
+        :param sensor: VGMotorGeneric tuple for the sensor
+        :param value: read_sensor() value, or raw reading if raw; None or NaN on error
+        :param timestamp: (optional) time of the reading; default clock()
+        :returns: ChangeEvent if published, otherwise None
+        """
+        if value is None:
+            value = float("NaN")
+        elif self.raw:
+            scale = sensor[VGMotorGeneric._SCALE]
+            value = value / scale if scale is not None else value
+        deadband = self.deadbands.get(sensor, 0)
+
+        def changed(previous):
+            if (value != value) or (previous != previous):  #NaN on error
+                return (value != value) != (previous != previous)
+            return abs(value - previous) > deadband if deadband else value != previous
+
+        return self._publish(unit, sensor, value, timestamp, changed)
+
+    def record_status(self, unit, status, timestamp=None):
+        """Publishes a status() result if the motor mode changed
+
+        :param unit:  Target Modbus slave address
+        :param status: MotorStatus as returned by status(); None on error
+        :param timestamp: (optional) time of the reading; default clock()
+        :returns: ChangeEvent if published, otherwise None
+        """
+        if status is not None and status.error_txt is not None:
+            status = None
+
+        def changed(previous):
+            if status is None or previous is None:
+                return (status is None) != (previous is None)
+            return int(status) != int(previous)
+
+        return self._publish(unit, STATUS, status, timestamp, changed)
+
+    def forget(self, unit=None):
+        """Discards the published values, so the next readings publish
+
+        :param unit: (optional) Target Modbus slave address; default all
+        """
+        with self._lock:
+            for key in list(self._published):
+                if unit is None or key[0] == unit:
+                    del self._published[key]
+
+    def _publish(self, unit, sensor, value, timestamp, changed):
+        """Sends value to the sinks if changed(previous) or it is due"""
+        with self._lock:
+            if timestamp is None:
+                timestamp = self.clock()
+            key = (unit, sensor)
+            last = self._published.get(key)
+            if last is not None:
+                previous, published = last
+                due = (self.max_interval is not None
+                       and timestamp - published >= self.max_interval)
+                if not due and not changed(previous):
+                    return None
+            else:
+                previous = None
+            self._published[key] = (value, timestamp)
+            event = ChangeEvent(timestamp, unit, sensor, value, previous)
+        for sink in list(self._sinks):
+            try:
+                sink(event)
+            except Exception as exc:
+                log.error(f"Change sink {sink!r} failed: {exc}")
+        return event
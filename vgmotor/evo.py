@@ -5,11 +5,43 @@ VGMotorEVO provides access to the EVO specific configuration storage
 WARNING:  Config addresses are all unique to VGreen EVO motor.  
           Similar config exists for other motors but at different 
           flash address locations.
-"""
 
+The config items on pages 0x01, 0x0a, 0x0b and 0x0c are served from a
+per-unit mirror of each whole page.  The mirror is filled in config_chunk
+sized reads as items are accessed, so neighbouring items (the digital
+input table, the schedule slots...) share one transaction.  Writes made
+through this object update the mirror with the bytes the motor echoes.
+Changes made by anything else (the motor keypad, another controller) are
+only seen after config_ttl expires, refresh_config() or
+invalidate_config().  The mirror has its own lock, held only while stale
+chunks are chosen and read bytes are copied in, never across bus I/O, so
+threads sharing the object (thread_safe=True or a VGMotorBus) do not wait
+on each other's reads.  A read that raced a write never replaces the
+echoed bytes.
+
+FIELDS names the known config items as a ConfigFieldRegistry.  The
+accessors (serial_timeout(), digital_in_rpm()...) locate their item in it
+and config_values() decodes all of them from the mirror at once.  The
+SERIAL_TIMEOUT style tuples are derived from it for older callers.
+"""
+import logging
+import struct
+import threading
+import time
+import pymodbus.exceptions as exceptions
+
+from . configfields import ConfigField, ConfigFieldRegistry
+from . configtransaction import ConfigTransaction, changed_runs, WRITE_OVERHEAD
 from . generic import VGMotorGeneric
 from . evoschedule import EVOSchedule
 
+log = logging.getLogger()
+
+def _field_tuple(field):
+    """Returns the (page, addr, len, str_fmt, err_txt) tuple of a field"""
+    return (field.page, field.address, struct.calcsize("<" + field.type),
+            field.str_fmt, field.err_txt)
+
 class VGMotorEVO(VGMotorGeneric):
     """Provides access to the EVO specific configuration storage
 
@@ -18,22 +50,236 @@ class VGMotorEVO(VGMotorGeneric):
     
     """
 
+    #Named config fields decoded together by config_values()
+    FIELDS = ConfigFieldRegistry([
+        ConfigField("serial_timeout",       0x01, 0x00, "B", str_fmt="{}s",        err_txt="~~"),
+        ConfigField("motor_address",        0x01, 0x01, "B", str_fmt="0x{:02x}",   err_txt="~~~~"),
+        ConfigField("digital_input_enable", 0x0a, 0x57, "B", count=4, stride=3),
+        ConfigField("digital_input_rpm",    0x0a, 0x58, "H", count=4, stride=3,
+                    str_fmt="{:>4} RPM", err_txt="~~~~ RPM"),
+        ConfigField("selected_schedule_a",  0x0b, 0x00, "B"),
+        ConfigField("selected_schedule_b",  0x0c, 0x00, "B"),
+        #Schedule tables: 8 slots of (hours, rpm) steps, see EVOSchedule
+        ConfigField("schedule_a_hours",     0x0b, 0x08, "B", count=34, stride=3, str_fmt="{}h"),
+        ConfigField("schedule_a_rpm",       0x0b, 0x09, "H", count=34, stride=3,
+                    str_fmt="{:>4} RPM", err_txt="~~~~ RPM"),
+        ConfigField("schedule_b_hours",     0x0c, 0x08, "B", count=38, stride=3, str_fmt="{}h"),
+        ConfigField("schedule_b_rpm",       0x0c, 0x09, "H", count=38, stride=3,
+                    str_fmt="{:>4} RPM", err_txt="~~~~ RPM"),
+    ])
+
     _PAGE = 0
     _ADDRESS = 1
     _LEN = 2
     _FORMAT = 3
     _ERROR = 4
 
-    #                      (page, addr, len, str_fmt,     err_txt)
-    SERIAL_TIMEOUT =       (0x01, 0x00,   1, '{}s',       '~~')
-    MOTOR_ADDRESS =        (0x01, 0x01,   1, '0x{:02x}',  '~~~~')
-    DIGITAL_INPUT_ENABLE = (0x0a, 0x57,   1, '{}',        '~')
-    DIGITAL_INPUT_RPM =    (0x0a, 0x58,   2, '{:>4} RPM', '~~~~ RPM')
-    SELECTED_SCHEDULE_A =  (0x0b, 0x00,   1, '{}',        '~')
-    SELECTED_SCHEDULE_B =  (0x0c, 0x00,   1, '{}',        '~')
-    START_SCHEDULE_A =     (0x0b, 0x08,   1, None,        None)
-    START_SCHEDULE_B =     (0x0c, 0x08,   1, None,        None)
+    #(page, addr, len, str_fmt, err_txt) tuples of the fields above
+    SERIAL_TIMEOUT = _field_tuple(FIELDS["serial_timeout"])
+    MOTOR_ADDRESS = _field_tuple(FIELDS["motor_address"])
+    DIGITAL_INPUT_ENABLE = _field_tuple(FIELDS["digital_input_enable"])
+    DIGITAL_INPUT_RPM = _field_tuple(FIELDS["digital_input_rpm"])
+    SELECTED_SCHEDULE_A = _field_tuple(FIELDS["selected_schedule_a"])
+    SELECTED_SCHEDULE_B = _field_tuple(FIELDS["selected_schedule_b"])
+    START_SCHEDULE_A = _field_tuple(FIELDS["schedule_a_hours"])[:3] + (None, None)
+    START_SCHEDULE_B = _field_tuple(FIELDS["schedule_b_hours"])[:3] + (None, None)
+
+    #Mirrored config pages - page: size in bytes
+    CONFIG_PAGES = {
+        0x01 : 41,
+        0x0a : 100,
+        0x0b : 110,
+        0x0c : 122,
+    }
+
+    def __init__(self, client, config_ttl=None, config_chunk=16, **kwargs):
+        """Creates an EVO motor object with an empty config mirror
+
+        :param client: a ModbusBaseClient object or a VGMotorBus sharing one
+        :param config_ttl: (optional) seconds a mirrored page is trusted;
+                           None keeps it until refreshed or invalidated
+        :param config_chunk: (optional) bytes per read_config when filling
+                             the mirror
+        :param kwargs: remaining VGMotorBase arguments (timeouts, health)
+        """
+        super().__init__(client, **kwargs)
+        self.config_ttl = config_ttl
+        self.config_chunk = config_chunk
+        self._config_mirror = {}  #(unit, page): _MirrorPage
+        self._config_mirror_lock = threading.Lock()
+
+    class _MirrorPage:
+        """Mirrored bytes of one config page"""
+        def __init__(self, size):
+            self.data = bytearray(size)
+            self.fetched = {}   #chunk: time.monotonic() of the read
+            #chunk: writes seen, so a read started before a write does not
+            #replace its echo
+            self.versions = {}
+
+    def refresh_config(self, unit, page=None):
+        """Re-reads mirrored config pages from the motor
+
+        :param unit:  Target Modbus slave address
+        :param page: (optional) page to refresh; default all mirrored pages
+        :returns: True if every page was read
+        """
+        pages = VGMotorEVO.CONFIG_PAGES if page is None else (page,)
+        success = True
+        for page in pages:
+            self.invalidate_config(unit, page)
+            size = VGMotorEVO.CONFIG_PAGES[page]
+            if self._read_config_bytes(unit, page, 0, size) is None:
+                success = False
+        return success
+
+    def invalidate_config(self, unit=None, page=None):
+        """Discards mirrored config so the next access reads the motor
+
+        :param unit: (optional) Target Modbus slave address; default all
+        :param page: (optional) config page; default all
+        """
+        with self._config_mirror_lock:
+            for key in list(self._config_mirror):
+                if (unit is None or key[0] == unit) and (page is None or key[1] == page):
+                    del self._config_mirror[key]
+
+    def config_values(self, unit, fields=None):
+        """Reads every named config field
+
+        Each page is decoded with one unpack of its mirror, so all fields
+        cost only the reads needed to fill the mirror.
+
+        :param unit:  Target Modbus slave address
+        :param fields: (optional) ConfigFieldRegistry; default FIELDS
+        :returns: dict of name: value (list for arrays); None for fields
+                  on a page that could not be read
+        """
+        fields = self.FIELDS if fields is None else fields
+        values = {}
+        for page in fields.pages():
+            extent = fields.extent(page)
+            data = self._read_config_bytes(unit, page, 0, extent)
+            if data is None:
+                values.update((field.name, None) for field in fields if field.page == page)
+            else:
+                values.update(fields.decode(page, data))
+        return values
+
+    def apply_config(self, unit, desired_image):
+        """Writes the bytes of desired_image that differ from the motor
+
+        The mirror of each page in desired_image is re-read first so the
+        comparison is made against the motor, not a stale mirror.  See
+        VGMotorBase.apply_config().
 
+        :param unit:  Target Modbus slave address
+        :param desired_image: ConfigImage (or dict of page: bytes)
+        :returns: list of (page, address, bytes) written; None on error
+        """
+        for page in desired_image:
+            self.invalidate_config(unit, page)
+        return super().apply_config(unit, desired_image)
+
+    def write_config(self, unit, page, address, length, data):
+        """Performs Modbus Write Configuration Function (0x64)
+
+        Errors are logged. Returns bytes as read.  The config mirror is
+        updated with the bytes echoed by the motor, or the written chunks
+        are invalidated on error.
+
+        :param unit:  Target Modbus slave address
+        :param page:  Config page to read
+        :param address:  Config address to read
+        :param length:  Number of bytes to read
+        :param data: bytearray of data to write
+        :returns: bytearray of read bytes; None on error
+        """
+        val_bytes = super().write_config(unit, page, address, length, data)
+        with self._config_mirror_lock:
+            mirror = self._config_mirror.get((unit, page))
+            if mirror is not None:
+                for chunk in self._config_chunks(address, length):
+                    mirror.versions[chunk] = mirror.versions.get(chunk, 0) + 1
+                    if val_bytes is None or len(val_bytes) != length:
+                        mirror.fetched.pop(chunk, None)
+                if val_bytes is not None and len(val_bytes) == length:
+                    mirror.data[address:address+length] = val_bytes
+        return val_bytes
+
+    def _config_chunks(self, address, length):
+        """Returns the mirror chunk numbers covering an address range"""
+        return range(address // self.config_chunk,
+                     (address + length - 1) // self.config_chunk + 1)
+
+    def _read_config_bytes(self, unit, page, address, length, max_read=None):
+        """Reads config bytes from the mirror or, if unmirrored, the motor
+
+        Chunks of the page that are missing or older than config_ttl are
+        read first.  Once config_max_length() is known, neighbouring stale
+        chunks share a read_config of up to max_read bytes; until then each
+        chunk is read on its own.  If a chunk cannot be read, only the
+        requested bytes are read, bypassing the mirror.
+
+        :param unit:  Target Modbus slave address
+        :param page:  Config page to read
+        :param address:  Config address to read
+        :param length:  Number of bytes to read
+        :param max_read: (optional) longest read to try; default and
+                         limit config_max_length()
+        :returns: bytes read; None on error
+        """
+        size = VGMotorEVO.CONFIG_PAGES.get(page)
+        if size is None or address + length > size:
+            return super()._read_config_bytes(unit, page, address, length, max_read)
+
+        with self._config_mirror_lock:
+            mirror = self._config_mirror.get((unit, page))
+            if mirror is None:
+                mirror = VGMotorEVO._MirrorPage(size)
+                self._config_mirror[(unit, page)] = mirror
+            now = time.monotonic()
+            fetched = mirror.fetched
+            stale = [chunk for chunk in self._config_chunks(address, length)
+                     if chunk not in fetched or (self.config_ttl is not None
+                                                 and now - fetched[chunk] >= self.config_ttl)]
+            versions = {chunk: mirror.versions.get(chunk, 0) for chunk in stale}
+            data = bytearray(mirror.data)
+        limit = self.config_max_length(unit)
+        if limit is None:
+            max_read = self.config_chunk
+        else:
+            max_read = limit if max_read is None else min(max_read, limit)
+
+        #The bus is read without the mirror lock
+        index = 0
+        while index < len(stale):
+            #Extend the run over consecutive stale chunks
+            start = stale[index] * self.config_chunk
+            count = 1
+            while (index + count < len(stale)
+                   and stale[index + count] == stale[index] + count
+                   and min((count + 1) * self.config_chunk, size - start) <= max_read):
+                count += 1
+            read_len = min(count * self.config_chunk, size - start)
+            val_bytes = self._read_config_run(unit, page, start, read_len)
+            if val_bytes is None:
+                if (start, read_len) == (address, length):
+                    return None
+                #A motor refusing whole chunks may still serve the item
+                val_bytes = self._read_config_run(unit, page, address, length)
+                return None if val_bytes is None else bytes(val_bytes)
+            data[start:start+read_len] = val_bytes
+            with self._config_mirror_lock:
+                for chunk in stale[index:index+count]:
+                    if mirror.versions.get(chunk, 0) != versions[chunk]:
+                        continue  #written meanwhile; keep the echo
+                    first = chunk * self.config_chunk
+                    last = min(first + self.config_chunk, size)
+                    mirror.data[first:last] = data[first:last]
+                    mirror.fetched[chunk] = now
+            index += count
+        return bytes(data[address:address+length])
 
     def serial_timeout(self, unit, **kwargs):
         """Read or Write serial control timeout
@@ -54,7 +300,7 @@ class VGMotorEVO(VGMotorGeneric):
             ret_val = kwargs['timeout']
             #TODO: write the timeout to flash
         else:
-            ret_val = self._read_config_tuple(unit, VGMotorEVO.SERIAL_TIMEOUT)
+            ret_val = self._read_field(unit, "serial_timeout")
         return ret_val
 
     def motor_address(self, unit, **kwargs):
@@ -72,7 +318,7 @@ class VGMotorEVO(VGMotorGeneric):
             ret_val = kwargs['address']
             #TODO: write the address to flash
         else:
-            ret_val = self._read_config_tuple(unit, VGMotorEVO.MOTOR_ADDRESS)
+            ret_val = self._read_field(unit, "motor_address")
         return ret_val
 
     def digital_in_enable(self, unit, input, **kwargs):
@@ -91,10 +337,7 @@ class VGMotorEVO(VGMotorGeneric):
             ret_val = kwargs['enable']
             #TODO: write the enable to flash
         else:
-            ret_val = self._read_config_tuple(
-                    unit, VGMotorEVO.DIGITAL_INPUT_ENABLE,
-                    address_offset=((input-1)*3)
-                    )
+            ret_val = self._read_field(unit, "digital_input_enable", input-1)
         return ret_val
 
     def digital_in_rpm(self, unit, input, **kwargs):
@@ -111,15 +354,9 @@ class VGMotorEVO(VGMotorGeneric):
         """
         if kwargs.get('rpm'):
             data = kwargs['rpm']
-            ret_val = self._write_config_tuple(
-                    unit, VGMotorEVO.DIGITAL_INPUT_RPM, data,
-                    address_offset = ((input-1)*3)
-                    )
+            ret_val = self._write_field(unit, "digital_input_rpm", data, input-1)
         else:
-            ret_val = self._read_config_tuple(
-                    unit, VGMotorEVO.DIGITAL_INPUT_RPM,
-                    address_offset=((input-1)*3)
-                    )
+            ret_val = self._read_field(unit, "digital_input_rpm", input-1)
         return ret_val
 
     def selected_schedule(self, unit, set, **kwargs):
@@ -134,67 +371,68 @@ class VGMotorEVO(VGMotorGeneric):
         :param slot: (named/optional) new schedule slot value (1-8)
         :returns: scheule value as int
         """
-        if set == 'A':
-            config_tuple = VGMotorEVO.SELECTED_SCHEDULE_A
-        else:
-            config_tuple = VGMotorEVO.SELECTED_SCHEDULE_B
-
         if kwargs.get('slot'):
             ret_val = kwargs['slot']
             #TODO: write the schedule slot to flash
         else:
-            ret_val = self._read_config_tuple(unit, config_tuple)
+            ret_val = self._read_field(unit, VGMotorEVO._schedule_field("selected_schedule", set))
         return ret_val
 
-    def _write_config_tuple(self, unit, config_tuple, value, address_offset=0):
-        """Writes a config item returning a formatted string representation
+    def _write_field(self, unit, name, value, index=0):
+        """Writes a named config field element
 
         :param unit:  Target Modbus slave address
-        :param config_tuple:  Tuple defining the item to read and format
-        :param value: integer value to write
-        :param address_offset: (optional) Value to add to address to index items
-        :returns: _ConfigInt object (int or formatted string)
+        :param name: field name in FIELDS
+        :param value: decoded (scaled) value to write
+        :param index: (optional) array element
+        :returns: _ConfigInt object (int or formatted string) as echoed
         """
-        length = config_tuple[VGMotorEVO._LEN]
-        data = value.to_bytes(length=length, byteorder="little", signed=False)
+        page, address, data = self.FIELDS.encode(name, value, index)
         val_bytes = self.write_config(
                 unit = unit,
-                page = config_tuple[VGMotorEVO._PAGE],
-                address = config_tuple[VGMotorEVO._ADDRESS] + address_offset,
-                length = length,
+                page = page,
+                address = address,
+                length = len(data),
                 data = data
                 )
-        if val_bytes is not None:
-            ret_val = int.from_bytes(val_bytes, "little")
-        else:
-            ret_val = None
-
-        str_fmt = config_tuple[VGMotorEVO._FORMAT]
-        err_txt = config_tuple[VGMotorEVO._ERROR]
-        return self._ConfigInt(ret_val, str_fmt, err_txt)
+        return VGMotorEVO._field_value(self.FIELDS, name, val_bytes)
 
-    def _read_config_tuple(self, unit, config_tuple, address_offset=0):
-        """Reads a config item returning a formatted string representation
+    def _read_field(self, unit, name, index=0):
+        """Reads a named config field element
 
         :param unit:  Target Modbus slave address
-        :param config_tuple:  Tuple defining the item to read and format
-        :param address_offset: (optional) Value to add to address to index items
+        :param name: field name in FIELDS
+        :param index: (optional) array element
         :returns: _ConfigInt object (int or formatted string)
         """
-        val_bytes = self.read_config(
-                unit = unit,
-                page = config_tuple[VGMotorEVO._PAGE],
-                address = config_tuple[VGMotorEVO._ADDRESS] + address_offset,
-                length = config_tuple[VGMotorEVO._LEN]
-                )
-        if val_bytes is not None:
-            ret_val = int.from_bytes(val_bytes, "little")
-        else:
-            ret_val = None
+        page, address, length = self.FIELDS.location(name, index)
+        val_bytes = self._read_config_bytes(unit, page, address, length)
+        return VGMotorEVO._field_value(self.FIELDS, name, val_bytes)
+
+    @staticmethod
+    def _field_value(fields, name, val_bytes):
+        """Converts field bytes read from the motor into a _ConfigInt
+
+        :param fields: ConfigFieldRegistry holding the field
+        :param name: field name in fields
+        :param val_bytes: little endian bytes as read; None on error.  A
+                          short or long reply is treated as an error.
+        :returns: _ConfigInt object (int or formatted string)
+        """
+        field = fields[name]
+        value = None
+        if val_bytes is not None and len(val_bytes) == fields.location(name)[2]:
+            value = fields.unpack(name, val_bytes)
+        return VGMotorEVO._ConfigInt(value, field.str_fmt, field.err_txt)
 
-        str_fmt = config_tuple[VGMotorEVO._FORMAT]
-        err_txt = config_tuple[VGMotorEVO._ERROR]
-        return self._ConfigInt(ret_val, str_fmt, err_txt)
+    @staticmethod
+    def _schedule_field(prefix, set):
+        """Returns the FIELDS name of a per-set item, e.g. selected_schedule_a
+
+        :param prefix: field name without the set suffix
+        :param set:  Schedule set 'A' or 'B'
+        """
+        return f"{prefix}_{'a' if set == 'A' else 'b'}"
 
     class _ConfigInt(int):
         """Provides both int and string representation of the config
@@ -226,6 +464,36 @@ class VGMotorEVO(VGMotorGeneric):
                 ret_val = self._str_fmt.format(val)
             return ret_val
 
+    def config_transaction(self, unit):
+        """Returns a ConfigTransaction batching config writes to unit
+
+        :param unit:  Target Modbus slave address
+        :returns: VGMotorEVO.ConfigTransaction
+        """
+        return VGMotorEVO.ConfigTransaction(self, unit)
+
+    class ConfigTransaction(ConfigTransaction):
+        """ConfigTransaction that also records EVO config items"""
+
+        def write_field(self, name, value, index=0, fields=None):
+            """Records a named config field write
+
+            :param name: field name in fields
+            :param value: decoded (scaled) value
+            :param index: (optional) array element
+            :param fields: (optional) ConfigFieldRegistry; default FIELDS
+            """
+            fields = self.motor.FIELDS if fields is None else fields
+            self.write(*fields.encode(name, value, index))
+
+        def write_schedule(self, schedule:EVOSchedule):
+            """Records a schedule slot write
+
+            :param schedule:  EVOSchedule object holding all steps
+            """
+            page, address, _ = VGMotorEVO._schedule_location(schedule)
+            self.write(page, address, schedule.schedule_to_bytes())
+
     def schedule_slot(self, unit:int, set:str, slot:int) -> EVOSchedule:
         """Read a schedule slot
         
@@ -235,20 +503,38 @@ class VGMotorEVO(VGMotorGeneric):
         :returns: EVOSchedule object holding all steps
         """
         schedule = EVOSchedule( set, slot)
-        if set == 'A':
-            config_tuple = VGMotorEVO.START_SCHEDULE_A
-        else:
-            config_tuple = VGMotorEVO.START_SCHEDULE_B
-        page = config_tuple[VGMotorEVO._PAGE]
-        address = schedule.address(config_tuple[VGMotorEVO._ADDRESS])
-        length = schedule.length()
+        page, address, length = VGMotorEVO._schedule_location(schedule)
 
-        val_bytes = self.read_config( unit, page, address, length)
+        val_bytes = self._read_config_bytes( unit, page, address, length)
 
         schedule.bytes_to_schedule( val_bytes)
 
         return schedule
 
+    def schedule_set(self, unit:int, set:str) -> list:
+        """Read all eight schedule slots of a set
+
+        The slots are one contiguous table, so it is read through the
+        config mirror with as few read_config transactions as the motor
+        allows and sliced into slots.
+
+        :param unit:  Target Modbus slave address
+        :param set:  Schedule set 'A' or 'B'
+        :returns: list of EVOSchedule objects for slots 1-8
+        """
+        schedules = [EVOSchedule(set, slot) for slot in range(1, 8+1)]
+        page, address, length = VGMotorEVO._schedule_table_location(set)
+
+        val_bytes = self._read_config_bytes(unit, page, address, length)
+
+        for schedule in schedules:
+            if val_bytes is None:
+                schedule.bytes_to_schedule(None)
+            else:
+                offset = schedule.address(0)
+                schedule.bytes_to_schedule(val_bytes[offset:offset+schedule.length()])
+        return schedules
+
     def schedule_slot_write(self, unit:int, schedule:EVOSchedule) -> EVOSchedule:
         """Write a schedule slot
         
@@ -256,13 +542,7 @@ class VGMotorEVO(VGMotorGeneric):
         :param schedule:  EVOSchedule object holding all steps
         :returns:  EVOSchedule object holding all steps
         """
-        if schedule.set() == 'A':
-            config_tuple = VGMotorEVO.START_SCHEDULE_A
-        else:
-            config_tuple = VGMotorEVO.START_SCHEDULE_B
-        page = config_tuple[VGMotorEVO._PAGE]
-        address = schedule.address(config_tuple[VGMotorEVO._ADDRESS])
-        length = schedule.length()
+        page, address, length = VGMotorEVO._schedule_location(schedule)
 
         data = schedule.schedule_to_bytes()
         val_bytes = self.write_config(
@@ -277,3 +557,62 @@ class VGMotorEVO(VGMotorGeneric):
 
         return schedule
 
+    def schedule_set_write(self, unit:int, schedules:list) -> list:
+        """Write several schedule slots of one set and store them
+
+        The slots are encoded into the contiguous schedule table, compared
+        with the table in the config mirror (read from the motor when not
+        mirrored) and only the changed bytes are written in one
+        config_transaction(), so store_config() is sent once at the end
+        and skipped when nothing changed or any write failed.
+
+        :param unit:  Target Modbus slave address
+        :param schedules:  up to 8 EVOSchedule objects of the same set
+        :returns: list of EVOSchedule objects for slots 1-8; None on error
+        """
+        sets = {schedule.set() for schedule in schedules}
+        if len(sets) != 1:
+            raise exceptions.ParameterException("schedules must all belong to one set")
+        set = sets.pop()
+        page, address, length = VGMotorEVO._schedule_table_location(set)
+
+        current = self._read_config_bytes(unit, page, address, length)
+        if current is None:
+            return None
+        table = bytearray(current)
+        for schedule in schedules:
+            offset = schedule.address(0)
+            table[offset:offset+schedule.length()] = schedule.schedule_to_bytes()
+
+        with self.config_transaction(unit) as tx:
+            for start, end in changed_runs(current, table, WRITE_OVERHEAD):
+                tx.write(page, address + start, table[start:end])
+        if not tx.success:
+            return None
+        return self.schedule_set(unit, set)
+
+    @staticmethod
+    def _schedule_location(schedule:EVOSchedule):
+        """Returns the config location of a schedule slot
+
+        :param schedule:  EVOSchedule object for the slot
+        :returns: (page, address, length) tuple
+        """
+        field = VGMotorEVO.FIELDS[VGMotorEVO._schedule_field("schedule", schedule.set()) + "_hours"]
+        page = field.page
+        address = schedule.address(field.address)
+        length = schedule.length()
+        return page, address, length
+
+    @staticmethod
+    def _schedule_table_location(set:str):
+        """Returns the config location of a whole schedule set table
+
+        :param set:  Schedule set 'A' or 'B'
+        :returns: (page, address, length) tuple
+        """
+        first = EVOSchedule(set, 1)
+        last = EVOSchedule(set, 8)
+        page, address, _ = VGMotorEVO._schedule_location(first)
+        length = last.address(0) + last.length()
+        return page, address, length
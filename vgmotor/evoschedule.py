@@ -52,6 +52,13 @@ class EVOSchedule:
         """
         return self._set
 
+    def slot(self):
+        """Returns slot
+
+        :returns: slot 1-8
+        """
+        return self._slot
+
     def address(self, address_start):
         """Returns address of slot offset from beginning of table
 
@@ -0,0 +1,176 @@
+"""Modbus Package for Regal Beloit EPC VGreen Motor family
+
+VGMotorRtuFramer is an RTU framer tuned for the VGreen custom functions.
+
+Poll loops send the same handful of requests (status, read_sensor) over
+and over.  PreframedRequest holds a request already encoded as a complete
+RTU frame (unit + PDU + CRC) and preframed() caches one per
+(request class, unit, args).  VGMotorRtuFramer hands that frame straight
+to the transport, skipping struct.pack() and the CRC on every send.  The
+standard ModbusRtuFramer still works with PreframedRequest; it only saves
+the encode() in that case.
+
+On receive VGMotorRtuFramer knows the frame size of every VGreen function
+up front: a fixed size for 0x41-0x45/0x65, the length-minus-one rule for
+0x46/0x64 and 5 bytes for any exception frame, instead of asking the
+decoder to look up the response class for each frame.
+
+The motor answers an unsupported page/address with a 5 byte exception
+frame (function | 0x80) while the request advertises a much longer
+response.  When the transaction manager asks for the whole response in one
+read, VGMotorRtuFramer reads the 3 byte header first and, on an exception
+header, only waits for the 2 CRC bytes instead of the serial timeout.
+
+    client = ModbusSerialClient(port, framer=VGMotorRtuFramer, ...)
+"""
+from pymodbus.framer.rtu_framer import ModbusRtuFramer
+from pymodbus.pdu import ModbusRequest
+from pymodbus.utilities import computeCRC
+import functools
+import struct
+import time
+
+# Unit:1 + Function:1 + Exception code:1 + CRC:2
+EXCEPTION_FRAME_SIZE = 5
+EXCEPTION_HEADER_SIZE = 3
+# Unit:1 + Function:1 + ACK:1 + page:1 + address:1 + length:1 + data + CRC:2
+_LENGTH_POS = 5
+_VARIABLE_OVERHEAD = 1+1+1+1+1+1+2
+
+#function code: entire response frame size
+FIXED_FRAME_SIZE = {
+    0x41 : 5,   #GoResponse
+    0x42 : 5,   #StopResponse
+    0x43 : 6,   #StatusResponse
+    0x44 : 8,   #SetDemandResponse
+    0x45 : 9,   #ReadSensorResponse
+    0x65 : 5,   #StoreConfigResponse
+}
+#function codes using the length-minus-one rule
+VARIABLE_FRAME = frozenset((
+    0x46,       #ReadIDResponse
+    0x64,       #ReadConfigResponse / WriteConfigResponse
+))
+
+def response_frame_size(buffer):
+    """Returns the size of the VGreen response frame at the start of buffer
+
+    :param buffer: bytes received so far (at least unit and function)
+    :returns: frame size or None for a function this package does not use
+    :raises IndexError: if more bytes are needed to know the size
+    """
+    function_code = buffer[1]
+    if function_code & 0x80:
+        return EXCEPTION_FRAME_SIZE
+    size = FIXED_FRAME_SIZE.get(function_code)
+    if size is None and function_code in VARIABLE_FRAME:
+        #On the wire, length is one less than the real length
+        size = buffer[_LENGTH_POS] + 1 + _VARIABLE_OVERHEAD
+    return size
+
+class PreframedRequest(ModbusRequest):
+    """Immutable request holding its complete RTU frame
+
+    Only transaction_id, which the pymodbus transaction manager assigns on
+    every execute(), may be changed after construction.
+    """
+
+    def __init__(self, request):
+        """Encodes request once
+
+        :param request: ModbusRequest to freeze
+        """
+        super().__init__(request.slave_id)
+        self.function_code = request.function_code
+        #Keep the request parameters (page, address...) for inspection
+        for name in ('page', 'address', 'length'):
+            if hasattr(request, name):
+                setattr(self, name, getattr(request, name))
+        self.request_class = type(request)
+        self.pdu = request.encode()
+        frame = struct.pack(">BB", self.slave_id, self.function_code) + self.pdu
+        self.frame = frame + struct.pack(">H", computeCRC(frame))
+        self._response_pdu_size = request.get_response_pdu_size()
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False) and name != 'transaction_id':
+            raise AttributeError(f"{type(self).__name__} is immutable")
+        super().__setattr__(name, value)
+
+    def encode(self):
+        """Returns the cached PDU"""
+        return self.pdu
+
+    def get_response_pdu_size(self):
+        """Returns response pdu size"""
+        return self._response_pdu_size
+
+@functools.lru_cache(maxsize=1024)
+def preframed(request_class, unit, *args):
+    """Returns the cached PreframedRequest for a request
+
+    :param request_class: ModbusRequest class (e.g. StatusRequest)
+    :param unit:  Target Modbus slave address
+    :param args: remaining positional request arguments
+    :returns: PreframedRequest
+    """
+    return PreframedRequest(request_class(unit, *args))
+
+
+class VGMotorRtuFramer(ModbusRtuFramer):
+    """RTU framer for the VGreen custom functions
+
+    Sends PreframedRequest frames unchanged and sizes responses from the
+    VGreen frame size table.
+    """
+
+    def buildPacket(self, message):
+        """Create a ready to send modbus packet.
+
+        :param message: The populated request/response to send
+        """
+        #Next receive starts a new response frame
+        self._frame_start = True
+        if isinstance(message, PreframedRequest):
+            # Ensure that transaction is actually the slave id for serial comms
+            message.transaction_id = message.slave_id
+            return message.frame
+        return super().buildPacket(message)
+
+    def recvPacket(self, size):
+        """Receive packet from the bus with specified len.
+
+        A read of a whole response frame stops after the exception frame
+        when the header shows function | 0x80.  Shorter reads are passed
+        through unchanged; pymodbus already checks the function code after
+        its own 4 byte header read.
+
+        :param size: Number of bytes to read
+        :return: bytes read
+        """
+        frame_start = getattr(self, '_frame_start', False)
+        self._frame_start = False
+        if not frame_start or size is None or size <= EXCEPTION_FRAME_SIZE:
+            return super().recvPacket(size)
+
+        result = self.client.recv(EXCEPTION_HEADER_SIZE)
+        if len(result) == EXCEPTION_HEADER_SIZE:
+            if result[1] & 0x80:
+                result += self.client.recv(EXCEPTION_FRAME_SIZE - EXCEPTION_HEADER_SIZE)
+            else:
+                result += self.client.recv(size - EXCEPTION_HEADER_SIZE)
+        self.client.last_frame_end = round(time.time(), 6)
+        return result
+
+    def get_expected_response_length(self, data):
+        """Get the expected response length.
+
+        :param data: Message data read so far
+        :raises IndexError: If not enough data to read byte count
+        :return: Total frame size
+        """
+        size = response_frame_size(data)
+        if size is None:
+            size = super().get_expected_response_length(data)
+        return size
@@ -3,9 +3,32 @@
 VGMotorGeneric provides formatted responses for each supported sensor and 
 item of identification.
 
+VGMotorGeneric.stream() reads a set of sensors every period and yields
+them as SensorRecord tuples, replacing hand written read / sleep loops.
+The generator reads only when the consumer asks for the next record, so a
+slow consumer never builds a backlog; periods it misses are skipped and it
+receives a fresh reading instead.
+
+    for record in motor.stream(0x15, [VGMotorGeneric.SPEED,
+                                      VGMotorGeneric.CURRENT], period=0.5):
+        print(record.timestamp, *record.values)
+
 """
+from collections import namedtuple
+import time
+
 from . base import VGMotorBase
 
+SensorRecord = namedtuple("SensorRecord", ["timestamp", "unit", "values", "errors"])
+SensorRecord.__doc__ = """One pass of stream() over its sensors
+
+:param timestamp: time.time() when the pass completed
+:param unit: Modbus slave address read
+:param values: read_sensor() value per sensor, in the order requested;
+               NaN (formatting as the error text) where the read failed
+:param errors: number of failed reads in values
+"""
+
 class VGMotorGeneric(VGMotorBase):
     """Provides formatted responses for all supported sensor and
     identification common to all motors
@@ -45,15 +68,71 @@ class VGMotorGeneric(VGMotorBase):
         """
         page = sensor[VGMotorGeneric._PAGE]
         address = sensor[VGMotorGeneric._ADDRESS]
+
+        value = super().read_sensor(unit, page, address)
+        return(VGMotorGeneric._sensor_value(sensor, value))
+
+    def stream(self, unit, sensors, period, count=None):
+        """Yields the sensors of a unit every period seconds
+
+        Read errors do not end the stream; the failed value is NaN and is
+        counted in the record's errors.
+
+        :param unit:  Target Modbus slave address
+        :param sensors: VGMotorGeneric tuples to read on each pass
+        :param period: seconds between the starts of consecutive passes
+        :param count: (optional) number of records; default unlimited
+        :returns: generator of SensorRecord
+        """
+        sensors = tuple(sensors)
+        deadline = time.monotonic()
+        produced = 0
+        while count is None or produced < count:
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            values = tuple(self.read_sensor(unit, sensor) for sensor in sensors)
+            yield VGMotorGeneric._sensor_record(unit, values)
+            produced += 1
+            #Skip periods missed while the consumer was busy rather than bursting
+            deadline = max(deadline + period, time.monotonic())
+
+    @staticmethod
+    def _sensor_record(unit, values):
+        """Builds the SensorRecord of one stream() pass"""
+        errors = sum(1 for value in values if value != value)  #NaN on error
+        return SensorRecord(time.time(), unit, values, errors)
+
+    def read_sensor_raw(self, unit, sensor):
+        """Return the unscaled reading of a sensor
+
+        Unlike read_sensor() no object is created per reading; scale the
+        value with the sensor tuple when needed (see Telemetry).
+
+        :param unit:  Target Modbus slave address
+        :param sensor: VGMotorGeneric tuple for requested sensor
+        :returns: raw integer reading or None on error
+        """
+        page = sensor[VGMotorGeneric._PAGE]
+        address = sensor[VGMotorGeneric._ADDRESS]
+        return super().read_sensor(unit, page, address)
+
+    @staticmethod
+    def _sensor_value(sensor, value):
+        """Scales a raw sensor reading into a _MotorSensor
+
+        :param sensor: VGMotorGeneric tuple for the sensor
+        :param value: raw value as read; None on error
+        :returns: float which evaluates to a formatted string
+        """
         scale = sensor[VGMotorGeneric._SCALE]
         str_fmt = sensor[VGMotorGeneric._FORMAT]
         err_txt = sensor[VGMotorGeneric._ERROR]
 
-        value = super().read_sensor(unit, page, address)
         if value is not None:
             if value != 0 and scale is not None:
                 value = value / scale
-        return(self._MotorSensor(value, str_fmt, err_txt))
+        return(VGMotorGeneric._MotorSensor(value, str_fmt, err_txt))
 
     class _MotorSensor(float):
         """Provides both float and string representation of the sensor
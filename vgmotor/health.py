@@ -0,0 +1,182 @@
+"""Modbus Package for Regal Beloit EPC VGreen Motor family
+
+UnitHealth tracks which units on a bus are answering.
+
+A powered off motor costs a full response timeout on every request sent
+to it, and on a shared RS-485 bus that time is taken from every other
+motor.  UnitHealth gives each unit a circuit breaker:
+
+    CLOSED     requests are sent; a garbled response (CRC or framing
+               error) is retried a few times with exponential backoff
+    OPEN       after failure_threshold attempts in a row got no response,
+               requests are skipped without touching the bus
+    HALF_OPEN  once the open period has passed a single probe request is
+               let through.  A response closes the breaker, no response
+               opens it again for twice as long (up to max_open_time)
+
+A Modbus exception response still proves the unit is alive, so only
+timeouts and connection errors count as failures.  A timeout is not
+retried by default: a powered off unit would only cost more timeouts.
+Breaker changes are logged once; skipped requests are not logged.
+
+    health = UnitHealth()
+    motor = VGMotorEVO(client, health=health)
+"""
+import pymodbus.exceptions as exceptions
+import logging
+import threading
+import time
+
+log = logging.getLogger()
+
+# pymodbus reports bytes that arrived but did not form a response (short
+# frame, bad CRC) with these texts; a bare timeout has neither
+_GARBLED = ("Incomplete message", "Unable to decode")
+
+class RequestSkipped(exceptions.ModbusIOException):
+    """Result of a request not sent because the unit breaker is open"""
+
+def no_response(result):
+    """Returns True if an execute() result means the unit did not answer
+
+    :param result: ModbusResponse or ModbusException returned by execute()
+    """
+    return isinstance(result, exceptions.ModbusException)
+
+def garbled(result):
+    """Returns True if an execute() result is a CRC or framing error
+
+    :param result: ModbusResponse or ModbusException returned by execute()
+    """
+    if not isinstance(result, exceptions.ModbusIOException):
+        return False
+    text = str(result)
+    return any(marker in text for marker in _GARBLED)
+
+class UnitHealth:
+    """Per-unit circuit breaker and retry policy
+
+    One object may be shared by several motor objects using the same bus.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, retries=2, backoff=0.05, max_backoff=1.0,
+                 failure_threshold=3, open_time=5.0, max_open_time=300.0,
+                 retry_timeouts=False):
+        """Creates a health tracker with every unit closed
+
+        :param retries: extra attempts after a garbled response
+        :param backoff: seconds before the first retry; doubles per retry
+        :param max_backoff: longest delay between retries
+        :param failure_threshold: failed attempts in a row that open the breaker
+        :param open_time: seconds the breaker first stays open
+        :param max_open_time: longest time the breaker stays open
+        :param retry_timeouts: (optional) also retry requests that got no
+                               response at all
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.open_time = open_time
+        self.max_open_time = max_open_time
+        self.retry_timeouts = retry_timeouts
+        self._lock = threading.Lock()
+        self._units = {}  #unit: _Unit
+
+    class _Unit:
+        """Breaker state of one unit"""
+        def __init__(self):
+            self.state = UnitHealth.CLOSED
+            self.failures = 0       #failed attempts in a row
+            self.open_time = None   #current open period
+            self.probe_time = None  #monotonic time the next probe is allowed
+
+    def state(self, unit):
+        """Returns the breaker state of a unit
+
+        :param unit:  Target Modbus slave address
+        :returns: CLOSED, OPEN or HALF_OPEN
+        """
+        with self._lock:
+            entry = self._units.get(unit)
+            return self.CLOSED if entry is None else entry.state
+
+    def allow(self, unit):
+        """Returns True if a request may be sent to unit
+
+        While the breaker is open this lets exactly one probe through each
+        time the open period passes.
+
+        :param unit:  Target Modbus slave address
+        """
+        with self._lock:
+            entry = self._units.get(unit)
+            if entry is None or entry.state == self.CLOSED:
+                return True
+            if entry.state == self.OPEN and time.monotonic() >= entry.probe_time:
+                entry.state = self.HALF_OPEN
+                log.info(f"Modbus slave 0x{unit:02x} probed after {entry.open_time}s")
+                return True
+            return False
+
+    def retry_delay(self, unit, attempt, result=None):
+        """Returns the delay before retrying a request that got no response
+
+        :param unit:  Target Modbus slave address
+        :param attempt: number of retries already made
+        :param result: (optional) the failed execute() result; a timeout
+                       is only retried with retry_timeouts
+        :returns: seconds, or None if the request should not be retried
+        """
+        if attempt >= self.retries or self.state(unit) != self.CLOSED:
+            return None
+        if result is not None and not self.retry_timeouts and not garbled(result):
+            return None
+        return min(self.backoff * (2 ** attempt), self.max_backoff)
+
+    def success(self, unit):
+        """Records a response from unit and closes its breaker
+
+        :param unit:  Target Modbus slave address
+        """
+        with self._lock:
+            entry = self._units.pop(unit, None)
+        if entry is not None and entry.state != self.CLOSED:
+            log.warning(f"Modbus slave 0x{unit:02x} is responding again")
+
+    def failure(self, unit):
+        """Records an attempt to unit that got no response
+
+        :param unit:  Target Modbus slave address
+        """
+        with self._lock:
+            entry = self._units.setdefault(unit, self._Unit())
+            entry.failures += 1
+            if entry.state == self.HALF_OPEN:
+                entry.open_time = min(entry.open_time * 2, self.max_open_time)
+            elif entry.state == self.CLOSED and entry.failures >= self.failure_threshold:
+                entry.open_time = self.open_time
+            else:
+                return
+            if entry.state == self.CLOSED:
+                log.warning(f"Modbus slave 0x{unit:02x} is not responding, "
+                            f"skipping requests for {entry.open_time}s")
+            entry.state = self.OPEN
+            entry.probe_time = time.monotonic() + entry.open_time
+
+    def record(self, unit, result):
+        """Records the result of one attempt
+
+        :param unit:  Target Modbus slave address
+        :param result: ModbusResponse or ModbusException returned by execute()
+        :returns: True if the unit did not answer
+        """
+        if no_response(result):
+            self.failure(unit)
+            return True
+        self.success(unit)
+        return False
@@ -0,0 +1,185 @@
+"""Modbus Package for Regal Beloit EPC VGreen Motor family
+
+KeepAlive holds a set_demand() value active with as little bus traffic as
+possible.
+
+After set_demand() the motor stays in serial control only while some
+command arrives within the serial timeout (EVO SERIAL_TIMEOUT, default
+60s).  Any successful transaction resets that watchdog, so telemetry that
+already reaches a unit is enough.  KeepAlive only sends a status() to a
+unit when nothing else has reached it within the safety margin.
+
+    keepalive = KeepAlive(motor)
+    keepalive.add(0x15)
+    keepalive.start()
+
+AsyncKeepAlive does the same for the asyncio motor classes as a task:
+
+    keepalive = AsyncKeepAlive(motor)
+    await keepalive.add(0x15)
+    asyncio.create_task(keepalive.run())
+"""
+import asyncio
+import logging
+import threading
+import time
+
+log = logging.getLogger()
+
+class KeepAlive:
+    """Background serial watchdog keepalive service
+
+    The serial timeout is read once per unit with serial_timeout() when
+    the motor class provides it; otherwise default_timeout is used.
+    """
+
+    def __init__(self, motor, margin=0.25, default_timeout=60):
+        """Creates a keepalive service with no units
+
+        :param motor: VGMotorBase (or subclass) object used for traffic
+        :param margin: fraction of the timeout kept in reserve (0-1)
+        :param default_timeout: seconds used when the timeout can not be read
+        """
+        self.motor = motor
+        self.margin = margin
+        self.default_timeout = default_timeout
+        self._timeouts = {}  #unit: serial timeout seconds
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def add(self, unit):
+        """Starts keeping a unit alive
+
+        :param unit:  Target Modbus slave address
+        """
+        value = None
+        if hasattr(self.motor, 'serial_timeout'):
+            value = self.motor.serial_timeout(unit)
+        self._add(unit, value)
+
+    def _add(self, unit, value):
+        """Records the serial timeout of a unit; value None if not read"""
+        timeout = self.default_timeout
+        if value is not None:
+            if int(value) > 0:
+                timeout = int(value)
+            else:
+                log.warning(f"Modbus slave 0x{unit:02x} serial timeout unknown, "
+                            f"using {self.default_timeout}s")
+        with self._lock:
+            self._timeouts[unit] = timeout
+
+    def remove(self, unit):
+        """Stops keeping a unit alive
+
+        :param unit:  Target Modbus slave address
+        """
+        with self._lock:
+            self._timeouts.pop(unit, None)
+
+    def interval(self, unit):
+        """Returns the longest quiet time allowed before a keepalive
+
+        :param unit:  Target Modbus slave address
+        :returns: seconds
+        """
+        return self._timeouts[unit] * (1 - self.margin)
+
+    def service(self):
+        """Sends status() to each unit that has been quiet too long
+
+        :returns: monotonic time at which service() is next needed
+        """
+        next_due = None
+        for unit in self._units():
+            now = time.monotonic()
+            if self._quiet(unit, now):
+                self.motor.status(unit)
+            next_due = self._next_due(unit, now, next_due)
+        return next_due
+
+    def _units(self):
+        with self._lock:
+            return list(self._timeouts)
+
+    def _quiet(self, unit, now):
+        """Returns True if unit needs a keepalive at now"""
+        last = self.motor.last_success(unit)
+        return last is None or now - last >= self.interval(unit)
+
+    def _next_due(self, unit, now, next_due):
+        """Returns the earlier of next_due and the next keepalive of unit"""
+        last = self.motor.last_success(unit)
+        if last is None or now - last >= self.interval(unit):
+            #Failed; retry soon rather than a full interval later
+            last = now - self.interval(unit) + 1
+        due = last + self.interval(unit)
+        if next_due is None or due < next_due:
+            next_due = due
+        return next_due
+
+    def start(self):
+        """Starts the background service thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="vgmotor-keepalive", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the background service thread"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            next_due = self.service()
+            delay = 1.0 if next_due is None else next_due - time.monotonic()
+            self._stop_event.wait(max(delay, 0.1))
+
+class AsyncKeepAlive(KeepAlive):
+    """Serial watchdog keepalive for VGMotorAsyncBase (or subclass) motors"""
+
+    async def add(self, unit):
+        """Starts keeping a unit alive
+
+        :param unit:  Target Modbus slave address
+        """
+        value = None
+        if hasattr(self.motor, 'serial_timeout'):
+            value = await self.motor.serial_timeout(unit)
+        self._add(unit, value)
+
+    async def service(self):
+        """Sends status() to each unit that has been quiet too long
+
+        :returns: monotonic time at which service() is next needed
+        """
+        next_due = None
+        for unit in self._units():
+            now = time.monotonic()
+            if self._quiet(unit, now):
+                await self.motor.status(unit)
+            next_due = self._next_due(unit, now, next_due)
+        return next_due
+
+    def start(self):
+        raise RuntimeError("AsyncKeepAlive runs as a task; use run()")
+
+    async def run(self, stop_event=None):
+        """Services the units until stop_event is set
+
+        :param stop_event: (optional) asyncio.Event ending the loop
+        """
+        if stop_event is None:
+            stop_event = asyncio.Event()
+        while not stop_event.is_set():
+            next_due = await self.service()
+            delay = 1.0 if next_due is None else next_due - time.monotonic()
+            try:
+                await asyncio.wait_for(stop_event.wait(), max(delay, 0.1))
+            except asyncio.TimeoutError:
+                pass
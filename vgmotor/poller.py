@@ -0,0 +1,148 @@
+"""Modbus Package for Regal Beloit EPC VGreen Motor family
+
+SensorPoller schedules VGMotorGeneric sensor reads by deadline.
+
+Each (unit, sensor) pair is registered with its own refresh period.  An
+earliest-deadline-first queue decides which read goes on the wire next,
+so a fast sensor such as SPEED is not held back by a slow one such as
+TEMP_AMBIENT and the bus time that a fixed "read everything then sleep"
+loop wastes is available to poll more motors.
+
+    poller = SensorPoller(motor)
+    poller.add(0x15, VGMotorGeneric.SPEED, 0.5)
+    poller.add(0x15, VGMotorGeneric.TEMP_AMBIENT, 30)
+    poller.run(lambda unit, sensor, value: print(unit, value))
+"""
+import heapq
+import itertools
+import threading
+import time
+
+from . base import ReadSensorRequest
+from . timing import ResponseTimeout
+
+class SensorPoller:
+    """Earliest-deadline-first sensor polling engine
+
+    Reads that are overdue keep their original deadline so they are
+    served first on the next call to poll().
+    """
+
+    def __init__(self, motor, baudrate=9600, raw=False):
+        """Creates an empty poller
+
+        :param motor: VGMotorGeneric (or subclass) object used for reads
+        :param baudrate: (optional) bus speed used to estimate bus time
+        :param raw: (optional) pass read_sensor_raw() values to the callback
+        """
+        self.motor = motor
+        self.baudrate = baudrate
+        self.raw = raw
+        self._timing = ResponseTimeout(baudrate=baudrate)
+        self._heap = []  #(deadline, seq, unit, sensor)
+        self._periods = {}  #(unit, sensor): period
+        self._seq = itertools.count()
+
+    def add(self, unit, sensor, period, start=None):
+        """Adds or re-times a sensor to poll
+
+        :param unit:  Target Modbus slave address
+        :param sensor: VGMotorGeneric tuple for requested sensor
+        :param period: Target refresh period in seconds
+        :param start: (optional) time of the first read; default now
+        """
+        key = (unit, sensor)
+        if start is None:
+            start = time.monotonic()
+        if key in self._periods:
+            self._heap = [entry for entry in self._heap if entry[2:] != key]
+            heapq.heapify(self._heap)
+        self._periods[key] = period
+        heapq.heappush(self._heap, (start, next(self._seq), unit, sensor))
+
+    def remove(self, unit, sensor=None):
+        """Stops polling a sensor or every sensor of a unit
+
+        :param unit:  Target Modbus slave address
+        :param sensor: (optional) VGMotorGeneric tuple; None for all
+        """
+        for key in list(self._periods):
+            if key[0] == unit and (sensor is None or key[1] == sensor):
+                del self._periods[key]
+        self._heap = [entry for entry in self._heap if entry[2:] in self._periods]
+        heapq.heapify(self._heap)
+
+    def transaction_time(self):
+        """Returns the estimated bus time of one sensor read
+
+        :returns: seconds on the wire for request and response
+        """
+        return self._timing.transaction_time(ReadSensorRequest(0, 0x00, 0x00))
+
+    def utilization(self):
+        """Returns the fraction of bus time the schedule requires
+
+        An EDF schedule can meet every period only while this is below 1.0.
+
+        :returns: required bus time / available bus time
+        """
+        transaction_time = self.transaction_time()
+        return sum(transaction_time / period for period in self._periods.values())
+
+    def next_deadline(self):
+        """Returns the monotonic time of the earliest pending read
+
+        :returns: deadline or None if nothing is scheduled
+        """
+        if self._heap:
+            return self._heap[0][0]
+        return None
+
+    def poll(self, callback, budget=None):
+        """Performs every read that is due, earliest deadline first
+
+        :param callback: called as callback(unit, sensor, value) per read
+        :param budget: (optional) bus seconds that may be used this call
+        :returns: number of reads performed
+        """
+        count = 0
+        used = 0.0
+        transaction_time = self.transaction_time()
+        while self._heap:
+            now = time.monotonic()
+            deadline, _, unit, sensor = self._heap[0]
+            if deadline > now:
+                break
+            if budget is not None and used + transaction_time > budget:
+                break
+            heapq.heappop(self._heap)
+            period = self._periods[(unit, sensor)]
+            #Skip missed periods rather than bursting to catch up
+            deadline += period
+            if deadline <= now:
+                deadline = now + period
+            heapq.heappush(self._heap, (deadline, next(self._seq), unit, sensor))
+
+            if self.raw:
+                value = self.motor.read_sensor_raw(unit, sensor)
+            else:
+                value = self.motor.read_sensor(unit, sensor)
+            used += transaction_time
+            count += 1
+            callback(unit, sensor, value)
+        return count
+
+    def run(self, callback, stop_event=None):
+        """Polls until stop_event is set, sleeping until the next deadline
+
+        :param callback: called as callback(unit, sensor, value) per read
+        :param stop_event: (optional) threading.Event ending the loop
+        """
+        if stop_event is None:
+            stop_event = threading.Event()
+        while not stop_event.is_set():
+            self.poll(callback)
+            deadline = self.next_deadline()
+            delay = 1.0 if deadline is None else deadline - time.monotonic()
+            if delay > 0:
+                stop_event.wait(delay)
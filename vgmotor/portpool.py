@@ -0,0 +1,193 @@
+"""Modbus Package for Regal Beloit EPC VGreen Motor family
+
+PortPool hands out one shared serial client per RS-485 adapter.
+
+Modules that talk to motors on the same adapter ask the pool for a client
+instead of each opening the port.  The pool keeps one reference counted
+client per device path; a second request with different serial settings
+for a port already in use is refused.  Because the client object lives as
+long as anyone holds it, the VGreen response registrations and per-unit
+state that VGMotorBase keeps per client survive reconnects.
+
+The pooled client opens the port on first use and waits settle seconds
+once per open, replacing the connect() and sleep() warm-up in each
+script.  When the adapter disappears (e.g. a USB reset) the failed
+transaction closes the port and the next one reopens it.  Reopen attempts
+are at least reconnect_interval apart, so many callers hitting a missing
+adapter do not cause a reconnect storm.  By default the port is locked
+for exclusive use once open (a flock on POSIX) so a second process can
+not interleave frames on it; PortPool(exclusive=False) leaves it shared.
+
+    pool = PortPool()
+    with pool.client("/dev/ttyUSB0", baudrate=9600) as client:
+        motor = VGMotorEVO(client)
+"""
+import contextlib
+import logging
+import threading
+import time
+
+from pymodbus.client import ModbusSerialClient
+import pymodbus.exceptions as exceptions
+import serial
+
+from . framer import VGMotorRtuFramer
+
+log = logging.getLogger()
+
+class _PooledSerialClient(ModbusSerialClient):
+    """ModbusSerialClient that reopens its port after adapter errors"""
+
+    def __init__(self, port, settle=1.0, reconnect_interval=2.0, exclusive=True, **kwargs):
+        """Creates an unopened client
+
+        :param port: serial device path
+        :param settle: seconds to wait after opening the port
+        :param reconnect_interval: least seconds between open attempts
+        :param exclusive: lock the port against other processes once open
+        :param kwargs: remaining ModbusSerialClient arguments
+        """
+        #A silent motor is not a reason to reopen the adapter
+        kwargs.setdefault('reset_socket', False)
+        super().__init__(port, **kwargs)
+        self.settle = settle
+        self.reconnect_interval = reconnect_interval
+        self.exclusive = exclusive
+        self._last_open = None
+
+    def connect(self):
+        """Opens the port unless open or recently attempted
+
+        :returns: True if the port is open
+        """
+        if self.socket:
+            return True
+        now = time.monotonic()
+        if self._last_open is not None and now - self._last_open < self.reconnect_interval:
+            return False
+        self._last_open = now
+        try:
+            if not super().connect():
+                return False
+            if self.exclusive:
+                #pyserial applies the lock to the open port
+                self.socket.exclusive = True
+        except (serial.SerialException, ValueError) as msg:
+            log.error(f"Serial port {self.params.port}: {msg}")
+            self.close()
+            return False
+        #Let the adapter and bus settle once per open
+        time.sleep(self.settle)
+        return True
+
+    def send(self, request):
+        """Sends on the port, closing it if the adapter fails"""
+        try:
+            return super().send(request)
+        except (serial.SerialException, OSError) as msg:
+            self._adapter_failed(msg)
+
+    def recv(self, size):
+        """Receives from the port, closing it if the adapter fails"""
+        try:
+            return super().recv(size)
+        except (serial.SerialException, OSError) as msg:
+            self._adapter_failed(msg)
+
+    def close(self):
+        """Closes the port, even if the adapter is already gone"""
+        try:
+            super().close()
+        except (serial.SerialException, OSError):
+            pass
+        self.socket = None
+
+    def _adapter_failed(self, msg):
+        log.error(f"Serial port {self.params.port} failed, closing: {msg}")
+        self.close()
+        raise exceptions.ConnectionException(f"Serial port {self.params.port}: {msg}")
+
+class PortPool:
+    """Reference counted serial clients keyed by device path"""
+
+    def __init__(self, settle=1.0, reconnect_interval=2.0, exclusive=True):
+        """Creates an empty pool
+
+        :param settle: seconds to wait after each port open
+        :param reconnect_interval: least seconds between open attempts
+        :param exclusive: (optional) lock each port against other processes
+        """
+        self.settle = settle
+        self.reconnect_interval = reconnect_interval
+        self.exclusive = exclusive
+        self._lock = threading.Lock()
+        self._ports = {}  #port: [client, settings, references]
+
+    def acquire(self, port, framer=VGMotorRtuFramer, baudrate=9600, bytesize=8,
+                parity='N', stopbits=1, timeout=1):
+        """Returns the shared client for a port, creating it if needed
+
+        Every acquire() must be matched by a release().
+
+        :param port: serial device path (e.g. "/dev/ttyUSB0")
+        :param framer: (optional) pymodbus framer class
+        :param baudrate: (optional) bits per second
+        :param bytesize: (optional) data bits per character
+        :param parity: (optional) 'N'one, 'E'ven or 'O'dd
+        :param stopbits: (optional) stop bits per character
+        :param timeout: (optional) response timeout in seconds
+        :returns: ModbusSerialClient
+        :raises ParameterException: if the port is in use with other settings
+        """
+        settings = (framer, baudrate, bytesize, parity, stopbits, timeout)
+        with self._lock:
+            entry = self._ports.get(port)
+            if entry is None:
+                client = _PooledSerialClient(
+                        port, settle=self.settle,
+                        reconnect_interval=self.reconnect_interval,
+                        exclusive=self.exclusive, framer=framer, baudrate=baudrate, bytesize=bytesize,
+                        parity=parity, stopbits=stopbits, timeout=timeout)
+                entry = self._ports[port] = [client, settings, 0]
+            elif entry[1] != settings:
+                raise exceptions.ParameterException(
+                        f"serial port {port} is already in use with other settings")
+            entry[2] += 1
+            return entry[0]
+
+    def release(self, client):
+        """Returns a client; the port is closed when nobody holds it
+
+        :param client: client returned by acquire()
+        """
+        with self._lock:
+            port = client.params.port
+            entry = self._ports.get(port)
+            if entry is None or entry[0] is not client:
+                return
+            entry[2] -= 1
+            if entry[2] == 0:
+                del self._ports[port]
+                client.close()
+
+    @contextlib.contextmanager
+    def client(self, port, **kwargs):
+        """Context manager acquiring and releasing the client for a port
+
+        :param port: serial device path
+        :param kwargs: remaining acquire() arguments
+        """
+        client = self.acquire(port, **kwargs)
+        try:
+            yield client
+        finally:
+            self.release(client)
+
+    def references(self, port):
+        """Returns how many holders a port has
+
+        :param port: serial device path
+        """
+        with self._lock:
+            entry = self._ports.get(port)
+            return 0 if entry is None else entry[2]
@@ -0,0 +1,343 @@
+"""Modbus Package for Regal Beloit EPC VGreen Motor family
+
+TelemetryRecorder appends sensor samples to an on-disk columnar store and
+TelemetryReader maps it back into numpy arrays.
+
+A recording is a directory holding one append-only file per column, each
+a plain array of fixed width native values:
+
+    timestamp.f8  float64  time of the reading
+    unit.u1       uint8    Modbus slave address
+    sensor.u2     uint16   index into the sensor table of meta.json
+    raw.u2        uint16   raw reading (0 when the read failed)
+    error.u1      uint8    1 when the read failed
+
+Samples are buffered in array.array columns and written in batches, so a
+recorder shared by the pollers of several ports costs one file write per
+column per batch.  The reader memory maps each column and keeps the row
+numbers of each (unit, sensor), so opening a month of samples is instant
+and a query binary searches the timestamp column and touches only the
+rows it returns.  The timestamp column must be sorted: the recorder's
+default clock is wall time that never goes backwards (see wall_clock()).
+Reading requires numpy (pip install vgmotor[numpy]); recording does not.
+
+    with TelemetryRecorder("telemetry") as recorder:
+        poller = SensorPoller(motor, raw=True)
+        poller.add(0x15, VGMotorGeneric.SPEED, 0.5)
+        poller.run(recorder.record)
+
+    reader = TelemetryReader("telemetry")
+    timestamps, speed = reader.select(0x15, VGMotorGeneric.SPEED)
+"""
+from array import array
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from . generic import VGMotorGeneric
+
+# (column, array typecode, numpy dtype); the file of a column is column.dtype
+COLUMNS = (
+    ("timestamp", 'd', "f8"),
+    ("unit", 'B', "u1"),
+    ("sensor", 'H', "u2"),
+    ("raw", 'H', "u2"),
+    ("error", 'B', "u1"),
+)
+_META = "meta.json"
+_VERSION = 1
+
+# time.time() at the monotonic clock's zero, fixed when the module loads
+_WALL_OFFSET = time.time() - time.monotonic()
+
+def wall_clock():
+    """Returns the wall time in seconds, never going backwards
+
+    time.time() steps back when NTP or an operator sets the clock, which
+    would leave the timestamp column unsorted.  This is time.monotonic()
+    anchored to the wall time when vgmotor.recorder was imported, so it
+    drifts from a corrected wall clock instead.
+    """
+    return _WALL_OFFSET + time.monotonic()
+
+def _column_path(path, column, dtype):
+    return os.path.join(path, f"{column}.{dtype}")
+
+def _read_meta(path):
+    """Returns the meta.json contents of a recording; None if missing"""
+    try:
+        with open(os.path.join(path, _META)) as file:
+            meta = json.load(file)
+    except FileNotFoundError:
+        return None
+    if meta.get("version") != _VERSION:
+        raise ValueError(f"{path}: unsupported recording version {meta.get('version')}")
+    if meta.get("byteorder") != sys.byteorder:
+        raise ValueError(f"{path}: recorded on a {meta.get('byteorder')} endian host")
+    meta["sensors"] = [tuple(sensor) for sensor in meta["sensors"]]
+    return meta
+
+def _complete_rows(path):
+    """Returns the number of rows present in every column file"""
+    rows = None
+    for column, typecode, dtype in COLUMNS:
+        try:
+            size = os.path.getsize(_column_path(path, column, dtype))
+        except FileNotFoundError:
+            size = 0
+        count = size // array(typecode).itemsize
+        rows = count if rows is None else min(rows, count)
+    return rows
+
+class TelemetryRecorder:
+    """Batched, append-only writer of a columnar recording
+
+    An existing recording is appended to.  Columns left uneven by a crash
+    during a write are truncated to the rows complete in every column.
+    Timestamps, from clock or given to record(), must not decrease.
+    """
+
+    def __init__(self, path, batch=4096, flush_interval=5.0, clock=wall_clock):
+        """Opens or creates a recording
+
+        :param path: recording directory
+        :param batch: (optional) buffered rows that trigger a write
+        :param flush_interval: (optional) seconds after which buffered rows are written
+        :param clock: (optional) function returning the sample timestamp;
+                      it must never go backwards
+        """
+        self.path = path
+        self.batch = batch
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+        meta = _read_meta(path)
+        self._sensors = [] if meta is None else meta["sensors"]
+        self._sensor_ids = {sensor: index for index, sensor in enumerate(self._sensors)}
+        if meta is None:
+            self._write_meta()
+
+        rows = _complete_rows(path)
+        self._files = []
+        for column, typecode, dtype in COLUMNS:
+            file = open(_column_path(path, column, dtype), "ab", buffering=0)
+            file.truncate(rows * array(typecode).itemsize)
+            self._files.append(file)
+        self._buffers = [array(typecode) for _, typecode, _ in COLUMNS]
+        self._last_flush = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def record(self, unit, sensor, raw, timestamp=None):
+        """Buffers one sample, writing the batch when it is due
+
+        Matches the SensorPoller callback, so it can be passed to
+        SensorPoller(motor, raw=True).run() directly.
+
+        :param unit:  Target Modbus slave address
+        :param sensor: VGMotorGeneric tuple for the sensor
+        :param raw: raw reading as returned by read_sensor_raw(); None on error
+        :param timestamp: (optional) time of the reading, not earlier than
+                          the last one recorded; default clock()
+        """
+        with self._lock:
+            if timestamp is None:
+                timestamp = self.clock()
+            sensor_id = self._sensor_ids.get(sensor)
+            if sensor_id is None:
+                sensor_id = self._add_sensor(sensor)
+            timestamps, units, sensors, raws, errors = self._buffers
+            timestamps.append(timestamp)
+            units.append(unit)
+            sensors.append(sensor_id)
+            raws.append(0 if raw is None else raw)
+            errors.append(raw is None)
+            if (len(timestamps) >= self.batch
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush()
+
+    def flush(self):
+        """Writes the buffered rows"""
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        """Writes the buffered rows and closes the column files"""
+        with self._lock:
+            if not self._files:
+                return
+            self._flush()
+            for file in self._files:
+                file.close()
+            self._files = []
+
+    def _flush(self):
+        """Appends each column buffer to its file; caller holds the lock"""
+        self._last_flush = time.monotonic()
+        if not self._buffers[0]:
+            return
+        for file, buffer in zip(self._files, self._buffers):
+            buffer.tofile(file)
+            del buffer[:]
+
+    def _add_sensor(self, sensor):
+        """Assigns the next sensor id and records it in meta.json"""
+        sensor_id = len(self._sensors)
+        if sensor_id > 0xffff:
+            raise ValueError("too many sensors in one recording")
+        self._sensors.append(tuple(sensor))
+        self._sensor_ids[sensor] = sensor_id
+        self._write_meta()
+        return sensor_id
+
+    def _write_meta(self):
+        """Replaces meta.json in one step"""
+        meta = {"version": _VERSION, "byteorder": sys.byteorder, "sensors": self._sensors}
+        temp = os.path.join(self.path, _META + ".tmp")
+        with open(temp, "w") as file:
+            json.dump(meta, file)
+        os.replace(temp, os.path.join(self.path, _META))
+
+class TelemetryReader:
+    """Memory mapped, read-only view of a recording
+
+    Timestamp ranges are found by binary search, which relies on the
+    timestamp column being sorted (see TelemetryRecorder).  The rows of
+    each (unit, sensor) are indexed as they are mapped, and refresh()
+    indexes only the rows added since.
+    """
+
+    def __init__(self, path):
+        """Maps a recording
+
+        :param path: recording directory
+        :raises ImportError: if numpy is not installed
+        :raises FileNotFoundError: if path is not a recording
+        """
+        if numpy is None:
+            raise ImportError("TelemetryReader requires numpy")
+        self.path = path
+        self._rows = 0
+        self._index = {}  #(unit, sensor id): row numbers, ascending
+        self.refresh()
+
+    def __len__(self):
+        return self._rows
+
+    def refresh(self):
+        """Re-maps the columns to include rows written since opening"""
+        meta = _read_meta(self.path)
+        if meta is None:
+            raise FileNotFoundError(f"{self.path}: no {_META}")
+        self._sensors = meta["sensors"]
+        rows = _complete_rows(self.path)
+        indexed = self._rows if rows >= self._rows else 0
+        if indexed == 0:
+            self._index = {}
+        self._rows = rows
+        self.columns = {}
+        for column, _, dtype in COLUMNS:
+            if self._rows == 0:
+                self.columns[column] = numpy.empty(0, dtype=dtype)
+            else:
+                self.columns[column] = numpy.memmap(
+                        _column_path(self.path, column, dtype), dtype=dtype,
+                        mode="r", shape=(self._rows,))
+        self._extend_index(indexed)
+
+    def _extend_index(self, first):
+        """Adds rows from first onwards to the (unit, sensor) index"""
+        if first >= self._rows:
+            return
+        keys = (self.columns["unit"][first:].astype(numpy.uint32) << 16
+                | self.columns["sensor"][first:])
+        order = numpy.argsort(keys, kind="stable")
+        keys = keys[order]
+        starts = numpy.flatnonzero(numpy.diff(keys)) + 1
+        for rows, key in zip(numpy.split(order + first, starts),
+                             keys[numpy.concatenate(([0], starts))]):
+            key = (int(key) >> 16, int(key) & 0xffff)
+            old = self._index.get(key)
+            self._index[key] = rows if old is None else numpy.concatenate((old, rows))
+
+    def sensors(self):
+        """Returns the sensor tuples present in the recording"""
+        return list(self._sensors)
+
+    def units(self):
+        """Returns the unit addresses present in the recording"""
+        return sorted({unit for unit, _ in self._index})
+
+    def rows(self, start=None, end=None):
+        """Returns the row slice whose timestamps are in [start, end)
+
+        :param start: (optional) earliest timestamp
+        :param end: (optional) timestamp after the last row
+        """
+        timestamps = self.columns["timestamp"]
+        first = 0 if start is None else int(numpy.searchsorted(timestamps, start, "left"))
+        last = len(timestamps) if end is None else int(numpy.searchsorted(timestamps, end, "left"))
+        return slice(first, last)
+
+    def raw(self, unit, sensor, start=None, end=None):
+        """Returns the unscaled samples of one sensor
+
+        When the selected rows are contiguous (a recording of one sensor)
+        the arrays are slices of the memory maps, otherwise copies of just
+        the selected rows.
+
+        :param unit:  Target Modbus slave address
+        :param sensor: VGMotorGeneric tuple for the sensor
+        :param start: (optional) earliest timestamp
+        :param end: (optional) timestamp after the last sample
+        :returns: (timestamps, raw, error) numpy arrays
+        """
+        columns = self.columns
+        try:
+            sensor_id = self._sensors.index(tuple(sensor))
+        except ValueError:
+            selected = None
+        else:
+            selected = self._index.get((unit, sensor_id))
+        if selected is None:
+            return tuple(numpy.empty(0, dtype=columns[column].dtype)
+                         for column in ("timestamp", "raw", "error"))
+
+        rows = self.rows(start, end)
+        selected = selected[numpy.searchsorted(selected, rows.start):
+                            numpy.searchsorted(selected, rows.stop)]
+        if len(selected) and selected[-1] - selected[0] + 1 == len(selected):
+            selected = slice(int(selected[0]), int(selected[-1]) + 1)
+        return (columns["timestamp"][selected], columns["raw"][selected],
+                columns["error"][selected])
+
+    def select(self, unit, sensor, start=None, end=None):
+        """Returns the scaled samples of one sensor
+
+        :param unit:  Target Modbus slave address
+        :param sensor: VGMotorGeneric tuple for the sensor
+        :param start: (optional) earliest timestamp
+        :param end: (optional) timestamp after the last sample
+        :returns: (timestamps, values) numpy arrays; NaN marks failed reads
+        """
+        timestamps, raw, error = self.raw(unit, sensor, start, end)
+        values = raw.astype(numpy.float64)
+        scale = sensor[VGMotorGeneric._SCALE]
+        if scale is not None:
+            values /= scale
+        values[error != 0] = numpy.nan
+        return timestamps, values
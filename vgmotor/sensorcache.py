@@ -0,0 +1,97 @@
+"""Modbus Package for Regal Beloit EPC VGreen Motor family
+
+SensorCache is a read-through cache in front of read_sensor() and status().
+
+When a UI, a control loop and a logger each poll the same motor on their
+own schedule the bus carries the same read several times.  Each caller
+states how old a value it will accept instead; a fresh enough cached
+value is returned without touching the bus, and when several threads ask
+for the same stale value at once only one of them reads it while the
+others wait for and share its result.
+
+    cache = SensorCache(motor)
+    speed, when = cache.read_sensor(0x15, VGMotorGeneric.SPEED, max_age=0.5)
+"""
+import threading
+import time
+
+from . singleflight import Singleflight
+
+class SensorCache:
+    """Per-unit, per-sensor read-through cache
+
+    Only successful reads are cached.  Timestamps come from clock, which
+    is time.monotonic unless given (e.g. time.time for logging).
+    """
+
+    def __init__(self, motor, clock=time.monotonic):
+        """Creates an empty cache
+
+        :param motor: VGMotorGeneric (or subclass) object used for reads
+        :param clock: (optional) function returning the current time
+        """
+        self.motor = motor
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._values = {}  #key: (value, timestamp)
+        self._flights = Singleflight()
+
+    def read_sensor(self, unit, sensor, max_age):
+        """Returns a sensor value no older than max_age
+
+        :param unit:  Target Modbus slave address
+        :param sensor: VGMotorGeneric tuple for requested sensor
+        :param max_age: oldest acceptable value in seconds (0 forces a read)
+        :returns: (value, timestamp) as returned by motor.read_sensor()
+        """
+        return self._get(('sensor', unit, sensor), max_age,
+                         lambda: self.motor.read_sensor(unit, sensor),
+                         lambda value: value == value)  #NaN on error
+
+    def status(self, unit, max_age):
+        """Returns a motor status no older than max_age
+
+        :param unit:  Target Modbus slave address
+        :param max_age: oldest acceptable value in seconds (0 forces a read)
+        :returns: (MotorStatus or None, timestamp)
+        """
+        return self._get(('status', unit), max_age,
+                         lambda: self.motor.status(unit),
+                         lambda value: value is not None)
+
+    def invalidate(self, unit=None):
+        """Discards cached values
+
+        :param unit: (optional) Target Modbus slave address; default all
+        """
+        with self._lock:
+            for key in list(self._values):
+                if unit is None or key[1] == unit:
+                    del self._values[key]
+
+    def _get(self, key, max_age, read, valid):
+        """Returns the cached value for key or reads it once for all callers"""
+        entry = self._fresh(key, max_age)
+        if entry is not None:
+            return entry
+        return self._flights.do(key, lambda: self._read(key, max_age, read, valid))
+
+    def _fresh(self, key, max_age):
+        """Returns the cached (value, timestamp) if younger than max_age"""
+        with self._lock:
+            entry = self._values.get(key)
+        if entry is not None and self.clock() - entry[1] < max_age:
+            return entry
+        return None
+
+    def _read(self, key, max_age, read, valid):
+        """Reads a value unless another caller just cached one"""
+        entry = self._fresh(key, max_age)
+        if entry is not None:
+            return entry
+        value = read()
+        entry = (value, self.clock())
+        if value is not None and valid(value):
+            with self._lock:
+                self._values[key] = entry
+        return entry
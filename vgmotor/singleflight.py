@@ -0,0 +1,99 @@
+"""Modbus Package for Regal Beloit EPC VGreen Motor family
+
+Singleflight coalesces identical calls that are in flight at the same time.
+
+The first caller for a key runs the call; every caller that asks for the
+same key before it finishes waits for it and receives the same result
+(or exception) instead of running its own.  VGMotorBase uses this to send
+one frame for identical concurrent reads, and AsyncSingleflight does the
+same for asyncio tasks.
+"""
+import asyncio
+import threading
+
+class Singleflight:
+    """Thread based call coalescing"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  #key: _Call
+
+    class _Call:
+        """One running call and its outcome"""
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def do(self, key, function):
+        """Runs function, or waits for the running call with the same key
+
+        :param key: hashable identifying equivalent calls
+        :param function: callable taking no arguments
+        :returns: result of the call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Singleflight._Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def pending(self):
+        """Returns the number of calls in flight"""
+        with self._lock:
+            return len(self._calls)
+
+class AsyncSingleflight:
+    """Asyncio task based call coalescing"""
+
+    def __init__(self):
+        self._calls = {}  #key: asyncio.Future
+
+    async def do(self, key, function):
+        """Awaits function, or the running call with the same key
+
+        :param key: hashable identifying equivalent calls
+        :param function: coroutine function taking no arguments
+        :returns: result of the call
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await function()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  #retrieved; only waiters re-raise it
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del self._calls[key]
+        return result
+
+    def pending(self):
+        """Returns the number of calls in flight"""
+        return len(self._calls)
@@ -0,0 +1,196 @@
+"""Modbus Package for Regal Beloit EPC VGreen Motor family
+
+Telemetry keeps the recent history of each (unit, sensor) in a fixed
+capacity ring buffer.
+
+read_sensor() returns a new float object per sample carrying its own
+format strings, which adds up when a daemon polls a fleet for days.  A
+SensorRing instead stores the raw 16 bit reading and its timestamp in
+two preallocated array.array buffers, so recording a sample allocates
+nothing and memory stays flat however long the daemon runs.  Scaling by
+the sensor tuple's _SCALE, and formatting, happen only when the history
+is read.  With numpy installed the history is also available as numpy
+arrays (pip install vgmotor[numpy]).
+
+    telemetry = Telemetry(capacity=3600)
+    poller = SensorPoller(motor, raw=True)
+    poller.add(0x15, VGMotorGeneric.SPEED, 0.5)
+    poller.run(telemetry.record)
+    timestamps, speeds = telemetry.ring(0x15, VGMotorGeneric.SPEED).values()
+"""
+from array import array
+import threading
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from . generic import VGMotorGeneric
+
+# Raw readings are unsigned 16 bit; a failed read is stored as MISSING
+MISSING = -1
+
+class SensorRing:
+    """Fixed capacity history of raw readings of one sensor
+
+    Once full, each new sample replaces the oldest one.
+    """
+
+    def __init__(self, sensor, capacity):
+        """Creates an empty ring
+
+        :param sensor: VGMotorGeneric tuple of the recorded sensor
+        :param capacity: number of samples kept
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.sensor = sensor
+        self.capacity = capacity
+        self._timestamps = array('d', bytes(8 * capacity))
+        self._raw = array('i', bytes(array('i').itemsize * capacity))
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def append(self, raw, timestamp):
+        """Records one sample
+
+        :param raw: raw reading as returned by read_sensor_raw(); None on error
+        :param timestamp: time of the reading
+        """
+        with self._lock:
+            index = self._next
+            self._timestamps[index] = timestamp
+            self._raw[index] = MISSING if raw is None else raw
+            self._next = (index + 1) % self.capacity
+            if self._count < self.capacity:
+                self._count += 1
+
+    def clear(self):
+        """Discards every sample"""
+        with self._lock:
+            self._next = 0
+            self._count = 0
+
+    def raw(self):
+        """Returns the samples oldest first, unscaled
+
+        :returns: (timestamps, raw) array.array copies; MISSING marks errors
+        """
+        with self._lock:
+            return self._ordered(self._timestamps), self._ordered(self._raw)
+
+    def values(self):
+        """Returns the samples oldest first, scaled
+
+        :returns: (timestamps, values) lists; NaN marks errors
+        """
+        timestamps, raw = self.raw()
+        return list(timestamps), [self._scale(value) for value in raw]
+
+    def to_numpy(self):
+        """Returns the samples oldest first, scaled, as numpy arrays
+
+        :returns: (timestamps, values) float64 arrays; NaN marks errors
+        :raises ImportError: if numpy is not installed
+        """
+        if numpy is None:
+            raise ImportError("SensorRing.to_numpy() requires numpy")
+        timestamps, raw = self.raw()
+        values = numpy.frombuffer(raw, dtype=numpy.intc).astype(numpy.float64)
+        values[values == MISSING] = numpy.nan
+        scale = self.sensor[VGMotorGeneric._SCALE]
+        if scale is not None:
+            values /= scale
+        return numpy.frombuffer(timestamps, dtype=numpy.float64), values
+
+    def latest(self):
+        """Returns the newest sample formatted as read_sensor() would
+
+        :returns: (value, timestamp); None if the ring is empty
+        """
+        with self._lock:
+            if self._count == 0:
+                return None
+            index = (self._next - 1) % self.capacity
+            raw = self._raw[index]
+            timestamp = self._timestamps[index]
+        value = VGMotorGeneric._sensor_value(self.sensor, None if raw == MISSING else raw)
+        return value, timestamp
+
+    def _ordered(self, buffer):
+        """Returns a copy of buffer holding the samples oldest first"""
+        if self._count < self.capacity:
+            return buffer[:self._count]
+        return buffer[self._next:] + buffer[:self._next]
+
+    def _scale(self, raw):
+        """Returns a raw reading as a scaled float"""
+        if raw == MISSING:
+            return float("NaN")
+        scale = self.sensor[VGMotorGeneric._SCALE]
+        return raw / scale if scale is not None else float(raw)
+
+class Telemetry:
+    """SensorRing per (unit, sensor), created on first use"""
+
+    def __init__(self, capacity, clock=time.time):
+        """Creates an empty telemetry store
+
+        :param capacity: samples kept per (unit, sensor)
+        :param clock: (optional) function returning the sample timestamp
+        """
+        self.capacity = capacity
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._rings = {}  #(unit, sensor): SensorRing
+
+    def ring(self, unit, sensor):
+        """Returns the ring of a sensor, creating it if needed
+
+        :param unit:  Target Modbus slave address
+        :param sensor: VGMotorGeneric tuple for the sensor
+        """
+        key = (unit, sensor)
+        ring = self._rings.get(key)
+        if ring is None:
+            with self._lock:
+                ring = self._rings.setdefault(key, SensorRing(sensor, self.capacity))
+        return ring
+
+    def record(self, unit, sensor, raw, timestamp=None):
+        """Records one raw reading
+
+        Matches the SensorPoller callback, so it can be passed to
+        SensorPoller(motor, raw=True).run() directly.
+
+        :param unit:  Target Modbus slave address
+        :param sensor: VGMotorGeneric tuple for the sensor
+        :param raw: raw reading; None on error
+        :param timestamp: (optional) time of the reading; default clock()
+        """
+        if timestamp is None:
+            timestamp = self.clock()
+        self.ring(unit, sensor).append(raw, timestamp)
+
+    def read(self, motor, unit, sensor):
+        """Reads a sensor with read_sensor_raw() and records it
+
+        :param motor: VGMotorGeneric (or subclass) object used for the read
+        :param unit:  Target Modbus slave address
+        :param sensor: VGMotorGeneric tuple for the sensor
+        :returns: raw reading; None on error
+        """
+        raw = motor.read_sensor_raw(unit, sensor)
+        self.record(unit, sensor, raw)
+        return raw
+
+    def keys(self):
+        """Returns the recorded (unit, sensor) pairs"""
+        with self._lock:
+            return list(self._rings)
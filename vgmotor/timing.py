@@ -0,0 +1,179 @@
+"""Modbus Package for Regal Beloit EPC VGreen Motor family
+
+ResponseTimeout derives a per-request response timeout from the bus speed.
+
+Every VGreen response has a known size (_rtu_frame_size, or the length for
+variable reads), so the time a healthy motor needs to answer is the time
+to send the request, the motor turnaround and the time to send the
+response.  A timeout of 1s on a 5 byte GoResponse that takes about 5ms on
+the wire means one dead unit costs a full second of shared bus time per
+poll.  ResponseTimeout sets the client timeout for each request to the
+expected time plus a configurable margin, and learns the turnaround of
+each unit from successful transactions.
+
+    timeouts = ResponseTimeout.from_client(client)
+    motor = VGMotorEVO(client, timeouts=timeouts)
+"""
+from pymodbus.pdu import ModbusResponse
+import math
+import time
+
+# 3.5 character silent interval between RTU frames
+FRAME_GAP = 3.5
+
+def set_timeout(client, timeout):
+    """Sets the response timeout of a pymodbus client
+
+    pyserial reconfigures the port (tcsetattr) on every assignment to its
+    timeout, so the port is only touched when the timeout changes.
+
+    :param client: ModbusBaseClient object
+    :param timeout: seconds
+    """
+    client.params.timeout = timeout
+    socket = getattr(client, 'socket', None)
+    if socket is not None and getattr(socket, 'timeout', timeout) != timeout:
+        socket.timeout = timeout
+
+class ResponseTimeout:
+    """Baud rate derived response timeout policy
+
+    The turnaround estimate per unit is a smoothed mean plus four times the
+    smoothed deviation of the measured samples, as TCP does for its
+    retransmission timer.
+    """
+
+    _ALPHA = 0.125  #gain for the smoothed turnaround
+    _BETA = 0.25    #gain for the smoothed deviation
+
+    def __init__(self, baudrate=9600, bytesize=8, parity='N', stopbits=1,
+                 turnaround=0.010, margin=0.050, minimum=0.020, maximum=1.0,
+                 resolution=0.010):
+        """Creates a timeout policy
+
+        :param baudrate: bus speed in bits per second
+        :param bytesize: data bits per character
+        :param parity: 'N'one, 'E'ven or 'O'dd
+        :param stopbits: stop bits per character
+        :param turnaround: initial motor turnaround estimate in seconds
+        :param margin: seconds added to every timeout
+        :param minimum: smallest timeout returned
+        :param maximum: largest timeout returned
+        :param resolution: timeouts are rounded up to a multiple of this, so
+                           small turnaround changes do not change the timeout
+        """
+        bits = 1 + bytesize + (0 if parity == 'N' else 1) + stopbits
+        self.char_time = bits / baudrate
+        self.margin = margin
+        self.minimum = minimum
+        self.maximum = maximum
+        self.resolution = resolution
+        self._initial_turnaround = turnaround
+        self._turnaround = {}  #unit: [smoothed, deviation]
+
+    @classmethod
+    def from_client(cls, client, **kwargs):
+        """Creates a policy using the serial settings of a client
+
+        :param client: ModbusSerialClient (or async) object
+        :param kwargs: remaining ResponseTimeout arguments
+        :returns: ResponseTimeout
+        """
+        params = client.params
+        return cls(baudrate=params.baudrate or 9600,
+                   bytesize=params.bytesize or 8,
+                   parity=params.parity or 'N',
+                   stopbits=params.stopbits or 1,
+                   **kwargs)
+
+    def frame_time(self, size):
+        """Returns the wire time of a frame
+
+        :param size: frame size in bytes
+        :returns: seconds
+        """
+        return size * self.char_time
+
+    def request_size(self, request):
+        """Returns the size of the request frame in bytes
+
+        :param request: ModbusRequest class to execute
+        """
+        frame = getattr(request, 'frame', None)
+        if frame is not None:
+            return len(frame)
+        # Unit:1 + Function:1 + PDU + CRC:2
+        return len(request.encode()) + 4
+
+    def response_size(self, request):
+        """Returns the size of the expected response frame in bytes
+
+        :param request: ModbusRequest class to execute
+        """
+        #framework adds 3 (unit and CRC)
+        return request.get_response_pdu_size() + 3
+
+    def transaction_time(self, request):
+        """Returns the bus time of one transaction without turnaround
+
+        :param request: ModbusRequest class to execute
+        :returns: seconds
+        """
+        size = self.request_size(request) + self.response_size(request)
+        return self.frame_time(size + 2 * FRAME_GAP)
+
+    def turnaround(self, unit):
+        """Returns the turnaround estimate used for unit
+
+        :param unit:  Target Modbus slave address
+        :returns: seconds
+        """
+        smoothed, deviation = self._turnaround.get(unit, (self._initial_turnaround, 0.0))
+        return smoothed + 4 * deviation
+
+    def timeout(self, request):
+        """Returns the response timeout for request
+
+        :param request: ModbusRequest class to execute
+        :returns: seconds
+        """
+        timeout = (self.transaction_time(request)
+                   + self.turnaround(request.slave_id) + self.margin)
+        if self.resolution:
+            #round() first so float noise does not add a whole step
+            timeout = math.ceil(round(timeout / self.resolution, 6)) * self.resolution
+            timeout = round(timeout, 6)
+        return min(max(timeout, self.minimum), self.maximum)
+
+    def measure(self, request, elapsed):
+        """Updates the turnaround estimate of a unit from a transaction
+
+        :param request: ModbusRequest class that was executed
+        :param elapsed: seconds from send to complete response
+        """
+        sample = max(elapsed - self.transaction_time(request), 0.0)
+        estimate = self._turnaround.get(request.slave_id)
+        if estimate is None:
+            self._turnaround[request.slave_id] = [sample, sample / 2]
+        else:
+            error = sample - estimate[0]
+            estimate[0] += self._ALPHA * error
+            estimate[1] += self._BETA * (abs(error) - estimate[1])
+
+    def execute(self, client, request):
+        """Executes request on client with the derived timeout
+
+        Only complete, non-exception responses are used to measure the
+        turnaround.
+
+        :param client: synchronous ModbusBaseClient object
+        :param request: ModbusRequest class to execute
+        :returns: result of client.execute()
+        """
+        set_timeout(client, self.timeout(request))
+        start = time.monotonic()
+        result = client.execute(request)
+        elapsed = time.monotonic() - start
+        if isinstance(result, ModbusResponse) and not result.isError():
+            self.measure(request, elapsed)
+        return result